@@ -3,10 +3,25 @@
 Check UTF-8 files for encoding issues like garbled text.
 """
 
+import argparse
 import os
 import re
+import sys
+from functools import partial
 from pathlib import Path
 
+
+def _bootstrap_imports():
+    sc_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'sc')
+    sc_dir = os.path.normpath(sc_dir)
+    if sc_dir not in sys.path:
+        sys.path.insert(0, sc_dir)
+
+
+_bootstrap_imports()
+
+from _parallel import map_files, resolve_jobs  # noqa: E402
+
 # Patterns that indicate encoding issues
 GARBLED_PATTERNS = [
     r'闁[^a-zA-Z0-9\s]{1,3}',  # 闁 followed by garbled chars
@@ -133,6 +148,11 @@ def check_file_for_issues(file_path, patterns):
 
 def main():
     """Main entry point."""
+    ap = argparse.ArgumentParser(description="Check known UTF-8 docs for garbled text.")
+    ap.add_argument('--jobs', type=int, default=1, help='Worker processes (0 = CPU count). Output is identical to --jobs 1.')
+    args = ap.parse_args()
+    jobs = resolve_jobs(args.jobs)
+
     project_root = Path(__file__).parent.parent.parent
     docs_path = project_root / 'docs'
 
@@ -145,15 +165,17 @@ def main():
     total_files = 0
     files_with_issues = 0
 
-    for rel_path in UTF8_FILES:
-        file_path = docs_path / rel_path
+    existing = [rel_path for rel_path in UTF8_FILES if (docs_path / rel_path).exists()]
+    checked = map_files(partial(check_file_for_issues, patterns=GARBLED_PATTERNS), [docs_path / r for r in existing], jobs)
+    issues_by_path = dict(zip(existing, checked))
 
-        if not file_path.exists():
+    for rel_path in UTF8_FILES:
+        if rel_path not in issues_by_path:
             print(f"[SKIP] {rel_path} - File not found")
             continue
 
         total_files += 1
-        issues = check_file_for_issues(file_path, GARBLED_PATTERNS)
+        issues = issues_by_path[rel_path]
 
         if issues:
             files_with_issues += 1
@@ -37,6 +37,14 @@ if (Test-Path $logErr) { $content += ("`n" + (Get-Content $logErr -Raw -ErrorAct
 Set-Content -Path $log -Encoding UTF8 -Value $content
 Write-Host "Smoke log saved at $log (out=$logOut, err=$logErr)"
 
+# Append to the artifact index (scripts/sc/_artifact_index.py); a missing index is backfilled by its first lookup.
+$index = Join-Path $PSScriptRoot '../../logs/ci/artifact-index.jsonl'
+if (Test-Path $index) {
+  $epoch = [math]::Round(((Get-Date).ToUniversalTime() - [datetime]'1970-01-01').TotalSeconds, 3)
+  $entry = [ordered]@{ ts = $epoch; kind = 'smoke/headless.log'; path = "logs/ci/$ts/smoke/headless.log"; task_id = $null; status = $null }
+  Add-Content -Path $index -Value ($entry | ConvertTo-Json -Compress) -Encoding UTF8
+}
+
 # Heuristic pass criteria: prefer explicit marker, fallback to DB opened, then any output
 if ($p.Id -gt 0) {
   if ($content -match '\[TEMPLATE_SMOKE_READY\]') {
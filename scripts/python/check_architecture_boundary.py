@@ -18,6 +18,19 @@ import json
 import sys
 import xml.etree.ElementTree as ET
 from pathlib import Path
+from typing import Collection
+
+
+def _bootstrap_imports() -> None:
+    sc_dir = str(Path(__file__).resolve().parents[1] / "sc")
+    if sc_dir not in sys.path:
+        sys.path.insert(0, sc_dir)
+
+
+_bootstrap_imports()
+
+from _file_discovery import changed_files, changed_since_report  # noqa: E402
+from _source_scan import ScanRule, SourceFile, scan_sources  # noqa: E402
 
 
 def repo_root() -> Path:
@@ -28,19 +41,25 @@ def _to_posix(path: Path) -> str:
     return str(path).replace("\\", "/")
 
 
-def scan_core_sources(root: Path) -> list[str]:
-    core_dir = root / "Game.Core"
-    if not core_dir.exists():
-        return []
+def _check_core_source(sf: SourceFile) -> list[str]:
+    text = sf.text
+    return [sf.rel] if ("using Godot" in text or "Godot." in text) else []
+
+
+CORE_GODOT_RULE = ScanRule(
+    name="core_references_godot",
+    check=_check_core_source,
+    roots=("Game.Core",),
+    exts=frozenset({".cs"}),
+    skip_dirs=frozenset({"bin", "obj"}),
+)
+
 
-    violations: list[str] = []
-    for p in core_dir.rglob("*.cs"):
-        if any(seg in {"bin", "obj"} for seg in p.parts):
-            continue
-        text = p.read_text(encoding="utf-8", errors="ignore")
-        if "using Godot" in text or "Godot." in text:
-            violations.append(_to_posix(p.relative_to(root)))
-    return violations
+CORE_CSPROJ = "Game.Core/Game.Core.csproj"
+
+
+def scan_core_sources(root: Path, *, only: Collection[str] | None = None) -> list[str]:
+    return scan_sources(root, [CORE_GODOT_RULE], only=only)[CORE_GODOT_RULE.name]
 
 
 def _strip_ns(tag: str) -> str:
@@ -48,7 +67,7 @@ def _strip_ns(tag: str) -> str:
 
 
 def scan_core_csproj(root: Path) -> dict:
-    csproj = root / "Game.Core" / "Game.Core.csproj"
+    csproj = root / CORE_CSPROJ
     if not csproj.exists():
         return {
             "csproj": None,
@@ -105,14 +124,32 @@ def scan_core_csproj(root: Path) -> dict:
 def main() -> int:
     ap = argparse.ArgumentParser(description="Check Game.Core architecture boundary constraints.")
     ap.add_argument("--out", required=True, help="Output JSON path (under logs/ci/... recommended).")
+    ap.add_argument(
+        "--changed-since",
+        default=None,
+        metavar="REV",
+        help="Only scan Game.Core sources changed since REV; the csproj check re-runs only if the csproj changed.",
+    )
     args = ap.parse_args()
 
     root = repo_root()
     out_path = Path(args.out)
     out_path.parent.mkdir(parents=True, exist_ok=True)
 
-    source_violations = scan_core_sources(root)
-    csproj_report = scan_core_csproj(root)
+    changed = changed_files(root, args.changed_since) if args.changed_since else None
+    source_violations = scan_core_sources(root, only=changed)
+    if changed is not None and CORE_CSPROJ not in changed:
+        csproj_report = {
+            "csproj": CORE_CSPROJ,
+            "status": "skipped",
+            "reason": f"unchanged since {args.changed_since}",
+            "forbidden_project_refs": [],
+            "forbidden_package_refs": [],
+            "project_refs": [],
+            "package_refs": [],
+        }
+    else:
+        csproj_report = scan_core_csproj(root)
 
     ok = True
     errors: list[str] = []
@@ -139,6 +176,8 @@ def main() -> int:
         "source_violations": source_violations,
         "csproj": csproj_report,
     }
+    if args.changed_since:
+        report["changed_since"] = changed_since_report(args.changed_since, changed)
 
     out_path.write_text(json.dumps(report, ensure_ascii=True, indent=2) + "\n", encoding="utf-8")
 
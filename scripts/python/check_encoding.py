@@ -6,7 +6,9 @@ Also flag common mojibake patterns. Results are written under logs/ci/<date>/enc
 Usage:
   py -3 scripts/python/check_encoding.py --since-today
   py -3 scripts/python/check_encoding.py --since "2025-11-13 00:00:00"
+  py -3 scripts/python/check_encoding.py --changed-since origin/main   # diff vs merge-base + untracked
   py -3 scripts/python/check_encoding.py --files path1 path2 ...
+  py -3 scripts/python/check_encoding.py --root . --jobs 0   # process pool, one worker per CPU
 """
 import argparse
 import datetime as dt
@@ -18,6 +20,19 @@ import subprocess
 import sys
 from typing import List
 
+
+def _bootstrap_imports():
+    sc_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'sc')
+    sc_dir = os.path.normpath(sc_dir)
+    if sc_dir not in sys.path:
+        sys.path.insert(0, sc_dir)
+
+
+_bootstrap_imports()
+
+from _file_discovery import changed_files, discover_files  # noqa: E402
+from _parallel import map_files, resolve_jobs  # noqa: E402
+
 TEXT_EXT = {'.md','.txt','.json','.yml','.yaml','.xml','.cs','.csproj','.sln','.gd','.tscn','.tres','.gitattributes','.gitignore','.ps1','.py','.ini','.cfg','.toml'}
 # Explicit binary extensions to skip from UTF-8 validation
 BINARY_EXT = {
@@ -105,14 +120,19 @@ def main():
     ap.add_argument('--root', default=None, help='Recursively scan a root folder (e.g. docs)')
     ap.add_argument('--since-today', action='store_true')
     ap.add_argument('--since', default=None)
+    ap.add_argument('--changed-since', default=None, metavar='REV', help='Files changed since REV (diff vs merge-base with HEAD, plus untracked files).')
     ap.add_argument('--files', nargs='*')
+    ap.add_argument('--jobs', type=int, default=1, help='Worker processes for decoding (0 = CPU count). Output is identical to --jobs 1.')
     args = ap.parse_args()
 
     if args.root:
         root = args.root
+        base = os.path.abspath(root)
         files = []
-        for dirpath, dirnames, filenames in os.walk(root):
-            rel = dirpath.replace('\\', '/')
+        # Git index listing (tracked + untracked-not-ignored); falls back to os.walk outside git.
+        for p in discover_files(base, skip_dirs={'.git', 'logs', 'demo', 'build', '.godot'}):
+            fpath = os.path.join(root, os.path.relpath(str(p), base))
+            rel = os.path.dirname(fpath).replace('\\', '/')
             if '/.git' in rel or rel.startswith('.git'):
                 continue
             if '/logs' in rel or rel.startswith('logs'):
@@ -123,13 +143,15 @@ def main():
                 continue
             if '/.godot' in rel or rel.startswith('.godot'):
                 continue
-
-            for name in filenames:
-                fpath = os.path.join(dirpath, name)
-                if os.path.isfile(fpath) and is_text_file(fpath):
-                    files.append(fpath)
+            if is_text_file(fpath):
+                files.append(fpath)
     elif args.files:
         files = args.files
+    elif args.changed_since:
+        # Fall back to today's changes when the rev cannot be diffed.
+        files = changed_files('.', args.changed_since)
+        if files is None:
+            files = git_changed_today()
     elif args.since:
         files = git_changed_since(args.since)
     else:
@@ -141,17 +163,10 @@ def main():
     out_dir = os.path.join('logs','ci',date,'encoding')
     os.makedirs(out_dir, exist_ok=True)
 
-    results = []
-    bad = []
-    skipped = 0
-    for fpath in files:
-        if not is_text_file(fpath):
-            skipped += 1
-            continue
-        r = check_utf8(fpath)
-        results.append(r)
-        if not r['utf8_ok']:
-            bad.append(r)
+    targets = [f for f in files if is_text_file(f)]
+    skipped = len(files) - len(targets)
+    results = map_files(check_utf8, targets, resolve_jobs(args.jobs))
+    bad = [r for r in results if not r['utf8_ok']]
 
     summary = {
         'scanned': len(results),
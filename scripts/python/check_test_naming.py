@@ -6,6 +6,7 @@ test naming conventions and avoids lowerCamelCase / leading-lowercase names.
 
 Usage:
     py -3 scripts/python/check_test_naming.py
+    py -3 scripts/python/check_test_naming.py --changed-since origin/main
 
 Exit codes:
     0 - All test methods follow approved conventions
@@ -15,12 +16,25 @@ Requirements:
     - Scans all *Tests.cs files in Game.Core.Tests/
     - Checks methods marked with [Fact] or [Theory]
     - Reports violations with file path and line number
+    - With --changed-since REV, only test files changed since REV are scanned
 """
 
+import argparse
 import re
 import sys
 from pathlib import Path
-from typing import List, Tuple
+from typing import Collection, List, Optional, Tuple
+
+
+def _bootstrap_imports() -> None:
+    sc_dir = str(Path(__file__).resolve().parents[1] / "sc")
+    if sc_dir not in sys.path:
+        sys.path.insert(0, sc_dir)
+
+
+_bootstrap_imports()
+
+from _file_discovery import changed_files  # noqa: E402
 
 
 TEST_METHOD_DEF_RE = re.compile(
@@ -106,12 +120,13 @@ def extract_test_methods(file_path: Path) -> List[Tuple[int, str]]:
     return test_methods
 
 
-def scan_test_files(test_dir: Path) -> dict:
+def scan_test_files(test_dir: Path, only: Optional[Collection[Path]] = None) -> dict:
     """
     Scan all test files and find naming violations.
 
     Args:
         test_dir: Root directory containing test files
+        only: If given, restrict the scan to these (absolute) file paths
 
     Returns:
         Dictionary mapping file paths to list of violations (line_number, method_name)
@@ -119,6 +134,8 @@ def scan_test_files(test_dir: Path) -> dict:
     violations = {}
 
     test_files = list(test_dir.rglob("*Tests.cs"))
+    if only is not None:
+        test_files = [f for f in test_files if f in only]
 
     for test_file in test_files:
         test_methods = extract_test_methods(test_file)
@@ -135,7 +152,11 @@ def scan_test_files(test_dir: Path) -> dict:
 
 
 def main() -> int:
-    script_dir = Path(__file__).parent
+    ap = argparse.ArgumentParser(description="Validate test method naming in Game.Core.Tests.")
+    ap.add_argument("--changed-since", default=None, metavar="REV", help="Only scan test files changed since REV (diff vs merge-base with HEAD, plus untracked files).")
+    args = ap.parse_args()
+
+    script_dir = Path(__file__).resolve().parent
     project_root = script_dir.parent.parent
     test_dir = project_root / "Game.Core.Tests"
 
@@ -143,12 +164,22 @@ def main() -> int:
         print(f"Error: Test directory not found: {test_dir}", file=sys.stderr)
         return 1
 
+    only = None
+    if args.changed_since:
+        changed = changed_files(project_root, args.changed_since)
+        if changed is None:
+            print(f"Warning: cannot diff against {args.changed_since}; scanning all test files", file=sys.stderr)
+        else:
+            only = {project_root.joinpath(*rel.split("/")) for rel in changed}
+
     print("Scanning Game.Core.Tests for test method naming violations...")
     print(f"Test directory: {test_dir}")
+    if only is not None:
+        print(f"Changed since {args.changed_since}: {sum(1 for p in only if test_dir in p.parents)} file(s) under the test directory")
     print()
 
     try:
-        violations = scan_test_files(test_dir)
+        violations = scan_test_files(test_dir, only)
     except Exception as e:
         print(f"[FAIL] Test naming scan failed: {e}", file=sys.stderr)
         return 1
@@ -3,6 +3,9 @@
 Run dotnet restore/test with coverage and archive artifacts under logs/unit/<date>/.
 Exits non-zero on test failure or when coverage thresholds (if provided) are not met.
 
+--filter passes a `dotnet test --filter` expression through (used by sc-test's
+test-impact selection); coverage thresholds are not enforced on filtered runs.
+
 Env thresholds (optional):
   COVERAGE_LINES_MIN   e.g., "90" (percent)
   COVERAGE_BRANCHES_MIN e.g., "85" (percent)
@@ -97,6 +100,7 @@ def main():
     ap.add_argument('--solution', default='Game.sln')
     ap.add_argument('--configuration', default='Debug')
     ap.add_argument('--out-dir', default=None)
+    ap.add_argument('--filter', default=None, help='dotnet test --filter expression (partial run; thresholds not enforced)')
     args = ap.parse_args()
 
     root = os.getcwd()
@@ -111,6 +115,7 @@ def main():
         'configuration': args.configuration,
         'out_dir': out_dir,
         'dotnet_exe': dotnet,
+        'filter': args.filter,
         'status': 'fail',
     }
 
@@ -126,10 +131,13 @@ def main():
         return 1
 
     # Test with coverage
-    rc, out = run_cmd([dotnet, 'test', args.solution,
-                       f'-c', args.configuration,
-                       '--collect:XPlat Code Coverage',
-                       '--logger', 'trx;LogFileName=tests.trx'], cwd=root)
+    test_cmd = [dotnet, 'test', args.solution,
+                f'-c', args.configuration,
+                '--collect:XPlat Code Coverage',
+                '--logger', 'trx;LogFileName=tests.trx']
+    if args.filter:
+        test_cmd += ['--filter', args.filter]
+    rc, out = run_cmd(test_cmd, cwd=root)
     with io.open(os.path.join(out_dir, 'dotnet-test-output.txt'), 'w', encoding='utf-8') as f:
         f.write(out)
     summary['test_rc'] = rc
@@ -168,7 +176,7 @@ def main():
     lines_min = os.environ.get('COVERAGE_LINES_MIN')
     branches_min = os.environ.get('COVERAGE_BRANCHES_MIN')
     threshold_ok = True
-    if coverage and (lines_min or branches_min):
+    if coverage and (lines_min or branches_min) and not args.filter:
         try:
             if lines_min:
                 threshold_ok = threshold_ok and (coverage.get('line_pct', 0) >= float(lines_min))
@@ -8,21 +8,47 @@ Usage:
     --project Tests.Godot \
     --add tests/Adapters --add tests/OtherSuite \
     --timeout-sec 300
+
+Sharded mode (--shards N):
+  The suites under every --add are partitioned by file into N shards, balanced with
+  the per-suite durations of previous JUnit results.xml under logs/e2e/<date>/
+  (unknown suites weigh the median). N headless Godot instances run concurrently,
+  each with its own user data dir (APPDATA / XDG_DATA_HOME) and its own report dir
+  (res://reports/shard-NN). Reports are archived under <dest>/shard-NN/ and a merged
+  <dest>/results.xml holds every testsuite, so evidence validators that read the
+  newest results.xml keep working.
 """
 import argparse
 import datetime as dt
 import os
 import shutil
+import statistics
 import subprocess
+import sys
 import json
 import re
 import time
+import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
 from pathlib import Path
 
 
-def run_cmd(args, cwd=None, timeout=600_000):
+def _bootstrap_imports():
+    sc_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'sc')
+    sc_dir = os.path.normpath(sc_dir)
+    if sc_dir not in sys.path:
+        sys.path.insert(0, sc_dir)
+
+
+_bootstrap_imports()
+
+from _junit import suite_res_path  # noqa: E402
+
+
+def run_cmd(args, cwd=None, timeout=600_000, env=None):
     p = subprocess.Popen(args, cwd=cwd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
-                         text=True, encoding='utf-8', errors='ignore')
+                         text=True, encoding='utf-8', errors='ignore', env=env)
     try:
         out, _ = p.communicate(timeout=timeout/1000.0)
     except subprocess.TimeoutExpired:
@@ -32,7 +58,7 @@ def run_cmd(args, cwd=None, timeout=600_000):
     return p.returncode, out
 
 
-def run_cmd_failfast(args, cwd=None, timeout=600_000, break_markers=None):
+def run_cmd_failfast(args, cwd=None, timeout=600_000, break_markers=None, env=None):
     """Run a process and stream stdout; if any line contains a break marker, kill early and return rc=1.
     This avoids long timeouts when Godot enters Debugger Break state.
     """
@@ -42,7 +68,7 @@ def run_cmd_failfast(args, cwd=None, timeout=600_000, break_markers=None):
         'SCRIPT ERROR',
     ]
     p = subprocess.Popen(args, cwd=cwd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
-                         text=True, encoding='utf-8', errors='ignore')
+                         text=True, encoding='utf-8', errors='ignore', env=env)
     buf_lines = []
     hit_break = False
     try:
@@ -81,6 +107,172 @@ def write_text(path: str, content: str) -> None:
         f.write(content)
 
 
+def to_res_path(path: str) -> str:
+    if path.startswith('res://'):
+        return path
+    return 'res://' + path.replace('\\', '/').lstrip('/')
+
+
+def discover_suites(proj: str, adds: list) -> list:
+    """Expand --add entries (directories or suite files) into res:// suite paths, sorted per entry."""
+    suites = []
+    for a in adds:
+        rel = to_res_path(a)[len('res://'):]
+        base = os.path.join(proj, rel)
+        if os.path.isfile(base):
+            suites.append('res://' + rel)
+            continue
+        for cur, dirs, names in os.walk(base):
+            dirs.sort()
+            for name in sorted(names):
+                if not name.endswith(('.gd', '.cs')):
+                    continue
+                path = os.path.join(cur, name)
+                try:
+                    with open(path, 'r', encoding='utf-8', errors='ignore') as f:
+                        text = f.read()
+                except OSError:
+                    continue
+                if 'GdUnitTestSuite' in text or '[TestSuite]' in text:
+                    suites.append('res://' + os.path.relpath(path, proj).replace('\\', '/'))
+    return list(dict.fromkeys(suites))
+
+
+def load_store_durations(root: str) -> dict:
+    """Median duration (seconds) per suite res:// path from the sc test timing store (logs/cache/test-timings.sqlite3)."""
+    if not os.path.isfile(os.path.join(root, 'logs', 'cache', 'test-timings.sqlite3')):
+        return {}
+    try:
+        from _test_timings import open_existing, suite_durations
+        conn = open_existing()
+        if conn is None:
+            return {}
+        with closing(conn):
+            return suite_durations(conn, kind='gdunit')
+    except Exception:
+        return {}
+
+
+def load_suite_durations(root: str, max_days: int = 7) -> dict:
+    """Duration (seconds) per suite res:// path: timing-store medians, else the latest JUnit results.xml of recent logs/e2e/<date>/ runs."""
+    stored = load_store_durations(root)
+    if stored:
+        return stored
+    e2e = os.path.join(root, 'logs', 'e2e')
+    if not os.path.isdir(e2e):
+        return {}
+    dates = sorted(d for d in os.listdir(e2e) if re.match(r'^\d{4}-\d{2}-\d{2}$', d))[-max_days:]
+    xmls = []
+    for d in dates:
+        for cur, _dirs, names in os.walk(os.path.join(e2e, d)):
+            if 'results.xml' in names:
+                xmls.append(os.path.join(cur, 'results.xml'))
+    xmls.sort(key=lambda p: os.path.getmtime(p))
+    durations = {}
+    for path in xmls:  # oldest first, so newer runs overwrite
+        try:
+            tree = ET.parse(path).getroot()
+        except (ET.ParseError, OSError):
+            continue
+        for suite in tree.iter('testsuite'):
+            key = suite_res_path(suite)  # package is the suite directory, shared by sibling suites
+            if not key:
+                continue
+            try:
+                durations[key] = float(suite.attrib.get('time') or 0)
+            except ValueError:
+                continue
+    return durations
+
+
+def partition_suites(suites: list, durations: dict, shards: int) -> list:
+    """Greedy longest-first bin packing: returns [(estimated_sec, [suite, ...]), ...] without empty shards."""
+    known = [durations[s] for s in suites if s in durations]
+    fallback = statistics.median(known) if known else 1.0
+    bins = [[0.0, []] for _ in range(max(1, shards))]
+    for weight, suite in sorted(((durations.get(s, fallback), s) for s in suites), key=lambda x: (-x[0], x[1])):
+        target = min(bins, key=lambda b: b[0])
+        target[0] += weight
+        target[1].append(suite)
+    return [(round(w, 3), sorted(ss)) for w, ss in bins if ss]
+
+
+def latest_results_xml(report_root: str):
+    found = []
+    for cur, _dirs, names in os.walk(report_root):
+        if 'results.xml' in names:
+            found.append(os.path.join(cur, 'results.xml'))
+    return max(found, key=lambda p: os.path.getmtime(p)) if found else None
+
+
+def merge_junit(xml_paths: list, dest_file: str) -> dict:
+    """Concatenate the testsuite elements of several JUnit reports into one testsuites document."""
+    merged = ET.Element('testsuites')
+    totals = {'tests': 0, 'failures': 0, 'errors': 0, 'skipped': 0, 'flaky': 0}
+    total_time = 0.0
+    for path in xml_paths:
+        try:
+            tree = ET.parse(path).getroot()
+        except (ET.ParseError, OSError):
+            continue
+        for suite in tree.iter('testsuite'):
+            merged.append(suite)
+            for k in totals:
+                try:
+                    totals[k] += int(suite.attrib.get(k) or 0)
+                except ValueError:
+                    pass
+            try:
+                total_time += float(suite.attrib.get('time') or 0)
+            except ValueError:
+                pass
+    merged.set('id', dt.date.today().isoformat())
+    merged.set('name', 'merged')
+    for k, v in totals.items():
+        merged.set(k, str(v))
+    merged.set('time', f'{total_time:.3f}')
+    ET.ElementTree(merged).write(dest_file, encoding='UTF-8', xml_declaration=True)
+    return totals
+
+
+def run_shards(base_cmd: list, proj: str, shards: list, out_dir: str, timeout_sec: int) -> list:
+    """Run one headless Godot per shard concurrently; returns per-shard dicts (rc, out, report_root, ...)."""
+    def run_one(index: int, shard: tuple) -> dict:
+        name = f'shard-{index:02d}'
+        report_res = f'res://reports/{name}'
+        report_root = os.path.join(proj, 'reports', name)
+        shutil.rmtree(report_root, ignore_errors=True)
+        user_dir = os.path.join(out_dir, 'gdunit-shards', name, 'userdata')
+        os.makedirs(user_dir, exist_ok=True)
+        env = dict(os.environ)
+        # Godot resolves user:// under APPDATA (Windows) / XDG_DATA_HOME (Linux): one per instance.
+        env['APPDATA'] = user_dir
+        env['XDG_DATA_HOME'] = user_dir
+        cmd = list(base_cmd)
+        for suite in shard[1]:
+            cmd += ['-a', suite]
+        cmd += ['-rd', report_res]
+        started = time.monotonic()
+        rc, out = run_cmd_failfast(cmd, cwd=proj, timeout=timeout_sec * 1000, env=env)
+        console = os.path.join(out_dir, f'gdunit-console-{name}.txt')
+        write_text(console, out)
+        return {
+            'name': name,
+            'rc': rc,
+            'out': out,
+            'suites': shard[1],
+            'estimated_sec': shard[0],
+            'wall_sec': round(time.monotonic() - started, 3),
+            'report_root': report_root,
+            'console': console,
+            'user_dir': user_dir,
+        }
+
+    with ThreadPoolExecutor(max_workers=len(shards)) as pool:
+        futures = [pool.submit(run_one, i, sh) for i, sh in enumerate(shards, start=1)]
+        return [f.result() for f in futures]
+
+
 def main():
     ap = argparse.ArgumentParser()
     ap.add_argument('--godot-bin', required=True)
@@ -89,6 +281,7 @@ def main():
     ap.add_argument('--timeout-sec', type=int, default=600, help='Timeout seconds for test run (default 600)')
     ap.add_argument('--prewarm', action='store_true', help='Prewarm: build solutions before running tests')
     ap.add_argument('--rd', dest='report_dir', default=None, help='Custom destination to copy reports into (defaults to logs/e2e/<date>/gdunit-reports)')
+    ap.add_argument('--shards', type=int, default=1, help='Run the suites in N concurrent headless Godot instances, balanced by previous suite durations (default 1)')
     args = ap.parse_args()
 
     repo_root = Path(__file__).resolve().parents[2]
@@ -167,13 +360,20 @@ def main():
     # Run tests（带 Debugger Break fail-fast）
     # Build command with optional -a filters
     cmd = [args.godot_bin, '--headless', '--path', proj, '-s', '-d', 'res://addons/gdUnit4/bin/GdUnitCmdTool.gd', '--ignoreHeadlessMode']
-    for a in args.add:
-        apath = a
-        if not apath.startswith('res://'):
+    shard_runs = []
+    shard_plan = []
+    if args.shards > 1:
+        suites = discover_suites(proj, args.add)
+        shard_plan = partition_suites(suites, load_suite_durations(root), min(args.shards, len(suites)))
+    if len(shard_plan) > 1:
+        shard_runs = run_shards(cmd, proj, shard_plan, out_dir, args.timeout_sec)
+        rc = next((r['rc'] for r in shard_runs if r['rc'] != 0), 0)
+        out = ''.join(f"===== {r['name']} rc={r['rc']} suites={len(r['suites'])} =====\n{r['out']}\n" for r in shard_runs)
+    else:
+        for a in args.add:
             # normalize relative tests path to res://
-            apath = 'res://' + apath.replace('\\', '/').lstrip('/')
-        cmd += ['-a', apath]
-    rc, out = run_cmd_failfast(cmd, cwd=proj, timeout=args.timeout_sec*1000)
+            cmd += ['-a', to_res_path(a)]
+        rc, out = run_cmd_failfast(cmd, cwd=proj, timeout=args.timeout_sec*1000)
     console_path = os.path.join(out_dir, 'gdunit-console.txt')
     with open(console_path, 'w', encoding='utf-8') as f:
         f.write(out)
@@ -193,8 +393,9 @@ def main():
     except Exception:
         pass
 
-    # Generate HTML log frame (optional)
-    _rc2, _out2 = run_cmd([args.godot_bin, '--headless', '--path', proj, '--quiet', '-s', 'res://addons/gdUnit4/bin/GdUnitCopyLog.gd'], cwd=proj)
+    # Generate HTML log frame (optional; sharded runs keep one console log per shard instead)
+    if not shard_runs:
+        _rc2, _out2 = run_cmd([args.godot_bin, '--headless', '--path', proj, '--quiet', '-s', 'res://addons/gdUnit4/bin/GdUnitCopyLog.gd'], cwd=proj)
 
     # Archive reports
     reports_dir = os.path.join(proj, 'reports')
@@ -209,7 +410,24 @@ def main():
     except Exception:
         pass
     # Copy reports if they exist
-    if os.path.isdir(reports_dir):
+    if shard_runs:
+        shard_xmls = []
+        for r in shard_runs:
+            shard_dest = os.path.join(dest, r['name'])
+            if os.path.isdir(r['report_root']):
+                shutil.copytree(r['report_root'], shard_dest, dirs_exist_ok=True)
+                shutil.rmtree(r['report_root'], ignore_errors=True)
+            try:
+                shutil.copy2(r['console'], os.path.join(dest, f"gdunit-console-{r['name']}.txt"))
+            except Exception:
+                pass
+            xml = latest_results_xml(shard_dest)
+            r['results_xml'] = os.path.relpath(xml, dest).replace('\\', '/') if xml else None
+            if xml:
+                shard_xmls.append(xml)
+        # Written last, so it is the newest results.xml under dest.
+        merged_totals = merge_junit(shard_xmls, os.path.join(dest, 'results.xml')) if shard_xmls else None
+    elif os.path.isdir(reports_dir):
         for name in os.listdir(reports_dir):
             src = os.path.join(reports_dir, name)
             dst = os.path.join(dest, name)
@@ -219,6 +437,12 @@ def main():
                 shutil.copy2(src, dst)
     # Write a small summary json for CI
     summary = {'rc': rc, 'project': proj, 'added': args.add, 'timeout_sec': args.timeout_sec}
+    if shard_runs:
+        summary['shards'] = [
+            {k: r.get(k) for k in ('name', 'rc', 'estimated_sec', 'wall_sec', 'results_xml', 'user_dir', 'suites')}
+            for r in shard_runs
+        ]
+        summary['merged_results'] = {'path': 'results.xml', 'totals': merged_totals} if merged_totals is not None else None
     if prewarm_rc is not None:
         summary['prewarm_rc'] = prewarm_rc
         if prewarm_note:
@@ -2,9 +2,23 @@ import argparse
 import json
 import os
 import re
+import sys
 from datetime import datetime
 
 
+def _bootstrap_imports():
+    sc_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'sc')
+    sc_dir = os.path.normpath(sc_dir)
+    if sc_dir not in sys.path:
+        sys.path.insert(0, sc_dir)
+
+
+_bootstrap_imports()
+
+from _file_discovery import discover_files  # noqa: E402
+from _parallel import map_files, resolve_jobs  # noqa: E402
+
+
 MOJIBAKE_RE = re.compile(r"[闁閻鐟鍗鈧缂濞閸鎮绱锛绗閿鍊鎯缁婵]")
 ALLOWED_EXTS = {'.md', '.txt', '.yml', '.yaml', '.json', '.xml', '.ini', '.cfg', '.index', '.adoc'}
 
@@ -50,17 +64,13 @@ def main():
     ap = argparse.ArgumentParser()
     ap.add_argument('--root', default='docs', help='Root directory to scan (default: docs)')
     ap.add_argument('--out', default=None, help='Output directory for logs (default: logs/ci/<ts>/garble-scan)')
+    ap.add_argument('--jobs', type=int, default=1, help='Worker processes (0 = CPU count). Output is identical to --jobs 1.')
     args = ap.parse_args()
 
     root = os.path.abspath(args.root)
-    results = []
-    for dirpath, _, filenames in os.walk(root):
-        for name in filenames:
-            ext = os.path.splitext(name)[1].lower()
-            if ext not in ALLOWED_EXTS:
-                continue
-            path = os.path.join(dirpath, name)
-            results.append(scan_file(path))
+    # Git index listing (tracked + untracked-not-ignored); falls back to os.walk outside git.
+    paths = [str(p) for p in discover_files(root) if p.suffix.lower() in ALLOWED_EXTS]
+    results = map_files(scan_file, paths, resolve_jobs(args.jobs))
 
     ts = datetime.now().strftime('%Y%m%d-%H%M%S')
     out = args.out or os.path.join('logs', 'ci', ts, 'garble-scan')
@@ -21,9 +21,22 @@ from __future__ import annotations
 import argparse
 import json
 import re
+import sys
 from pathlib import Path
 
 
+def _bootstrap_imports() -> None:
+    sc_dir = str(Path(__file__).resolve().parents[1] / "sc")
+    if sc_dir not in sys.path:
+        sys.path.insert(0, sc_dir)
+
+
+_bootstrap_imports()
+
+from _file_discovery import changed_files, changed_since_report  # noqa: E402
+from _source_scan import ScanRule, SourceFile, scan_sources, touches  # noqa: E402
+
+
 AUDIT_FILE_RE = re.compile(r"security-audit\.jsonl", re.IGNORECASE)
 REQUIRED_KEYS = ("\"ts\"", "\"action\"", "\"reason\"", "\"target\"", "\"caller\"")
 
@@ -32,47 +45,65 @@ def repo_root() -> Path:
     return Path(__file__).resolve().parents[2]
 
 
-def iter_cs_files(root: Path) -> list[Path]:
-    roots = [root / "Game.Godot", root / "Game.Core"]
-    files: list[Path] = []
-    for r in roots:
-        if not r.exists():
-            continue
-        for p in r.rglob("*.cs"):
-            if any(seg in {"bin", "obj", ".godot", "logs"} for seg in p.parts):
-                continue
-            files.append(p)
-    return sorted(files)
+def check_file(sf: SourceFile) -> list[dict]:
+    text = sf.text
+    if not AUDIT_FILE_RE.search(text):
+        return []
+    missing = [k for k in REQUIRED_KEYS if k not in text]
+    return [
+        {
+            "file": sf.rel,
+            "mentions_audit_file": True,
+            "has_all_required_keys": len(missing) == 0,
+            "missing_keys": missing,
+        }
+    ]
+
+
+AUDIT_RULE = ScanRule(
+    name="audit_schema",
+    check=check_file,
+    roots=("Game.Godot", "Game.Core"),
+    exts=frozenset({".cs"}),
+    skip_dirs=frozenset({"bin", "obj", ".godot", "logs"}),
+)
 
 
 def main() -> int:
     ap = argparse.ArgumentParser(description="Hard gate: security audit logging presence & schema (static scan).")
     ap.add_argument("--out", required=True, help="Output JSON path (under logs/ci/... recommended).")
+    ap.add_argument(
+        "--changed-since",
+        default=None,
+        metavar="REV",
+        help="Skip the gate unless a file in its scope changed since REV (the invariant is repo-wide, so any hit re-scans everything).",
+    )
     args = ap.parse_args()
 
     root = repo_root()
     out_path = Path(args.out)
     out_path.parent.mkdir(parents=True, exist_ok=True)
 
-    candidates: list[dict] = []
-
-    for p in iter_cs_files(root):
-        text = p.read_text(encoding="utf-8", errors="ignore")
-        if not AUDIT_FILE_RE.search(text):
-            continue
-        rel = p.relative_to(root).as_posix()
-        missing = [k for k in REQUIRED_KEYS if k not in text]
-        candidates.append(
-            {
-                "file": rel,
-                "mentions_audit_file": True,
-                "has_all_required_keys": len(missing) == 0,
-                "missing_keys": missing,
-            }
-        )
+    changed = changed_files(root, args.changed_since) if args.changed_since else None
+    if changed is not None and not touches(AUDIT_RULE, changed):
+        report = {
+            "ok": True,
+            "status": "skipped",
+            "reason": f"no audit gate inputs changed since {args.changed_since}",
+            "candidates": [],
+            "required_keys": list(REQUIRED_KEYS),
+            "changed_since": changed_since_report(args.changed_since, changed),
+        }
+        out_path.write_text(json.dumps(report, ensure_ascii=True, indent=2) + "\n", encoding="utf-8")
+        print("SECURITY_AUDIT_GATE status=skipped reason=unchanged")
+        return 0
+
+    candidates: list[dict] = scan_sources(root, [AUDIT_RULE])[AUDIT_RULE.name]
 
     ok = any(c.get("has_all_required_keys") for c in candidates)
     report = {"ok": ok, "candidates": candidates, "required_keys": list(REQUIRED_KEYS)}
+    if args.changed_since:
+        report["changed_since"] = changed_since_report(args.changed_since, changed)
     out_path.write_text(json.dumps(report, ensure_ascii=True, indent=2) + "\n", encoding="utf-8")
     print(f"SECURITY_AUDIT_GATE status={'ok' if ok else 'fail'} candidates={len(candidates)}")
     return 0 if ok else 1
@@ -25,87 +25,111 @@ from __future__ import annotations
 import argparse
 import json
 import re
+import sys
 from pathlib import Path
 
 
+def _bootstrap_imports() -> None:
+    sc_dir = str(Path(__file__).resolve().parents[1] / "sc")
+    if sc_dir not in sys.path:
+        sys.path.insert(0, sc_dir)
+
+
+_bootstrap_imports()
+
+from _file_discovery import changed_files, changed_since_report  # noqa: E402
+from _pattern_set import PatternSet  # noqa: E402
+from _source_scan import ScanRule, SourceFile, scan_sources  # noqa: E402
+
+
 ABS_WIN_PATH_RE = re.compile(r'"[A-Za-z]:\\\\[^"]+"')
 TRAVERSAL_RE = re.compile(r'"[^"]*(?:\.\./|\.\.\\)[^"]*"')
 GLOBALIZE_RE = re.compile(r"\bProjectSettings\.GlobalizePath\s*\(\s*\"([^\"]+)\"\s*\)")
 
+# Every violation needs one of these on the line; lines/files without a candidate hit are skipped.
+PREFILTER = PatternSet(
+    {
+        "no_absolute_windows_path_literal": ABS_WIN_PATH_RE,
+        "no_path_traversal_literal": TRAVERSAL_RE,
+        "globalize_path_only_user_or_res": GLOBALIZE_RE,
+    },
+    line_mode=True,
+)
+
 
 def repo_root() -> Path:
     return Path(__file__).resolve().parents[2]
 
 
-def iter_runtime_files(root: Path) -> list[Path]:
-    roots = [root / "Game.Godot", root / "Game.Core"]
-    files: list[Path] = []
-    for r in roots:
-        if not r.exists():
+def check_file(sf: SourceFile) -> list[dict]:
+    violations: list[dict] = []
+    rel = sf.rel
+    for i, line in enumerate(sf.lines, start=1):
+        if not PREFILTER.search(line):
             continue
-        for p in r.rglob("*"):
-            if not p.is_file():
-                continue
-            if p.suffix.lower() not in {".cs", ".gd"}:
-                continue
-            if any(seg in {"bin", "obj", ".godot", "logs"} for seg in p.parts):
-                continue
-            files.append(p)
-    return sorted(files)
+        if ABS_WIN_PATH_RE.search(line):
+            violations.append({"rule": "no_absolute_windows_path_literal", "file": rel, "line": i, "text": line.strip()})
+        # Only consider traversal tokens when the line appears to deal with filesystem paths.
+        # (Scene tree NodePath like "../Root" is not a filesystem traversal.)
+        if any(
+            t in line
+            for t in (
+                "System.IO.",
+                "File.",
+                "Directory.",
+                "Path.",
+                "FileAccess.",
+                "DirAccess.",
+                "ProjectSettings.GlobalizePath",
+                "GetFolderPath",
+            )
+        ):
+            if TRAVERSAL_RE.search(line):
+                violations.append({"rule": "no_path_traversal_literal", "file": rel, "line": i, "text": line.strip()})
+
+        m = GLOBALIZE_RE.search(line)
+        if m:
+            arg = (m.group(1) or "").strip()
+            if not (arg.startswith("user://") or arg.startswith("res://")):
+                violations.append(
+                    {
+                        "rule": "globalize_path_only_user_or_res",
+                        "file": rel,
+                        "line": i,
+                        "text": line.strip(),
+                        "arg": arg,
+                    }
+                )
+    return violations
+
+
+PATH_SAFETY_RULE = ScanRule(
+    name="path_safety",
+    check=check_file,
+    roots=("Game.Godot", "Game.Core"),
+    exts=frozenset({".cs", ".gd"}),
+    skip_dirs=frozenset({"bin", "obj", ".godot", "logs"}),
+    prefilter=PREFILTER,
+)
 
 
 def main() -> int:
     ap = argparse.ArgumentParser(description="Hard gate: path safety invariants (static scan).")
     ap.add_argument("--out", required=True, help="Output JSON path (under logs/ci/... recommended).")
+    ap.add_argument("--changed-since", default=None, metavar="REV", help="Only scan files changed since REV (diff vs merge-base with HEAD, plus untracked files).")
     args = ap.parse_args()
 
     root = repo_root()
     out_path = Path(args.out)
     out_path.parent.mkdir(parents=True, exist_ok=True)
 
-    violations: list[dict] = []
-
-    for p in iter_runtime_files(root):
-        text = p.read_text(encoding="utf-8", errors="ignore")
-        rel = p.relative_to(root).as_posix()
-
-        for i, line in enumerate(text.splitlines(), start=1):
-            if ABS_WIN_PATH_RE.search(line):
-                violations.append({"rule": "no_absolute_windows_path_literal", "file": rel, "line": i, "text": line.strip()})
-            # Only consider traversal tokens when the line appears to deal with filesystem paths.
-            # (Scene tree NodePath like "../Root" is not a filesystem traversal.)
-            if any(
-                t in line
-                for t in (
-                    "System.IO.",
-                    "File.",
-                    "Directory.",
-                    "Path.",
-                    "FileAccess.",
-                    "DirAccess.",
-                    "ProjectSettings.GlobalizePath",
-                    "GetFolderPath",
-                )
-            ):
-                if TRAVERSAL_RE.search(line):
-                    violations.append({"rule": "no_path_traversal_literal", "file": rel, "line": i, "text": line.strip()})
-
-            m = GLOBALIZE_RE.search(line)
-            if m:
-                arg = (m.group(1) or "").strip()
-                if not (arg.startswith("user://") or arg.startswith("res://")):
-                    violations.append(
-                        {
-                            "rule": "globalize_path_only_user_or_res",
-                            "file": rel,
-                            "line": i,
-                            "text": line.strip(),
-                            "arg": arg,
-                        }
-                    )
+    changed = changed_files(root, args.changed_since) if args.changed_since else None
+    violations: list[dict] = scan_sources(root, [PATH_SAFETY_RULE], only=changed)[PATH_SAFETY_RULE.name]
 
     ok = len(violations) == 0
     report = {"ok": ok, "violations": violations, "counts": {"total": len(violations)}}
+    if args.changed_since:
+        report["changed_since"] = changed_since_report(args.changed_since, changed)
     out_path.write_text(json.dumps(report, ensure_ascii=True, indent=2) + "\n", encoding="utf-8")
     print(f"SECURITY_PATH_GATE status={'ok' if ok else 'fail'} violations={len(violations)}")
     return 0 if ok else 1
@@ -24,59 +24,88 @@ from __future__ import annotations
 import argparse
 import json
 import re
+import sys
 from pathlib import Path
 
 
+def _bootstrap_imports() -> None:
+    sc_dir = str(Path(__file__).resolve().parents[1] / "sc")
+    if sc_dir not in sys.path:
+        sys.path.insert(0, sc_dir)
+
+
+_bootstrap_imports()
+
+from _file_discovery import changed_files, changed_since_report  # noqa: E402
+from _pattern_set import PatternSet  # noqa: E402
+from _source_scan import ScanRule, SourceFile, scan_sources  # noqa: E402
+
+
 INTERP_CALL_RE = re.compile(r"\.\s*(Query|Execute)\s*\(\s*\$\"", re.IGNORECASE)
 FORMAT_CALL_RE = re.compile(r"\.\s*(Query|Execute)\s*\(\s*string\.Format\s*\(", re.IGNORECASE)
 INTERP_CMDTEXT_RE = re.compile(r"\bCommandText\s*=\s*\$\"", re.IGNORECASE)
 FORMAT_CMDTEXT_RE = re.compile(r"\bCommandText\s*=\s*string\.Format\s*\(", re.IGNORECASE)
 
+# Every violation needs one of these on the line; lines/files without a candidate hit are skipped.
+PREFILTER = PatternSet(
+    {
+        "interp_call": INTERP_CALL_RE,
+        "format_call": FORMAT_CALL_RE,
+        "interp_cmdtext": INTERP_CMDTEXT_RE,
+        "format_cmdtext": FORMAT_CMDTEXT_RE,
+    },
+    line_mode=True,
+)
+
 
 def repo_root() -> Path:
     return Path(__file__).resolve().parents[2]
 
 
-def iter_cs_files(root: Path) -> list[Path]:
-    roots = [root / "Game.Godot", root / "Game.Core"]
-    files: list[Path] = []
-    for r in roots:
-        if not r.exists():
+def check_file(sf: SourceFile) -> list[dict]:
+    violations: list[dict] = []
+    for i, line in enumerate(sf.lines, start=1):
+        s = line.strip()
+        if not PREFILTER.search(s):
             continue
-        for p in r.rglob("*.cs"):
-            if any(seg in {"bin", "obj", ".godot", "logs"} for seg in p.parts):
+        if INTERP_CALL_RE.search(s) or INTERP_CMDTEXT_RE.search(s):
+            # Allowlist: PRAGMA statements may require whitelisted dynamic tokens (e.g. journal_mode).
+            if "PRAGMA " in s.upper():
                 continue
-            files.append(p)
-    return sorted(files)
+            violations.append({"rule": "no_interpolated_sql_statement", "file": sf.rel, "line": i, "text": s})
+            continue
+        if FORMAT_CALL_RE.search(s) or FORMAT_CMDTEXT_RE.search(s):
+            violations.append({"rule": "no_string_format_sql_statement", "file": sf.rel, "line": i, "text": s})
+    return violations
+
+
+SQL_RULE = ScanRule(
+    name="sql_statement",
+    check=check_file,
+    roots=("Game.Godot", "Game.Core"),
+    exts=frozenset({".cs"}),
+    skip_dirs=frozenset({"bin", "obj", ".godot", "logs"}),
+    prefilter=PREFILTER,
+)
 
 
 def main() -> int:
     ap = argparse.ArgumentParser(description="Hard gate: SQL injection anti-pattern scan (static scan).")
     ap.add_argument("--out", required=True, help="Output JSON path (under logs/ci/... recommended).")
+    ap.add_argument("--changed-since", default=None, metavar="REV", help="Only scan files changed since REV (diff vs merge-base with HEAD, plus untracked files).")
     args = ap.parse_args()
 
     root = repo_root()
     out_path = Path(args.out)
     out_path.parent.mkdir(parents=True, exist_ok=True)
 
-    violations: list[dict] = []
-
-    for p in iter_cs_files(root):
-        text = p.read_text(encoding="utf-8", errors="ignore")
-        rel = p.relative_to(root).as_posix()
-        for i, line in enumerate(text.splitlines(), start=1):
-            s = line.strip()
-            if INTERP_CALL_RE.search(s) or INTERP_CMDTEXT_RE.search(s):
-                # Allowlist: PRAGMA statements may require whitelisted dynamic tokens (e.g. journal_mode).
-                if "PRAGMA " in s.upper():
-                    continue
-                violations.append({"rule": "no_interpolated_sql_statement", "file": rel, "line": i, "text": s})
-                continue
-            if FORMAT_CALL_RE.search(s) or FORMAT_CMDTEXT_RE.search(s):
-                violations.append({"rule": "no_string_format_sql_statement", "file": rel, "line": i, "text": s})
+    changed = changed_files(root, args.changed_since) if args.changed_since else None
+    violations: list[dict] = scan_sources(root, [SQL_RULE], only=changed)[SQL_RULE.name]
 
     ok = len(violations) == 0
     report = {"ok": ok, "violations": violations, "counts": {"total": len(violations)}}
+    if args.changed_since:
+        report["changed_since"] = changed_since_report(args.changed_since, changed)
     out_path.write_text(json.dumps(report, ensure_ascii=True, indent=2) + "\n", encoding="utf-8")
     print(f"SECURITY_SQL_GATE status={'ok' if ok else 'fail'} violations={len(violations)}")
     return 0 if ok else 1
@@ -7,6 +7,7 @@ high-risk API patterns and writes findings to logs for review.
 
 Design:
   - Deterministic string/pattern matching only.
+  - All rules are evaluated in one tree walk (scripts/sc/_source_scan.py).
   - Default exit code is 0 (soft gate). Unexpected errors return 2.
 """
 
@@ -20,6 +21,19 @@ from dataclasses import dataclass
 from pathlib import Path
 
 
+def _bootstrap_imports() -> None:
+    sc_dir = str(Path(__file__).resolve().parents[1] / "sc")
+    if sc_dir not in sys.path:
+        sys.path.insert(0, sc_dir)
+
+
+_bootstrap_imports()
+
+from _file_discovery import changed_files, changed_since_report  # noqa: E402
+from _pattern_set import PatternSet  # noqa: E402
+from _source_scan import ScanRule, SourceFile, compile_glob, scan_sources  # noqa: E402
+
+
 @dataclass(frozen=True)
 class Rule:
     name: str
@@ -36,32 +50,42 @@ def _to_posix(path: Path) -> str:
     return str(path).replace("\\", "/")
 
 
-def iter_code_files(root: Path, globs: tuple[str, ...]) -> list[Path]:
-    files: list[Path] = []
-    for g in globs:
-        files.extend(root.rglob(g))
-    filtered: list[Path] = []
-    for p in files:
-        if not p.is_file():
-            continue
-        if any(seg in {".git", ".godot", "bin", "obj", "logs"} for seg in p.parts):
+def find_matches(sf: SourceFile, rules: list[Rule], prefilter: PatternSet) -> list[dict]:
+    findings: list[dict] = []
+    for i, line in enumerate(sf.lines, start=1):
+        if not prefilter.search(line):
             continue
-        filtered.append(p)
-    return sorted(set(filtered))
+        for rule in rules:
+            if rule.pattern.search(line):
+                findings.append({"file": _to_posix(sf.path), "line": i, "rule": rule.name, "severity": rule.severity, "text": line.strip()})
+    return findings
 
 
-def find_matches(path: Path, rule: Rule) -> list[dict]:
-    text = path.read_text(encoding="utf-8", errors="ignore")
-    findings: list[dict] = []
-    for i, line in enumerate(text.splitlines(), start=1):
-        if rule.pattern.search(line):
-            findings.append({"file": _to_posix(path), "line": i, "rule": rule.name, "severity": rule.severity, "text": line.strip()})
-    return findings
+def to_scan_rules(rules: list[Rule]) -> list[ScanRule]:
+    # Rules sharing a scope are matched together: one combined regex pass per file/line.
+    groups: dict[tuple[str, ...], list[Rule]] = {}
+    for r in rules:
+        groups.setdefault(r.file_globs, []).append(r)
+    out: list[ScanRule] = []
+    for file_globs, members in groups.items():
+        # Same scope as root.rglob(glob) for each glob.
+        globs = [compile_glob("**/" + g) for g in file_globs]
+        prefilter = PatternSet({r.name: r.pattern for r in members}, line_mode=True)
+        out.append(
+            ScanRule(
+                name=",".join(r.name for r in members),
+                check=lambda sf, members=members, prefilter=prefilter: find_matches(sf, members, prefilter),
+                match=lambda rel, globs=globs: any(rx.match(rel) for rx in globs),
+                prefilter=prefilter,
+            )
+        )
+    return out
 
 
 def main() -> int:
     ap = argparse.ArgumentParser(description="Heuristic security soft scan (deterministic).")
     ap.add_argument("--out", required=True, help="Output JSON path (under logs/ci/... recommended).")
+    ap.add_argument("--changed-since", default=None, metavar="REV", help="Only scan files changed since REV (diff vs merge-base with HEAD, plus untracked files).")
     args = ap.parse_args()
 
     root = repo_root()
@@ -107,10 +131,12 @@ def main() -> int:
         ),
     ]
 
-    findings: list[dict] = []
-    for rule in rules:
-        for p in iter_code_files(root, rule.file_globs):
-            findings.extend(find_matches(p, rule))
+    by_rule: dict[str, list[dict]] = {r.name: [] for r in rules}
+    changed = changed_files(root, args.changed_since) if args.changed_since else None
+    for group in scan_sources(root, to_scan_rules(rules), only=changed).values():
+        for f in group:
+            by_rule[f["rule"]].append(f)
+    findings: list[dict] = [f for r in rules for f in by_rule[r.name]]
 
     report = {
         "status": "ok",
@@ -123,6 +149,8 @@ def main() -> int:
             "info": sum(1 for f in findings if f.get("severity") == "info"),
         },
     }
+    if args.changed_since:
+        report["changed_since"] = changed_since_report(args.changed_since, changed)
 
     out_path.write_text(json.dumps(report, ensure_ascii=True, indent=2) + "\n", encoding="utf-8")
     print(f"SECURITY_SOFT_SCAN status=ok findings={len(findings)}")
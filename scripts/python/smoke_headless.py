@@ -31,6 +31,18 @@ import sys
 from pathlib import Path
 
 
+def _record_artifact(path: Path) -> None:
+    # Index the log for latest-artifact lookups (scripts/sc/_artifact_index.py); best-effort.
+    sc_dir = str(Path(__file__).resolve().parents[1] / "sc")
+    if sc_dir not in sys.path:
+        sys.path.insert(0, sc_dir)
+    try:
+        from _artifact_index import record_artifact
+    except ImportError:
+        return
+    record_artifact(path, kind="smoke/headless.log")
+
+
 def _run_smoke(godot_bin: str, project: str, scene: str, timeout_sec: int, mode: str) -> int:
     bin_path = Path(godot_bin)
     if not bin_path.is_file():
@@ -73,6 +85,7 @@ def _run_smoke(godot_bin: str, project: str, scene: str, timeout_sec: int, mode:
 
     combined = "".join(content_parts)
     log_path.write_text(combined, encoding="utf-8", errors="ignore")
+    _record_artifact(log_path)
     print(f"[smoke_headless] log saved at {log_path} (out={out_path}, err={err_path})")
 
     text = combined or ""
@@ -25,11 +25,24 @@ from __future__ import annotations
 import argparse
 import json
 import re
+import sys
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
 
 
+def _bootstrap_imports() -> None:
+    # Shared Taskmaster index lives in scripts/sc (parsed once per process, reused in --in-process runs).
+    sc_dir = str(Path(__file__).resolve().parents[1] / "sc")
+    if sc_dir not in sys.path:
+        sys.path.insert(0, sc_dir)
+
+
+_bootstrap_imports()
+
+from _task_index import load_task_index  # noqa: E402
+
+
 REFS_RE = re.compile(r"\bRefs\s*:\s*(.+)$", flags=re.IGNORECASE)
 XUNIT_MARKER_RE = re.compile(r"^\s*\[\s*(Fact|Theory)\s*\]\s*$")
 GDUNIT_MARKER_RE = re.compile(r"^\s*func\s+test_", flags=re.IGNORECASE)
@@ -39,38 +52,11 @@ def repo_root() -> Path:
     return Path(__file__).resolve().parents[2]
 
 
-def load_json(path: Path) -> Any:
-    return json.loads(path.read_text(encoding="utf-8"))
-
-
 def write_json(path: Path, payload: Any) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
     path.write_text(json.dumps(payload, ensure_ascii=False, indent=2) + "\n", encoding="utf-8", newline="\n")
 
 
-def resolve_current_task_id(tasks_json: dict[str, Any]) -> str:
-    tasks = (tasks_json.get("master") or {}).get("tasks") or []
-    for t in tasks:
-        if not isinstance(t, dict):
-            continue
-        if str(t.get("status")) == "in-progress":
-            return str(t.get("id"))
-    raise ValueError("No task with status=in-progress found in tasks.json")
-
-
-def find_view_task(view: list[dict[str, Any]], task_id: str) -> dict[str, Any] | None:
-    try:
-        tid_int = int(str(task_id))
-    except ValueError:
-        return None
-    for t in view:
-        if not isinstance(t, dict):
-            continue
-        if t.get("taskmaster_id") == tid_int:
-            return t
-    return None
-
-
 def _split_refs_blob(blob: str) -> list[str]:
     normalized = str(blob or "").replace("`", " ").replace(",", " ").replace(";", " ")
     out: list[str] = []
@@ -244,16 +230,13 @@ def main() -> int:
     args = ap.parse_args()
 
     root = repo_root()
-    tasks_json = load_json(root / ".taskmaster/tasks/tasks.json")
-    task_id = str(args.task_id or "").strip() or resolve_current_task_id(tasks_json)
-
-    back_view = load_json(root / ".taskmaster/tasks/tasks_back.json")
-    gameplay_view = load_json(root / ".taskmaster/tasks/tasks_gameplay.json")
-    if not isinstance(back_view, list) or not isinstance(gameplay_view, list):
+    index = load_task_index()
+    task_id = str(args.task_id or "").strip() or index.current_task_id()
+    if not index.views_are_lists:
         raise ValueError("Expected tasks_back.json/tasks_gameplay.json to be JSON arrays")
 
-    back_entry = find_view_task(back_view, task_id)
-    game_entry = find_view_task(gameplay_view, task_id)
+    back_entry = index.back(task_id)
+    game_entry = index.gameplay(task_id)
 
     results: list[dict[str, Any]] = []
     if back_entry is not None:
@@ -5,12 +5,26 @@ import argparse
 import datetime as dt
 import json
 import re
+import sys
 import xml.etree.ElementTree as ET
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
 
 
+def _bootstrap_imports() -> None:
+    # Shared Taskmaster index lives in scripts/sc (parsed once per process, reused in --in-process runs).
+    sc_dir = str(Path(__file__).resolve().parents[1] / "sc")
+    if sc_dir not in sys.path:
+        sys.path.insert(0, sc_dir)
+
+
+_bootstrap_imports()
+
+from _artifact_index import latest  # noqa: E402
+from _task_index import load_task_index  # noqa: E402
+
+
 REFS_RE = re.compile(r"\bRefs\s*:\s*(.+)$", flags=re.IGNORECASE)
 CS_FACT_RE = re.compile(r"^\s*\[\s*(Fact|Theory)\s*\]\s*$")
 CS_METHOD_RE = re.compile(r"^\s*public\s+(?:async\s+)?(?:Task(?:<[^>]+>)?|void)\s+([A-Za-z_][A-Za-z0-9_]*)\s*\(")
@@ -49,29 +63,6 @@ def parse_refs_from_line(line: str) -> list[str]:
     return _split_refs_blob(m.group(1) or "")
 
 
-def resolve_current_task_id(tasks_json: dict[str, Any]) -> str:
-    tasks = (tasks_json.get("master") or {}).get("tasks") or []
-    for t in tasks:
-        if not isinstance(t, dict):
-            continue
-        if str(t.get("status")) == "in-progress":
-            return str(t.get("id"))
-    raise ValueError("No task with status=in-progress found in tasks.json")
-
-
-def find_view_task(view: list[dict[str, Any]], task_id: str) -> dict[str, Any] | None:
-    try:
-        tid_int = int(str(task_id))
-    except ValueError:
-        return None
-    for t in view:
-        if not isinstance(t, dict):
-            continue
-        if t.get("taskmaster_id") == tid_int:
-            return t
-    return None
-
-
 def load_sc_test_summary(root: Path, date: str) -> dict[str, Any]:
     p = root / "logs" / "ci" / date / "sc-test" / "summary.json"
     return load_json(p) if p.exists() else {}
@@ -87,6 +78,9 @@ def get_step(summary: dict[str, Any], name: str) -> dict[str, Any] | None:
 def find_latest_trx(unit_dir: Path) -> Path | None:
     if not unit_dir.exists():
         return None
+    indexed = latest("unit/tests.trx", under=unit_dir)
+    if indexed:
+        return indexed
     candidates = list(unit_dir.glob("*.trx"))
     if not candidates:
         return None
@@ -107,6 +101,10 @@ def parse_trx_test_names(trx_path: Path) -> set[str]:
 def find_latest_gdunit_results_xml(report_dir: Path) -> Path | None:
     if not report_dir.exists():
         return None
+    # sc-test indexes the results.xml it ingests; the scan covers reports from other runners.
+    indexed = latest("gdunit/results.xml", under=report_dir)
+    if indexed:
+        return indexed
     xmls = list(report_dir.rglob("results.xml"))
     if not xmls:
         return None
@@ -291,8 +289,8 @@ def main() -> int:
     args = ap.parse_args()
 
     root = repo_root()
-    tasks_json = load_json(root / ".taskmaster/tasks/tasks.json")
-    task_id = str(args.task_id or "").strip() or resolve_current_task_id(tasks_json)
+    index = load_task_index()
+    task_id = str(args.task_id or "").strip() or index.current_task_id()
     date = args.date.strip() or dt.date.today().strftime("%Y-%m-%d")
 
     summary = load_sc_test_summary(root, date)
@@ -356,13 +354,11 @@ def main() -> int:
         if str(gd_run_id_value or "") != args.run_id:
             meta["errors"].append("gdunit_run_id_mismatch_or_missing")
 
-    back_view = load_json(root / ".taskmaster/tasks/tasks_back.json")
-    gameplay_view = load_json(root / ".taskmaster/tasks/tasks_gameplay.json")
-    if not isinstance(back_view, list) or not isinstance(gameplay_view, list):
+    if not index.views_are_lists:
         raise ValueError("Expected tasks_back.json/tasks_gameplay.json to be JSON arrays")
 
-    back_entry = find_view_task(back_view, task_id)
-    game_entry = find_view_task(gameplay_view, task_id)
+    back_entry = index.back(task_id)
+    game_entry = index.gameplay(task_id)
 
     results: list[dict[str, Any]] = []
     if back_entry is not None:
@@ -27,10 +27,23 @@ import argparse
 import json
 import os
 import re
+import sys
 from pathlib import Path
 from typing import Any
 
 
+def _bootstrap_imports() -> None:
+    # Shared Taskmaster index lives in scripts/sc (parsed once per process, reused in --in-process runs).
+    sc_dir = str(Path(__file__).resolve().parents[1] / "sc")
+    if sc_dir not in sys.path:
+        sys.path.insert(0, sc_dir)
+
+
+_bootstrap_imports()
+
+from _task_index import load_task_index  # noqa: E402
+
+
 REFS_RE = re.compile(r"\bRefs\s*:\s*(.+)$", flags=re.IGNORECASE)
 
 
@@ -76,33 +89,6 @@ def repo_root() -> Path:
     return Path(__file__).resolve().parents[2]
 
 
-def load_json(path: Path) -> Any:
-    return json.loads(path.read_text(encoding="utf-8"))
-
-
-def resolve_current_task_id(tasks_json: dict[str, Any]) -> str:
-    tasks = (tasks_json.get("master") or {}).get("tasks") or []
-    for t in tasks:
-        if not isinstance(t, dict):
-            continue
-        if str(t.get("status")) == "in-progress":
-            return str(t.get("id"))
-    raise ValueError("No task with status=in-progress found in tasks.json")
-
-
-def find_view_task(view: list[dict[str, Any]], task_id: str) -> dict[str, Any] | None:
-    try:
-        tid_int = int(str(task_id))
-    except ValueError:
-        return None
-    for t in view:
-        if not isinstance(t, dict):
-            continue
-        if t.get("taskmaster_id") == tid_int:
-            return t
-    return None
-
-
 def is_abs_path(p: str) -> bool:
     if not p:
         return False
@@ -243,20 +229,13 @@ def main() -> int:
     out_path = Path(args.out)
     out_path.parent.mkdir(parents=True, exist_ok=True)
 
-    tasks_json_path = root / ".taskmaster" / "tasks" / "tasks.json"
-    back_path = root / ".taskmaster" / "tasks" / "tasks_back.json"
-    gameplay_path = root / ".taskmaster" / "tasks" / "tasks_gameplay.json"
-
-    tasks_json = load_json(tasks_json_path)
-    task_id = str(args.task_id).strip() if args.task_id else resolve_current_task_id(tasks_json)
-
-    back = load_json(back_path)
-    gameplay = load_json(gameplay_path)
-    if not isinstance(back, list) or not isinstance(gameplay, list):
+    index = load_task_index()
+    task_id = str(args.task_id).strip() if args.task_id else index.current_task_id()
+    if not index.views_are_lists:
         raise ValueError("tasks_back.json and tasks_gameplay.json must be JSON arrays")
 
-    back_task = find_view_task(back, task_id)
-    gameplay_task = find_view_task(gameplay, task_id)
+    back_task = index.back(task_id)
+    gameplay_task = index.gameplay(task_id)
 
     back_report = validate_view(root=root, label="tasks_back.json", entry=back_task, stage=args.stage)
     game_report = validate_view(root=root, label="tasks_gameplay.json", entry=gameplay_task, stage=args.stage)
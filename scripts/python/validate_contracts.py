@@ -13,6 +13,8 @@ Exit code:
 
 Notes:
 - Docs without any contract references are reported as warnings (non-blocking).
+- With --changed-since REV the check is repo-wide but only re-run when an overlay
+  08 doc or a contract file changed since REV; otherwise a skipped report is written.
 """
 
 from __future__ import annotations
@@ -23,10 +25,22 @@ import re
 import sys
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, Iterable, List
+
+
+def _bootstrap_imports() -> None:
+    sc_dir = str(Path(__file__).resolve().parents[1] / "sc")
+    if sc_dir not in sys.path:
+        sys.path.insert(0, sc_dir)
+
+
+_bootstrap_imports()
+
+from _file_discovery import changed_files, changed_since_report  # noqa: E402
 
 
 CONTRACTS_PREFIX = "Game.Core/Contracts/"
+OVERLAYS_PREFIX = "docs/architecture/overlays/"
 
 
 def find_overlay_docs(root: Path) -> List[Path]:
@@ -136,6 +150,18 @@ def build_report(root: Path) -> Dict[str, object]:
     }
 
 
+def touches_inputs(changed: Iterable[str]) -> bool:
+    """Return True if any changed path is an overlay 08 doc or a contract file."""
+
+    for rel in changed:
+        if rel.startswith(CONTRACTS_PREFIX) and rel.endswith(".cs"):
+            return True
+        parts = rel[len(OVERLAYS_PREFIX):].split("/") if rel.startswith(OVERLAYS_PREFIX) else []
+        if len(parts) == 3 and parts[1] == "08" and parts[2].endswith(".md"):
+            return True
+    return False
+
+
 def write_report(root: Path, report: Dict[str, object]) -> Path:
     """Write JSON report to logs/ci/<YYYY-MM-DD>/contracts-validate.json."""
 
@@ -160,10 +186,31 @@ def main(argv: list[str] | None = None) -> int:
         help="Project root directory (default: current directory)",
     )
 
+    parser.add_argument(
+        "--changed-since",
+        default=None,
+        metavar="REV",
+        help="Skip unless overlay 08 docs or contract files changed since REV (diff vs merge-base with HEAD).",
+    )
+
     args = parser.parse_args(argv)
     root = Path(args.root).resolve()
 
+    changed = changed_files(root, args.changed_since) if args.changed_since else None
+    if changed is not None and not touches_inputs(changed):
+        report: Dict[str, object] = {
+            "ok": True,
+            "status": "skipped",
+            "reason": f"no overlay 08 docs or contract files changed since {args.changed_since}",
+            "changed_since": changed_since_report(args.changed_since, changed),
+        }
+        out_path = write_report(root, report)
+        print(f"Contracts validation skipped (inputs unchanged); report written to: {out_path}")
+        return 0
+
     report = build_report(root)
+    if args.changed_since:
+        report["changed_since"] = changed_since_report(args.changed_since, changed)
     out_path = write_report(root, report)
 
     print(f"Contracts validation report written to: {out_path}")
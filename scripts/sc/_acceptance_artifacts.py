@@ -14,7 +14,8 @@ import json
 from pathlib import Path
 from typing import Any
 
-from _util import repo_root, today_str
+from _artifact_index import latest
+from _util import repo_root
 
 
 def _to_posix(path: Path) -> str:
@@ -22,41 +23,9 @@ def _to_posix(path: Path) -> str:
 
 
 def find_latest_acceptance_dir(*, task_id: str | None) -> Path | None:
-    ci_root = repo_root() / "logs" / "ci"
-    if not ci_root.exists():
-        return None
-
-    candidates: list[Path] = []
-    today_dir = ci_root / today_str()
-    if today_dir.exists():
-        for p in [today_dir / "sc-acceptance-check", *today_dir.glob("sc-acceptance-check-task-*")]:
-            if (p / "summary.json").is_file():
-                candidates.append(p)
-
-    if not candidates:
-        for summary in ci_root.rglob("summary.json"):
-            parent = summary.parent
-            if parent.name.startswith("sc-acceptance-check"):
-                candidates.append(parent)
-
-    best: Path | None = None
-    best_mtime = -1.0
-    for p in candidates:
-        summary = p / "summary.json"
-        try:
-            data = json.loads(summary.read_text(encoding="utf-8"))
-        except Exception:
-            continue
-        if task_id and str(data.get("task_id") or "") != str(task_id):
-            continue
-        try:
-            mtime = summary.stat().st_mtime
-        except OSError:
-            mtime = 0.0
-        if mtime > best_mtime:
-            best_mtime = mtime
-            best = p
-    return best
+    # sc-acceptance-check and sc-acceptance-check-task-<id> both index as this kind (scripts/sc/_artifact_index.py).
+    summary = latest("sc-acceptance-check/summary.json", task_id=str(task_id) if task_id else None)
+    return summary.parent if summary else None
 
 
 def _read_json(path: Path) -> dict[str, Any] | None:
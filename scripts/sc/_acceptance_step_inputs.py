@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Declared inputs/artifacts of cacheable sc-acceptance-check steps.
+
+Each entry lists every repo file the step's scripts read (including the scripts
+themselves) and the files the step writes into out_dir. When a validator starts
+reading a new location, its globs here must be extended, otherwise the cached
+result can go stale.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+from _step_cache import StepInputs
+
+_TASKS = (".taskmaster/tasks/*.json",)
+_TASK_INDEX = ("scripts/sc/_task_index.py", "scripts/sc/_util.py")
+# Refs/anchors validators check existence (and anchors read contents) of referenced test files.
+_TEST_TREES = ("Game.Core.Tests/**", "Game.Godot.Tests/**", "Tests.Godot/**")
+_RUNNER = ("scripts/sc/_acceptance_steps_core.py", "scripts/sc/_inprocess.py")
+_SCANNER = ("scripts/sc/_source_scan.py", "scripts/sc/_pattern_set.py", "scripts/sc/_file_discovery.py")
+
+
+def _script(*names: str) -> tuple[str, ...]:
+    return tuple(f"scripts/python/{n}.py" for n in names)
+
+
+_STEP_INPUTS: dict[str, StepInputs] = {
+    "sc-internal-imports": StepInputs(
+        globs=("scripts/sc/**/*.py", *_script("check_sc_internal_imports")),
+        artifacts=("sc-internal-imports.log", "sc-internal-imports.json"),
+    ),
+    "task-links-validate": StepInputs(
+        globs=(
+            *_TASKS,
+            "docs/adr/ADR-*.md",
+            "docs/architecture/overlays/**",
+            *_script("task_links_validate", "check_tasks_back_references", "check_tasks_all_refs"),
+            *_RUNNER,
+        ),
+        artifacts=("task-links-validate.log",),
+    ),
+    "task-test-refs-validate": StepInputs(
+        globs=(*_TASKS, *_TEST_TREES, *_script("validate_task_test_refs"), *_TASK_INDEX, *_RUNNER),
+        artifacts=("task-test-refs-validate.log", "task-test-refs.json"),
+    ),
+    "acceptance-refs-validate": StepInputs(
+        globs=(*_TASKS, *_TEST_TREES, *_script("validate_acceptance_refs"), *_TASK_INDEX, *_RUNNER),
+        artifacts=("acceptance-refs-validate.log", "acceptance-refs.json"),
+    ),
+    "acceptance-anchors-validate": StepInputs(
+        globs=(*_TASKS, *_TEST_TREES, *_script("validate_acceptance_anchors"), *_TASK_INDEX, *_RUNNER),
+        artifacts=("acceptance-anchors-validate.log", "acceptance-anchors.json"),
+    ),
+    "validate-task-overlays": StepInputs(
+        globs=(*_TASKS, "docs/adr/ADR-*.md", "docs/architecture/overlays/**", *_script("validate_task_overlays"), *_RUNNER),
+        artifacts=("validate-task-overlays.log", "validate-task-overlays.json"),
+    ),
+    "contracts-validate": StepInputs(
+        globs=(
+            *_TASKS,
+            "docs/architecture/overlays/**/*.md",
+            "Game.Core/Contracts/**/*.cs",
+            *_script("validate_contracts", "check_gameloop_contracts", "validate_task_contract_refs"),
+            "scripts/sc/_file_discovery.py",
+            *_RUNNER,
+        ),
+        artifacts=(
+            "validate-contracts.log",
+            "check-gameloop-contracts.log",
+            "validate-task-contract-refs.log",
+            "task-contract-refs.json",
+            "contracts-validate.json",
+        ),
+    ),
+    "architecture-boundary": StepInputs(
+        globs=("Game.Core/**/*.cs", "Game.Core/Game.Core.csproj", *_script("check_architecture_boundary"), *_SCANNER, *_RUNNER),
+        artifacts=("architecture-boundary.log", "architecture-boundary.json"),
+    ),
+    # MSBuild sees every *.cs under a project dir; props/targets/.editorconfig change analyzers and warning levels.
+    "dotnet-build-warnaserror": StepInputs(
+        globs=(
+            "**/*.cs",
+            "**/*.csproj",
+            "*.sln",
+            "**/Directory.Build.*",
+            "**/*.props",
+            "**/*.targets",
+            "**/.editorconfig",
+            "global.json",
+            "nuget.config",
+            "scripts/sc/build.py",
+            "scripts/sc/_util.py",
+            *_RUNNER,
+        ),
+        artifacts=("dotnet-build-warnaserror.log",),
+    ),
+    "quality-rules": StepInputs(
+        globs=("**/*.cs", "scripts/sc/_quality_rules.py", "scripts/sc/_acceptance_steps_quality.py", *_SCANNER),
+        artifacts=("quality-rules.log", "quality-rules.json"),
+    ),
+    "security-hard": StepInputs(
+        globs=(
+            "Game.Godot/**",
+            "Game.Core/**",
+            *_script("security_hard_path_gate", "security_hard_sql_gate", "security_hard_audit_gate"),
+            *_SCANNER,
+            *_RUNNER,
+        ),
+        artifacts=(
+            "security-path-gate.log",
+            "security-path-gate.json",
+            "security-sql-gate.log",
+            "security-sql-gate.json",
+            "security-audit-gate.log",
+            "security-audit-gate.json",
+            "security-hard.json",
+        ),
+    ),
+    "ui-event-security": StepInputs(
+        globs=(
+            "Game.Godot/**/*.cs",
+            *_script("validate_ui_event_json_guards", "validate_ui_event_source_verification"),
+            *_RUNNER,
+        ),
+        artifacts=(
+            "ui-event-json-guards.log",
+            "ui-event-json-guards.json",
+            "ui-event-source-verify.log",
+            "ui-event-source-verify.json",
+            "ui-event-security.json",
+        ),
+    ),
+}
+
+
+def acceptance_step_inputs(key: str, **params: Any) -> StepInputs | None:
+    """
+    Returns the declared inputs for `key` (bound to the step's params), or None if the step is not cacheable.
+    """
+    base = _STEP_INPUTS.get(key)
+    if base is None:
+        return None
+    return StepInputs(globs=base.globs, artifacts=base.artifacts, params={**base.params, **params})
@@ -8,7 +8,8 @@ from typing import Any
 
 from _step_result import StepResult
 from _taskmaster import TaskmasterTriplet
-from _util import repo_root, run_cmd, today_str, write_json, write_text
+from _inprocess import run_step_cmd
+from _util import repo_root, today_str, write_json, write_text
 
 ADR_STATUS_RE = re.compile(r"^\s*-?\s*(?:Status|status)\s*:\s*([A-Za-z]+)\s*$", re.MULTILINE)
 REFS_RE = re.compile(r"\bRefs\s*:\s*(.+)$", flags=re.IGNORECASE)
@@ -32,7 +33,7 @@ def read_adr_status(path: Path) -> str | None:
 
 
 def run_and_capture(out_dir: Path, name: str, cmd: list[str], timeout_sec: int) -> StepResult:
-    rc, out = run_cmd(cmd, cwd=repo_root(), timeout_sec=timeout_sec)
+    rc, out = run_step_cmd(cmd, cwd=repo_root(), timeout_sec=timeout_sec)
     log_path = out_dir / f"{name}.log"
     write_text(log_path, out)
     return StepResult(name=name, status="ok" if rc == 0 else "fail", rc=rc, cmd=cmd, log=str(log_path))
@@ -48,7 +49,7 @@ def run_and_capture_mode(out_dir: Path, name: str, cmd: list[str], timeout_sec:
     mode = str(mode or "require").strip().lower()
     if mode == "skip":
         return StepResult(name=name, status="skipped", rc=0, cmd=cmd, details={"mode": "skip"})
-    rc, out = run_cmd(cmd, cwd=repo_root(), timeout_sec=timeout_sec)
+    rc, out = run_step_cmd(cmd, cwd=repo_root(), timeout_sec=timeout_sec)
     log_path = out_dir / f"{name}.log"
     write_text(log_path, out)
     if mode == "warn":
@@ -56,6 +57,10 @@ def run_and_capture_mode(out_dir: Path, name: str, cmd: list[str], timeout_sec:
     return StepResult(name=name, status="ok" if rc == 0 else "fail", rc=rc, cmd=cmd, log=str(log_path), details={"mode": "require"})
 
 
+def _changed_since_args(changed_since: str | None) -> list[str]:
+    return ["--changed-since", changed_since] if changed_since else []
+
+
 def step_adr_compliance(out_dir: Path, triplet: TaskmasterTriplet, *, strict_status: bool) -> StepResult:
     root = repo_root()
     adr_refs = triplet.adr_refs()
@@ -144,7 +149,7 @@ def step_sc_analyze_task_context(
     if mode_n == "skip":
         return StepResult(name="sc-analyze", status="skipped", rc=0, cmd=cmd, details={"mode": "skip"})
 
-    rc, out = run_cmd(cmd, cwd=repo_root(), timeout_sec=int(timeout_sec))
+    rc, out = run_step_cmd(cmd, cwd=repo_root(), timeout_sec=int(timeout_sec))
     log_path = out_dir / "sc-analyze.log"
     write_text(log_path, out)
 
@@ -239,7 +244,7 @@ def step_task_context_required_fields(
             return StepResult(name="task-context-required", status="ok", rc=0, cmd=cmd, details={**details, "rc": 2})
         return StepResult(name="task-context-required", status="fail", rc=1, cmd=cmd, details=details)
 
-    rc, out = run_cmd(cmd, cwd=repo_root(), timeout_sec=int(timeout_sec))
+    rc, out = run_step_cmd(cmd, cwd=repo_root(), timeout_sec=int(timeout_sec))
     log_path = out_dir / "task-context-required.log"
     write_text(log_path, out)
 
@@ -309,9 +314,11 @@ def step_overlay_validate(out_dir: Path) -> StepResult:
     return StepResult(name="validate-task-overlays", status="ok" if ok else "fail", rc=0 if ok else 1, cmd=primary.cmd, log=primary.log, details=details)
 
 
-def step_contracts_validate(out_dir: Path) -> StepResult:
+def step_contracts_validate(out_dir: Path, *, changed_since: str | None = None) -> StepResult:
     steps: list[StepResult] = []
-    steps.append(run_and_capture(out_dir, "validate-contracts", ["py", "-3", "scripts/python/validate_contracts.py"], 300))
+    steps.append(
+        run_and_capture(out_dir, "validate-contracts", ["py", "-3", "scripts/python/validate_contracts.py", *_changed_since_args(changed_since)], 300)
+    )
     steps.append(run_and_capture(out_dir, "check-gameloop-contracts", ["py", "-3", "scripts/python/check_gameloop_contracts.py"], 60))
     steps.append(
         run_and_capture(
@@ -327,11 +334,18 @@ def step_contracts_validate(out_dir: Path) -> StepResult:
     return StepResult(name="contracts-validate", status="fail" if hard_failed else "ok", rc=1 if hard_failed else 0, details=details)
 
 
-def step_architecture_boundary(out_dir: Path) -> StepResult:
+def step_architecture_boundary(out_dir: Path, *, changed_since: str | None = None) -> StepResult:
     return run_and_capture(
         out_dir,
         "architecture-boundary",
-        ["py", "-3", "scripts/python/check_architecture_boundary.py", "--out", str(out_dir / "architecture-boundary.json")],
+        [
+            "py",
+            "-3",
+            "scripts/python/check_architecture_boundary.py",
+            "--out",
+            str(out_dir / "architecture-boundary.json"),
+            *_changed_since_args(changed_since),
+        ],
         120,
     )
 
@@ -340,7 +354,7 @@ def step_build_warnaserror(out_dir: Path, *, target: str = "Rouge.csproj") -> St
     return run_and_capture(out_dir, "dotnet-build-warnaserror", ["py", "-3", "scripts/sc/build.py", target, "--type", "dev"], 1_800)
 
 
-def step_security_soft(out_dir: Path) -> StepResult:
+def step_security_soft(out_dir: Path, *, changed_since: str | None = None) -> StepResult:
     steps: list[StepResult] = []
     steps.append(run_and_capture(out_dir, "check-sentry-secrets", ["py", "-3", "scripts/python/check_sentry_secrets.py"], 60))
     steps.append(run_and_capture(out_dir, "check-domain-contracts", ["py", "-3", "scripts/python/check_domain_contracts.py"], 60))
@@ -348,17 +362,24 @@ def step_security_soft(out_dir: Path) -> StepResult:
         run_and_capture(
             out_dir,
             "security-soft-scan",
-            ["py", "-3", "scripts/python/security_soft_scan.py", "--out", str(out_dir / "security-soft-scan.json")],
+            ["py", "-3", "scripts/python/security_soft_scan.py", "--out", str(out_dir / "security-soft-scan.json"), *_changed_since_args(changed_since)],
             120,
         )
     )
-    steps.append(run_and_capture(out_dir, "check-encoding-since-today", ["py", "-3", "scripts/python/check_encoding.py", "--since-today"], 300))
+    if changed_since:
+        steps.append(
+            run_and_capture(out_dir, "check-encoding-changed-since", ["py", "-3", "scripts/python/check_encoding.py", *_changed_since_args(changed_since)], 300)
+        )
+    else:
+        steps.append(run_and_capture(out_dir, "check-encoding-since-today", ["py", "-3", "scripts/python/check_encoding.py", "--since-today"], 300))
     details = {"steps": [s.__dict__ for s in steps]}
     write_json(out_dir / "security-soft.json", details)
     return StepResult(name="security-soft", status="ok", details=details)
 
 
-def step_security_hard(out_dir: Path, *, path_mode: str, sql_mode: str, audit_schema_mode: str) -> StepResult:
+def step_security_hard(
+    out_dir: Path, *, path_mode: str, sql_mode: str, audit_schema_mode: str, changed_since: str | None = None
+) -> StepResult:
     path_out = out_dir / "security-path-gate.json"
     sql_out = out_dir / "security-sql-gate.json"
     audit_out = out_dir / "security-audit-gate.json"
@@ -367,7 +388,7 @@ def step_security_hard(out_dir: Path, *, path_mode: str, sql_mode: str, audit_sc
         run_and_capture_mode(
             out_dir,
             "security-path-gate",
-            ["py", "-3", "scripts/python/security_hard_path_gate.py", "--out", str(path_out)],
+            ["py", "-3", "scripts/python/security_hard_path_gate.py", "--out", str(path_out), *_changed_since_args(changed_since)],
             120,
             mode=path_mode,
         )
@@ -376,7 +397,7 @@ def step_security_hard(out_dir: Path, *, path_mode: str, sql_mode: str, audit_sc
         run_and_capture_mode(
             out_dir,
             "security-sql-gate",
-            ["py", "-3", "scripts/python/security_hard_sql_gate.py", "--out", str(sql_out)],
+            ["py", "-3", "scripts/python/security_hard_sql_gate.py", "--out", str(sql_out), *_changed_since_args(changed_since)],
             120,
             mode=sql_mode,
         )
@@ -385,7 +406,7 @@ def step_security_hard(out_dir: Path, *, path_mode: str, sql_mode: str, audit_sc
         run_and_capture_mode(
             out_dir,
             "security-audit-gate",
-            ["py", "-3", "scripts/python/security_hard_audit_gate.py", "--out", str(audit_out)],
+            ["py", "-3", "scripts/python/security_hard_audit_gate.py", "--out", str(audit_out), *_changed_since_args(changed_since)],
             120,
             mode=audit_schema_mode,
         )
@@ -4,6 +4,7 @@ import re
 from pathlib import Path
 from typing import Any
 
+from _artifact_index import latest
 from _step_result import StepResult
 from _util import repo_root, write_json
 
@@ -13,13 +14,8 @@ PERF_METRICS_RE = re.compile(
 
 
 def find_latest_headless_log() -> Path | None:
-    ci_root = repo_root() / "logs" / "ci"
-    if not ci_root.exists():
-        return None
-    candidates = list(ci_root.rglob("headless.log"))
-    if not candidates:
-        return None
-    return max(candidates, key=lambda p: p.stat().st_mtime)
+    # Written by smoke_headless.py/.ps1 under logs/ci/<ts>/smoke/ and indexed there.
+    return latest("smoke/headless.log")
 
 
 def step_perf_budget(out_dir: Path, *, max_p95_ms: int) -> StepResult:
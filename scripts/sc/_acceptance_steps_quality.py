@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from pathlib import Path
 
+from _file_discovery import changed_files, changed_since_report
 from _quality_rules import scan_quality_rules
 from _step_result import StepResult
 from _taskmaster import TaskmasterTriplet
@@ -49,8 +50,11 @@ def step_test_quality_soft(out_dir: Path, triplet: TaskmasterTriplet, *, strict:
     return StepResult(name="test-quality", status=status, rc=0 if status == "ok" else 1, log=str(log_path), details=report)
 
 
-def step_quality_rules(out_dir: Path, *, strict: bool) -> StepResult:
-    report = scan_quality_rules(repo_root=repo_root())
+def step_quality_rules(out_dir: Path, *, strict: bool, changed_since: str | None = None) -> StepResult:
+    changed = changed_files(repo_root(), changed_since) if changed_since else None
+    report = scan_quality_rules(repo_root=repo_root(), only=changed)
+    if changed_since:
+        report["changed_since"] = changed_since_report(changed_since, changed)
     write_json(out_dir / "quality-rules.json", report)
 
     verdict = str(report.get("verdict") or "OK")
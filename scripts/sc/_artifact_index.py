@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""
+Append-only run-artifact index for logs/ci.
+
+Why:
+  "Latest artifact of kind X (for task Y)" lookups (acceptance summaries, headless.log,
+  GdUnit4 results.xml) rglob'ed the whole dated logs/ci tree and parsed every match;
+  with months of dated directories on a CI box those lookups dominated step time.
+
+What:
+  - <ci root>/artifact-index.jsonl (ci root = SC_CI_ROOT or logs/ci): one JSON line
+    per written artifact {ts, kind, path, task_id, status}, appended with a single
+    O_APPEND write so concurrent tools never interleave lines.
+  - _util.write_json / write_text record summaries (summary*.json), reports
+    (report*.md) and logs (*.log) under the ci root automatically; other writers
+    (smoke_headless.py, sc-test for GdUnit4/xUnit results) call record_artifact().
+  - kind defaults to "<tool>/<file name>" where tool is the directory under the
+    date (a "-task-<id>" suffix is dropped and becomes task_id), e.g.
+    "sc-acceptance-check/summary.json", "smoke/headless.log".
+  - latest(kind, task_id=..., under=...) reads the manifest backwards from the end,
+    so a lookup only touches entries newer than the hit instead of the whole tree.
+
+Notes:
+  - The first lookup without a manifest backfills it once from the existing tree
+    (oldest first); afterwards the manifest is authoritative and no tree walk happens.
+  - Entries whose file is gone (pruned logs) are skipped by latest();
+    rewrite_index() drops them (used by the log retention tool).
+  - Recording is best-effort: an unwritable index never fails the tool writing the artifact.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+import time
+from pathlib import Path
+from typing import Any, Iterable, Iterator
+
+INDEX_NAME = "artifact-index.jsonl"
+
+_DATE_DIR_RE = re.compile(r"^\d{4}-\d{2}-\d{2}$|^\d{8}-\d{6}$")
+_TASK_SUFFIX_RE = re.compile(r"^(.+)-task-([\w.-]+)$")
+_AUTO_RE = re.compile(r"^(?:summary.*\.json|report.*\.md|.*\.log)$", re.IGNORECASE)
+_BACKFILL_RE = re.compile(r"^(?:summary.*\.json|report.*\.md|.*\.log|results\.xml|.*\.trx)$", re.IGNORECASE)
+_BLOCK = 64 * 1024
+
+
+def _repo_root() -> Path:
+    # scripts/sc/_artifact_index.py -> repo root (no _util import: _util depends on this module)
+    return Path(__file__).resolve().parents[2]
+
+
+def ci_root() -> Path:
+    # SC_CI_ROOT redirects run outputs (default: <repo>/logs/ci), e.g. for benchmark runs.
+    override = str(os.environ.get("SC_CI_ROOT") or "").strip()
+    return Path(override).resolve() if override else _repo_root() / "logs" / "ci"
+
+
+def index_path() -> Path:
+    return ci_root() / INDEX_NAME
+
+
+def _rel(path: Path) -> str:
+    try:
+        return path.relative_to(_repo_root()).as_posix()
+    except ValueError:
+        return path.as_posix()
+
+
+def _abs(raw: str) -> Path:
+    p = Path(raw)
+    return p if p.is_absolute() else _repo_root() / p
+
+
+def classify(path: Path) -> tuple[str, str | None]:
+    """
+    (kind, task_id) for a path: "<tool>/<name>" under <ci root>/<date>/<tool>/, else the file name.
+    """
+    path = Path(path).resolve()
+    try:
+        parts = path.relative_to(ci_root()).parts
+    except ValueError:
+        return path.name, None
+    if len(parts) >= 3 and _DATE_DIR_RE.match(parts[0]):
+        tool, task_id = parts[1], None
+        m = _TASK_SUFFIX_RE.match(tool)
+        if m:
+            tool, task_id = m.group(1), m.group(2)
+        return f"{tool}/{path.name}", task_id
+    return path.name, None
+
+
+def _entry(path: Path, *, kind: str | None, task_id: Any, status: Any, ts: float | None) -> dict[str, Any]:
+    auto_kind, auto_task = classify(path)
+    return {
+        "ts": round(ts if ts is not None else time.time(), 3),
+        "kind": kind or auto_kind,
+        "path": _rel(path),
+        "task_id": str(task_id) if task_id not in (None, "") else auto_task,
+        "status": str(status) if status not in (None, "") else None,
+    }
+
+
+def _append(lines: Iterable[dict[str, Any]]) -> None:
+    data = "".join(json.dumps(e, ensure_ascii=False) + "\n" for e in lines).encode("utf-8")
+    if not data:
+        return
+    index = index_path()
+    index.parent.mkdir(parents=True, exist_ok=True)
+    fd = os.open(str(index), os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    try:
+        os.write(fd, data)
+    finally:
+        os.close(fd)
+
+
+def record_artifact(
+    path: Path,
+    *,
+    kind: str | None = None,
+    task_id: Any = None,
+    status: Any = None,
+) -> None:
+    """
+    Appends one manifest entry. Without an explicit kind only summaries/reports/logs under the ci root are recorded.
+    """
+    path = Path(path).resolve()
+    if kind is None:
+        if not _AUTO_RE.match(path.name):
+            return
+        try:
+            path.relative_to(ci_root())
+        except ValueError:
+            return
+    try:
+        if not index_path().is_file():
+            backfill()  # entries appended before the marker would hide everything older
+        _append([_entry(path, kind=kind, task_id=task_id, status=status, ts=None)])
+    except OSError:
+        pass
+
+
+def _summary_meta(path: Path) -> tuple[Any, Any]:
+    if not path.name.lower().endswith(".json"):
+        return None, None
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None, None
+    if not isinstance(data, dict):
+        return None, None
+    return data.get("task_id"), data.get("status")
+
+
+def backfill(root: Path | None = None) -> int:
+    """
+    Indexes the existing tree once (oldest first). Returns the number of entries written.
+    """
+    root = root or ci_root()
+    found: list[tuple[float, Path]] = []
+    for cur, _dirs, names in os.walk(root):
+        for name in names:
+            if name != INDEX_NAME and _BACKFILL_RE.match(name):
+                p = Path(cur) / name
+                try:
+                    found.append((p.stat().st_mtime, p))
+                except OSError:
+                    continue
+    entries = []
+    for mtime, p in sorted(found, key=lambda x: x[0]):
+        task_id, status = _summary_meta(p)
+        entries.append(_entry(p, kind=None, task_id=task_id, status=status, ts=mtime))
+    # Marker first: an empty tree still produces a manifest, so the walk is not repeated.
+    _append([{"ts": round(time.time(), 3), "kind": "_backfill", "path": _rel(root), "task_id": None, "status": None}, *entries])
+    return len(entries)
+
+
+def iter_entries_reverse(index: Path | None = None) -> Iterator[dict[str, Any]]:
+    """
+    Manifest entries, newest first, read backwards in blocks.
+    """
+    index = index or index_path()
+    try:
+        f = index.open("rb")
+    except OSError:
+        return
+    with f:
+        f.seek(0, os.SEEK_END)
+        pos = f.tell()
+        tail = b""
+        while pos > 0:
+            step = min(_BLOCK, pos)
+            pos -= step
+            f.seek(pos)
+            chunk = f.read(step) + tail
+            lines = chunk.split(b"\n")
+            tail = lines.pop(0)  # possibly incomplete: completed by the next (earlier) block
+            for raw in reversed(lines):
+                entry = _parse(raw)
+                if entry is not None:
+                    yield entry
+        entry = _parse(tail)
+        if entry is not None:
+            yield entry
+
+
+def _parse(raw: bytes) -> dict[str, Any] | None:
+    if not raw.strip():
+        return None
+    try:
+        obj = json.loads(raw.decode("utf-8"))
+    except (UnicodeDecodeError, ValueError):
+        return None  # torn or foreign line
+    return obj if isinstance(obj, dict) and isinstance(obj.get("path"), str) else None
+
+
+def latest(kind: str, *, task_id: str | None = None, under: Path | None = None) -> Path | None:
+    """
+    Newest existing artifact of kind (optionally for task_id and/or inside directory under).
+    """
+    if not index_path().is_file():
+        try:
+            backfill()
+        except OSError:
+            return None
+    base = Path(under).resolve() if under is not None else None
+    for e in iter_entries_reverse():
+        if e.get("kind") != kind:
+            continue
+        if task_id is not None and str(e.get("task_id") or "") != str(task_id):
+            continue
+        p = _abs(str(e["path"]))
+        if base is not None:
+            try:
+                p.resolve().relative_to(base)
+            except ValueError:
+                continue
+        if p.is_file():
+            return p
+    return None
+
+
+def rewrite_index(keep: Any = None) -> tuple[int, int]:
+    """
+    Rewrites the manifest without entries whose file is gone (or that keep(entry) rejects). Returns (kept, dropped).
+    """
+    index = index_path()
+    if not index.is_file():
+        return 0, 0
+    kept: list[dict[str, Any]] = []
+    dropped = 0
+    for e in reversed(list(iter_entries_reverse(index))):
+        ok = e.get("kind") == "_backfill" or _abs(str(e["path"])).exists()
+        if ok and keep is not None and e.get("kind") != "_backfill":
+            ok = bool(keep(e))
+        if ok:
+            kept.append(e)
+        else:
+            dropped += 1
+    tmp = index.with_name(f"{index.name}.{os.getpid()}.tmp")
+    tmp.write_text("".join(json.dumps(e, ensure_ascii=False) + "\n" for e in kept), encoding="utf-8")
+    os.replace(tmp, index)
+    return len(kept), dropped
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Append-only checkpoint journal for long per-task LLM batch runs.
+
+Why:
+  llm_fill_acceptance_refs --all, llm_align_acceptance_semantics and
+  llm_semantic_gate_all loop over every task in memory and only write their
+  results at the end. A run that died at task 70 of 120 had to pay for all 70
+  model calls again.
+
+What:
+  - <out_dir>/checkpoint.jsonl: one `run` header line (tool params), then one
+    `done` line per completed task with its parsed output, flushed as soon as
+    the task finishes.
+  - Each `done` line carries a digest of the task's input (prompt/brief). With
+    --resume, a task is skipped only if its digest still matches, so edited
+    tasks are re-run and the others reuse the journaled output.
+  - --resume reads today's journal of the tool, or the most recent one under
+    logs/ci/*/<tool>/ (a run that crossed midnight). Reused entries are copied
+    into the new journal, so a second crash can be resumed again.
+
+Notes:
+  - Without --resume the journal is started from scratch.
+  - A journal whose `run` params differ from the current ones is not reused.
+  - A torn last line (process killed mid-write) is ignored.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+from _util import repo_root
+
+JOURNAL_NAME = "checkpoint.jsonl"
+JOURNAL_VERSION = 1
+
+
+def digest(text: str) -> str:
+    return hashlib.sha256(str(text).encode("utf-8")).hexdigest()
+
+
+def add_resume_args(ap: argparse.ArgumentParser) -> None:
+    ap.add_argument(
+        "--resume",
+        action="store_true",
+        help=f"Skip tasks already completed in this tool's latest {JOURNAL_NAME} (same params, unchanged task input).",
+    )
+
+
+def find_journal(out_dir: Path) -> Path | None:
+    """
+    Returns out_dir's journal, else the newest journal of the same tool under logs/ci/<date>/.
+    """
+    own = out_dir / JOURNAL_NAME
+    if own.is_file():
+        return own
+    found = sorted(out_dir.parent.parent.glob(f"*/{out_dir.name}/{JOURNAL_NAME}"))
+    return found[-1] if found else None
+
+
+def _read_journal(path: Path) -> tuple[dict[str, Any] | None, dict[str, dict[str, Any]]]:
+    header: dict[str, Any] | None = None
+    entries: dict[str, dict[str, Any]] = {}
+    try:
+        lines = path.read_text(encoding="utf-8", errors="ignore").splitlines()
+    except OSError:
+        return None, {}
+    for line in lines:
+        try:
+            rec = json.loads(line)
+        except ValueError:
+            continue
+        if not isinstance(rec, dict):
+            continue
+        if rec.get("type") == "run" and header is None:
+            header = rec
+        elif rec.get("type") == "done" and header is not None:
+            entries[str(rec.get("key"))] = rec
+    return header, entries
+
+
+def _rel(path: Path | None) -> str | None:
+    if path is None:
+        return None
+    try:
+        return path.relative_to(repo_root()).as_posix()
+    except ValueError:
+        return str(path)
+
+
+class Checkpoint:
+    """
+    Open journal: lookup() serves reusable results, record() appends completed tasks (thread-safe).
+    """
+
+    def __init__(self, path: Path, entries: dict[str, dict[str, Any]], *, resumed_from: Path | None, note: str) -> None:
+        self.path = path
+        self.resumed_from = resumed_from
+        self.note = note
+        self.reused = 0
+        self._entries = entries
+        self._lock = threading.Lock()
+
+    def lookup(self, key: Any, *, digest: str) -> Any | None:
+        rec = self._entries.get(str(key))
+        if rec is None or rec.get("digest") != digest:
+            return None
+        with self._lock:
+            self.reused += 1
+        return rec.get("data")
+
+    def record(self, key: Any, *, digest: str, data: Any) -> None:
+        rec = {"type": "done", "key": str(key), "digest": digest, "ts": time.time(), "data": data}
+        line = json.dumps(rec, ensure_ascii=False) + "\n"
+        with self._lock:
+            with self.path.open("a", encoding="utf-8") as fh:
+                fh.write(line)
+                fh.flush()
+                os.fsync(fh.fileno())
+            self._entries[str(key)] = rec
+
+    def report(self) -> dict[str, Any]:
+        return {
+            "journal": _rel(self.path),
+            "resumed_from": _rel(self.resumed_from),
+            "reused": self.reused,
+            "note": self.note,
+        }
+
+
+def open_checkpoint(out_dir: Path, *, resume: bool, params: dict[str, Any] | None = None) -> Checkpoint:
+    """
+    Starts out_dir/checkpoint.jsonl. With resume=True, carries over the entries of the latest
+    matching journal (see find_journal); otherwise the journal starts empty.
+    """
+    params = json.loads(json.dumps(params or {}, sort_keys=True))
+    path = out_dir / JOURNAL_NAME
+    entries: dict[str, dict[str, Any]] = {}
+    resumed_from: Path | None = None
+    note = "fresh"
+    if resume:
+        prev = find_journal(out_dir)
+        header, prev_entries = _read_journal(prev) if prev else (None, {})
+        if prev is None or header is None:
+            note = "no_journal"
+        elif header.get("version") != JOURNAL_VERSION or header.get("params") != params:
+            note = "params_changed"
+        else:
+            entries, resumed_from, note = prev_entries, prev, "resumed"
+
+    header_rec = {
+        "type": "run",
+        "version": JOURNAL_VERSION,
+        "params": params,
+        "started": time.time(),
+        "resumed_from": _rel(resumed_from),
+    }
+    out_dir.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with tmp.open("w", encoding="utf-8") as fh:
+        fh.write(json.dumps(header_rec, ensure_ascii=False) + "\n")
+        fh.writelines(json.dumps(rec, ensure_ascii=False) + "\n" for rec in entries.values())
+    os.replace(tmp, path)
+    return Checkpoint(path, entries, resumed_from=resumed_from, note=note)
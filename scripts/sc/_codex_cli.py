@@ -1,16 +1,28 @@
 from __future__ import annotations
 
+import argparse
 import json
 import re
 import shutil
 import subprocess
+import threading
+import time
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable
 
+from _llm_backend import LLMRequest, get_backend, record_fixture, register_backend
+from _llm_cache import cache_key, load_response, store_response
+from _prompt_context import testing_framework_excerpt
 from _util import repo_root
 
-AUTO_BEGIN = "<!-- BEGIN AUTO:TEST_ORG_NAMING_REFS -->"
-AUTO_END = "<!-- END AUTO:TEST_ORG_NAMING_REFS -->"
+# Receives each new line of the agent's message and the index of that message (a new index starts a
+# new message: discard earlier state); returns the complete structured answer, or None to keep waiting.
+StopWhen = Callable[[str, int], "str | None"]
+
+# codex exec event headers: "[<timestamp>] <event>" (older CLIs) or a bare event word on its own line.
+_TS_HEADER_RE = re.compile(r"^\[\d{4}-\d{2}-\d{2}T[^\]]*\]\s*(.*)$")
+_BARE_EVENTS = {"user", "thinking", "codex", "exec", "tokens used"}
+_AGENT_EVENT = "codex"
 
 
 def read_text(path: Path) -> str:
@@ -24,15 +36,8 @@ def truncate(text: str, *, max_chars: int) -> str:
 
 
 def extract_testing_framework_excerpt() -> str:
-    path = repo_root() / "docs" / "testing-framework.md"
-    if not path.exists():
-        return ""
-    text = read_text(path)
-    a = text.find(AUTO_BEGIN)
-    b = text.find(AUTO_END)
-    if a < 0 or b < 0 or b <= a:
-        return ""
-    return text[a + len(AUTO_BEGIN) : b].strip()
+    # Memoized on the document's mtime (scripts/sc/_prompt_context.py).
+    return testing_framework_excerpt()
 
 
 def extract_json_object(text: str) -> dict[str, Any]:
@@ -52,42 +57,310 @@ def extract_json_object(text: str) -> dict[str, Any]:
     return obj
 
 
+def add_stream_args(ap: argparse.ArgumentParser) -> None:
+    ap.add_argument(
+        "--early-stop",
+        action="store_true",
+        help="Stop codex as soon as its streamed output holds the complete, parseable answer (skips the model's tail).",
+    )
+
+
+def json_stop(*required_keys: str) -> StopWhen:
+    """
+    StopWhen for prompts answered with one JSON object: fires on the first top-level object that parses and has required_keys.
+    """
+    # Incremental brace matcher: every character is scanned once; only a balanced top-level candidate is parsed.
+    st: dict[str, Any] = {"message": None, "buf": [], "depth": 0, "in_str": False, "esc": False}
+
+    def reset() -> None:
+        st.update(buf=[], depth=0, in_str=False, esc=False)
+
+    def stop(chunk: str, message: int) -> str | None:
+        if message != st["message"]:
+            st["message"] = message
+            reset()
+        if chunk.startswith("{"):
+            reset()  # a column-0 brace starts a new top-level object; drop an unbalanced "{" from prose
+        buf: list[str] = st["buf"]
+        for ch in chunk:
+            if st["depth"] == 0:
+                if ch == "{":
+                    buf.append(ch)
+                    st["depth"] = 1
+                continue
+            buf.append(ch)
+            if st["in_str"]:
+                if st["esc"]:
+                    st["esc"] = False
+                elif ch == "\\":
+                    st["esc"] = True
+                elif ch == '"':
+                    st["in_str"] = False
+            elif ch == '"':
+                st["in_str"] = True
+            elif ch == "{":
+                st["depth"] += 1
+            elif ch == "}":
+                st["depth"] -= 1
+                if st["depth"] == 0:
+                    try:
+                        obj = json.loads("".join(buf))
+                    except ValueError:
+                        obj = None
+                    if isinstance(obj, dict) and all(k in obj for k in required_keys):
+                        return json.dumps(obj, ensure_ascii=False, indent=2) + "\n"
+                    buf.clear()
+        return None
+
+    return stop
+
+
+def _event_header(line: str) -> str | None:
+    s = line.strip()
+    m = _TS_HEADER_RE.match(s)
+    if m:
+        return m.group(1).strip()
+    if s in _BARE_EVENTS or s.startswith("tokens used"):
+        return s
+    return None
+
+
+class _AgentMessageFilter:
+    """
+    Passes through only lines of codex's agent-message sections ("codex" events).
+
+    The prompt echo, thinking and tool output (e.g. `cat` of a JSON file) are not the answer, so they never reach
+    stop_when. Lines between the prompt's first and last non-empty line are the echo: headers inside it are ignored.
+    """
+
+    def __init__(self, prompt: str) -> None:
+        body = [ln.strip() for ln in prompt.splitlines() if ln.strip()]
+        self._first = body[0] if body else ""
+        self._last = body[-1] if body else ""
+        self._in_echo = False
+        self._echo_done = not body
+        self._in_message = False
+        self.message = 0
+
+    def feed(self, line: str) -> bool:
+        s = line.strip()
+        if not self._echo_done:
+            if self._in_echo or s == self._first:
+                self._in_echo = s != self._last
+                self._echo_done = not self._in_echo
+                return False
+        header = _event_header(line)
+        if header is not None:
+            self._in_message = header == _AGENT_EVENT
+            if self._in_message:
+                self.message += 1
+            return False
+        return self._in_message
+
+
+def _stream_exec(
+    cmd: list[str],
+    *,
+    prompt: str,
+    timeout_sec: int,
+    trace_path: Path | None,
+    on_line: Callable[[str], None] | None,
+    stop_when: StopWhen | None,
+) -> tuple[int, str, str | None]:
+    """
+    Runs codex with stdout read line by line: every line is teed to trace_path as it arrives and passed to
+    on_line. Returns (rc, trace, early answer or None). rc=124 on timeout, with the trace seen so far.
+    """
+    started = time.monotonic()
+    proc = subprocess.Popen(
+        cmd,
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True,
+        encoding="utf-8",
+        errors="ignore",
+        cwd=str(repo_root()),
+        bufsize=1,
+    )
+    lines: list[str] = []
+    early: list[str] = []
+    finished = threading.Event()
+    agent = _AgentMessageFilter(prompt)
+
+    def feed() -> None:
+        try:
+            assert proc.stdin is not None
+            proc.stdin.write(prompt)
+            proc.stdin.close()
+        except OSError:
+            pass  # codex exited before reading the whole prompt; its output says why
+
+    def pump() -> None:
+        tee = None
+        if trace_path is not None:
+            trace_path.parent.mkdir(parents=True, exist_ok=True)
+            tee = trace_path.open("w", encoding="utf-8")
+        try:
+            assert proc.stdout is not None
+            for line in proc.stdout:
+                lines.append(line)
+                if tee is not None:
+                    tee.write(line)
+                    tee.flush()
+                if on_line is not None:
+                    on_line(line)
+                if stop_when is not None and agent.feed(line) and line.strip():
+                    answer = stop_when(line, agent.message)
+                    if answer is not None:
+                        early.append(answer)
+                        break
+        finally:
+            if tee is not None:
+                tee.close()
+            finished.set()
+
+    threading.Thread(target=feed, name="codex-stdin", daemon=True).start()
+    threading.Thread(target=pump, name="codex-stdout", daemon=True).start()
+    finished.wait(timeout=max(1, int(timeout_sec)))
+
+    if early:
+        proc.kill()
+        proc.wait()
+        if proc.stdout is not None:
+            proc.stdout.close()
+        note = f"[codex-stream] early stop after {time.monotonic() - started:.1f}s: structured output complete\n"
+        _append_trace(trace_path, note)
+        return 0, "".join(lines) + note, early[0]
+    if not finished.is_set():
+        proc.kill()
+        proc.wait()
+        finished.wait(timeout=5)
+        note = "codex exec timeout\n"
+        _append_trace(trace_path, note)
+        return 124, "".join(lines) + note, None
+    return int(proc.wait() or 0), "".join(lines), None
+
+
+def _append_trace(trace_path: Path | None, text: str) -> None:
+    if trace_path is None:
+        return
+    with trace_path.open("a", encoding="utf-8") as fh:
+        fh.write(text)
+
+
+class CodexBackend:
+    """
+    The real backend: `codex exec` with streamed stdout (see _stream_exec).
+    """
+
+    name = "codex"
+
+    def run(self, request: LLMRequest) -> tuple[int, str, list[str]]:
+        exe = shutil.which("codex")
+        if not exe:
+            return 127, "codex executable not found in PATH\n", ["codex"]
+        cmd = [exe, "exec"]
+        if request.model_reasoning_effort:
+            cmd += ["-c", f'model_reasoning_effort="{request.model_reasoning_effort}"']
+        if request.model:
+            cmd += ["-m", str(request.model)]
+        cmd += [
+            "-s",
+            str(request.sandbox),
+            "-C",
+            str(repo_root()),
+            "--output-last-message",
+            str(request.output_last_message),
+            "-",
+        ]
+        try:
+            rc, trace, early = _stream_exec(
+                cmd,
+                prompt=request.prompt,
+                timeout_sec=request.timeout_sec,
+                trace_path=request.trace_path,
+                on_line=request.on_line,
+                stop_when=request.stop_when,
+            )
+        except Exception as exc:  # noqa: BLE001
+            return 1, f"codex exec failed to start: {exc}\n", cmd
+        if early is not None:
+            request.output_last_message.parent.mkdir(parents=True, exist_ok=True)
+            request.output_last_message.write_text(early, encoding="utf-8")
+        return rc, trace, cmd
+
+
+register_backend("codex", CodexBackend)
+
+
 def run_codex_exec(
     *,
     prompt: str,
     output_last_message: Path,
     timeout_sec: int,
     sandbox: str = "read-only",
+    model_reasoning_effort: str | None = None,
+    model: str | None = None,
+    cache_tag: str = "",
+    trace_path: Path | None = None,
+    on_line: Callable[[str], None] | None = None,
+    stop_when: StopWhen | None = None,
 ) -> tuple[int, str, list[str]]:
-    exe = shutil.which("codex")
-    if not exe:
-        return 127, "codex executable not found in PATH\n", ["codex"]
-    cmd = [
-        exe,
-        "exec",
-        "-s",
-        str(sandbox),
-        "-C",
-        str(repo_root()),
-        "--output-last-message",
-        str(output_last_message),
-        "-",
-    ]
+    """
+    Shared `codex exec` call used by every sc llm_* script.
+
+    Byte-identical prompts (same sandbox/effort/model) are answered from the on-disk
+    response cache (scripts/sc/_llm_cache.py): the cached last message is written to
+    output_last_message and rc=0 is returned without starting codex. cache_tag keeps
+    deliberately repeated calls (e.g. consensus runs) from sharing one entry.
+
+    codex stdout is streamed: each line is written to trace_path (when given) and passed to
+    on_line as it arrives, so a slow or hung call is visible while it runs. With stop_when, the
+    call ends as soon as stop_when returns the complete answer from the agent's message lines
+    streamed so far (see StopWhen); that answer is written to output_last_message and rc=0 is returned.
+    """
+    request = LLMRequest(
+        prompt=prompt,
+        output_last_message=output_last_message,
+        timeout_sec=int(timeout_sec),
+        sandbox=sandbox,
+        model_reasoning_effort=model_reasoning_effort,
+        model=model,
+        trace_path=trace_path,
+        on_line=on_line,
+        stop_when=stop_when,
+    )
     try:
-        proc = subprocess.run(
-            cmd,
-            input=prompt,
-            text=True,
-            encoding="utf-8",
-            errors="ignore",
-            cwd=str(repo_root()),
-            stdout=subprocess.PIPE,
-            stderr=subprocess.STDOUT,
-            timeout=int(timeout_sec),
-        )
-    except subprocess.TimeoutExpired:
-        return 124, "codex exec timeout\n", cmd
-    except Exception as exc:  # noqa: BLE001
-        return 1, f"codex exec failed to start: {exc}\n", cmd
-    return int(proc.returncode or 0), str(proc.stdout or ""), cmd
+        backend = get_backend()
+    except ValueError as exc:
+        return 2, f"{exc}\n", ["llm-backend"]
+    if backend.name != "codex":
+        return backend.run(request)
 
+    key = cache_key(prompt=prompt, sandbox=sandbox, model_reasoning_effort=model_reasoning_effort, model=model, tag=cache_tag)
+    hit = load_response(key)
+    if hit is not None:
+        output_last_message.parent.mkdir(parents=True, exist_ok=True)
+        output_last_message.write_text(str(hit.get("last_message") or ""), encoding="utf-8")
+        trace = f"[llm-cache] hit key={key}\n" + str(hit.get("trace") or "")
+        return 0, trace, ["codex", "exec", "(cached)", key]
+
+    rc, trace, cmd = backend.run(request)
+    if rc == 0 and output_last_message.is_file():
+        last_message = output_last_message.read_text(encoding="utf-8", errors="ignore")
+        record_fixture(prompt, last_message)
+        store_response(
+            key,
+            last_message=last_message,
+            trace=trace,
+            meta={
+                "sandbox": sandbox,
+                "model_reasoning_effort": model_reasoning_effort,
+                "model": model,
+                "tag": cache_tag,
+                "prompt_chars": len(prompt),
+                "early_stop": "[codex-stream] early stop" in trace,
+            },
+        )
+    return rc, trace, cmd
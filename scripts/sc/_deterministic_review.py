@@ -19,7 +19,8 @@ import json
 from pathlib import Path
 from typing import Any
 
-from _util import repo_root, today_str, write_text
+from _acceptance_artifacts import find_latest_acceptance_dir
+from _util import repo_root, write_text
 
 
 DETERMINISTIC_AGENTS = {"adr-compliance-checker", "performance-slo-validator"}
@@ -29,44 +30,6 @@ def _to_posix(path: Path) -> str:
     return str(path).replace("\\", "/")
 
 
-def _find_latest_acceptance_dir(*, task_id: str | None) -> Path | None:
-    ci_root = repo_root() / "logs" / "ci"
-    if not ci_root.exists():
-        return None
-
-    candidates: list[Path] = []
-    today_dir = ci_root / today_str()
-    if today_dir.exists():
-        for p in [today_dir / "sc-acceptance-check", *today_dir.glob("sc-acceptance-check-task-*")]:
-            if (p / "summary.json").is_file():
-                candidates.append(p)
-
-    if not candidates:
-        for summary in ci_root.rglob("summary.json"):
-            parent = summary.parent
-            if parent.name.startswith("sc-acceptance-check"):
-                candidates.append(parent)
-
-    best: Path | None = None
-    best_mtime = -1.0
-    for p in candidates:
-        summary = p / "summary.json"
-        try:
-            data = json.loads(summary.read_text(encoding="utf-8"))
-        except Exception:
-            continue
-        if task_id and str(data.get("task_id") or "") != str(task_id):
-            continue
-        try:
-            mtime = summary.stat().st_mtime
-        except OSError:
-            mtime = 0.0
-        if mtime > best_mtime:
-            best_mtime = mtime
-            best = p
-    return best
-
-
 def _render_adr_report(*, task_id: str | None, acceptance_dir: Path) -> tuple[str, str, dict[str, Any]]:
     path = acceptance_dir / "adr-compliance.json"
     meta = {"source": _to_posix(path.relative_to(repo_root()))}
@@ -194,7 +157,7 @@ def _render_perf_report(*, task_id: str | None, acceptance_dir: Path) -> tuple[s
 
 
 def build_deterministic_review(*, agent: str, out_dir: Path, task_id: str | None) -> dict[str, Any]:
-    acceptance_dir = _find_latest_acceptance_dir(task_id=task_id)
+    acceptance_dir = find_latest_acceptance_dir(task_id=task_id)
     prompt_path = out_dir / f"prompt-{agent}.md"
     output_path = out_dir / f"review-{agent}.md"
     trace_path = out_dir / f"trace-{agent}.log"
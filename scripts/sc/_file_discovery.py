@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Git-index-aware file discovery for scanners.
+
+Why:
+  Scanners used os.walk/rglob plus ad-hoc skip lists (.godot, logs, bin, obj),
+  which still descends into huge ignored trees and disagrees with .gitignore
+  depending on which script you ask.
+
+What:
+  - discover_files(base) lists candidates from git: tracked files plus untracked
+    files that are not ignored (`git ls-files -z --cached --others --exclude-standard`).
+    Reading the index avoids walking ignored directories entirely.
+  - skip_dirs is still applied on top (callers keep their historical exclusions).
+  - Outside a git checkout, when git is unavailable, when git lists nothing under
+    base (e.g. base itself is ignored), or with SC_FILE_DISCOVERY=walk, it falls
+    back to an os.walk that prunes skip_dirs.
+
+  - changed_files(base, rev) backs the gates' `--changed-since REV` mode: paths
+    that differ between merge-base(REV, HEAD) and the working tree, plus untracked
+    files that are not ignored.
+
+Notes:
+  - Results are absolute paths under base, sorted, existing regular files only
+    (tracked-but-deleted entries are dropped).
+  - changed_files keeps deleted paths (a deleted input still invalidates whole-repo
+    invariants); callers that read files filter on existence themselves.
+"""
+
+from __future__ import annotations
+
+import os
+import subprocess
+from pathlib import Path
+from typing import Any, Iterable
+
+
+def _force_walk() -> bool:
+    return str(os.environ.get("SC_FILE_DISCOVERY") or "").strip().lower() == "walk"
+
+
+def _git(base: Path, *args: str) -> bytes | None:
+    try:
+        proc = subprocess.run(
+            ["git", "-C", str(base), *args],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            timeout=120,
+            check=False,
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return proc.stdout if proc.returncode == 0 else None
+
+
+def _split_z(out: bytes) -> list[str]:
+    # Unmerged entries appear once per stage; keep the first occurrence.
+    return list(dict.fromkeys(os.fsdecode(p) for p in out.split(b"\0") if p))
+
+
+def git_ls_files(base: Path) -> list[str] | None:
+    """
+    Returns posix paths relative to base (tracked + untracked-not-ignored), or None if git cannot answer.
+    """
+    out = _git(base, "ls-files", "-z", "--cached", "--others", "--exclude-standard")
+    return None if out is None else _split_z(out)
+
+
+def changed_files(base: str | Path, rev: str) -> list[str] | None:
+    """
+    Returns sorted posix paths relative to base that changed since rev, or None if git cannot answer.
+
+    The diff is taken against merge-base(rev, HEAD) so commits that landed on rev after
+    the branch point do not count as local changes; unrelated revs diff against rev itself.
+    """
+    base = Path(base).resolve()
+    rev = str(rev or "").strip()
+    if not rev:
+        return None
+    mb = _git(base, "merge-base", rev, "HEAD")
+    target = mb.decode("ascii", errors="ignore").strip() if mb else rev
+    diff = _git(base, "diff", "--name-only", "--no-renames", "--relative", "-z", target, "--")
+    untracked = _git(base, "ls-files", "-z", "--others", "--exclude-standard")
+    if diff is None or untracked is None:
+        return None
+    return sorted(set(_split_z(diff)) | set(_split_z(untracked)))
+
+
+def changed_since_report(rev: str, changed: Iterable[str] | None) -> dict[str, Any]:
+    """
+    Report fragment for gates run with --changed-since (a None change set means git failed: full scan).
+    """
+    if changed is None:
+        return {"rev": rev, "mode": "full", "reason": "git diff unavailable; scanned everything"}
+    return {"rev": rev, "mode": "changed", "changed_files": len(list(changed))}
+
+
+def _walk_files(base: Path, skip_dirs: frozenset[str]) -> list[Path]:
+    files: list[Path] = []
+    for cur_root, dirs, names in os.walk(base):
+        dirs[:] = [d for d in dirs if d not in skip_dirs]
+        files.extend(Path(cur_root) / n for n in names)
+    return sorted(files)
+
+
+def discover_files(base: str | Path, *, skip_dirs: Iterable[str] = ()) -> list[Path]:
+    base = Path(base).resolve()
+    skip = frozenset(skip_dirs)
+    if not base.is_dir():
+        return []
+    listed = None if _force_walk() else git_ls_files(base)
+    if not listed:
+        return _walk_files(base, skip)
+
+    files: list[Path] = []
+    for rel in listed:
+        parts = rel.split("/")
+        if skip and any(seg in skip for seg in parts[:-1]):
+            continue
+        p = base.joinpath(*parts)
+        if p.is_file():
+            files.append(p)
+    return sorted(files)
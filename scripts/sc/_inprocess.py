@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+In-process runner for validator scripts invoked by sc tools.
+
+Why:
+  sc-acceptance-check and sc-analyze spawn `py -3 scripts/python/<validator>.py`
+  ~20 times per gate. Each interpreter re-imports the stdlib and re-parses the
+  same .taskmaster/tasks/*.json files.
+
+What:
+  When enabled (--in-process), `run_step_cmd` recognizes `py -3 <script>.py ...`
+  commands and instead loads the script as a module and calls its `main()`
+  directly, capturing stdout/stderr, the return code and `SystemExit`.
+
+Constraints:
+  - sys.argv and cwd are process-global, so in-process runs are serialized by a
+    lock (subprocess steps still run concurrently under --jobs).
+  - Output is captured per thread: while a script runs, sys.stdout/sys.stderr are
+    proxies that send only the calling thread's writes to its buffer; other
+    threads (e.g. the --jobs scheduler's progress lines) keep writing to the real
+    streams. Threads started by the script itself are not captured.
+  - No timeout can be enforced in-process; long-running orchestrators (build,
+    test, analyze) and LLM tools always run as subprocesses.
+"""
+
+from __future__ import annotations
+
+import importlib.util
+import inspect
+import io
+import os
+import sys
+import threading
+import traceback
+from pathlib import Path
+from types import ModuleType
+from typing import Any, Sequence
+
+from _util import repo_root, run_cmd
+
+# Scripts that spawn long-running child processes or call an LLM; they need real timeouts.
+SUBPROCESS_ONLY = {
+    "scripts/sc/analyze.py",
+    "scripts/sc/build.py",
+    "scripts/sc/test.py",
+}
+SUBPROCESS_ONLY_PREFIXES = ("scripts/sc/llm_",)
+
+_ENABLED = False
+_LOCK = threading.RLock()
+_MODULES: dict[str, tuple[int, ModuleType]] = {}
+_CAPTURE = threading.local()
+
+
+class _ThreadRedirect:
+    """
+    sys.stdout/sys.stderr stand-in: the capturing thread writes to its buffer, every other thread to the original stream.
+    """
+
+    def __init__(self, original: Any) -> None:
+        self._original = original
+
+    def _target(self) -> Any:
+        buf = getattr(_CAPTURE, "buf", None)
+        return self._original if buf is None else buf
+
+    def write(self, text: str) -> int:
+        return self._target().write(text)
+
+    def flush(self) -> None:
+        self._target().flush()
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._target(), name)
+
+
+def enable_in_process() -> None:
+    global _ENABLED
+    _ENABLED = True
+
+
+def in_process_enabled() -> bool:
+    return _ENABLED
+
+
+def parse_py_cmd(cmd: Sequence[str]) -> tuple[str, list[str]] | None:
+    """
+    Returns (script_rel_posix, argv) for `py -3 <script>.py ...` or `<python> <script>.py ...`, else None.
+    """
+    args = [str(x) for x in cmd]
+    if len(args) >= 3 and args[0] == "py" and args[1] == "-3":
+        script, rest = args[2], args[3:]
+    elif len(args) >= 2 and Path(args[0]).name.lower().startswith("python"):
+        script, rest = args[1], args[2:]
+    else:
+        return None
+    if not script.endswith(".py") or script.startswith("-"):
+        return None
+    return script.replace("\\", "/"), rest
+
+
+def eligible_for_in_process(script_rel: str) -> bool:
+    if script_rel in SUBPROCESS_ONLY:
+        return False
+    if script_rel.startswith(SUBPROCESS_ONLY_PREFIXES):
+        return False
+    return script_rel.startswith(("scripts/python/", "scripts/sc/"))
+
+
+def _load_module(path: Path) -> ModuleType:
+    key = str(path)
+    mtime = path.stat().st_mtime_ns
+    cached = _MODULES.get(key)
+    if cached and cached[0] == mtime:
+        return cached[1]
+    name = f"_sc_inproc_{path.parent.name}_{path.stem}"
+    spec = importlib.util.spec_from_file_location(name, path)
+    if spec is None or spec.loader is None:
+        raise ImportError(f"cannot load script: {path}")
+    module = importlib.util.module_from_spec(spec)
+    # dataclasses/typing resolve annotations through sys.modules[cls.__module__].
+    sys.modules[name] = module
+    try:
+        spec.loader.exec_module(module)
+    except BaseException:
+        sys.modules.pop(name, None)
+        raise
+    _MODULES[key] = (mtime, module)
+    return module
+
+
+def _exit_code(code: object, buf: io.StringIO) -> int:
+    if code is None:
+        return 0
+    if isinstance(code, int):
+        return code
+    # sys.exit("message") prints the message to stderr and exits with 1.
+    buf.write(str(code) + "\n")
+    return 1
+
+
+def run_script_inprocess(script_rel: str, argv: list[str]) -> tuple[int, str]:
+    root = repo_root()
+    path = (root / script_rel).resolve()
+    buf = io.StringIO()
+    with _LOCK:
+        saved_argv = list(sys.argv)
+        saved_path = list(sys.path)
+        saved_cwd = os.getcwd()
+        saved_out, saved_err = sys.stdout, sys.stderr
+        try:
+            sys.argv = [str(path), *argv]
+            sys.path.insert(0, str(path.parent))
+            os.chdir(root)
+            sys.stdout, sys.stderr = _ThreadRedirect(saved_out), _ThreadRedirect(saved_err)
+            _CAPTURE.buf = buf
+            try:
+                module = _load_module(path)
+                main = getattr(module, "main", None)
+                if not callable(main):
+                    raise AttributeError(f"{script_rel} has no main()")
+                rc = main(list(argv)) if inspect.signature(main).parameters else main()
+                rc = _exit_code(rc, buf)
+            except SystemExit as exc:
+                rc = _exit_code(exc.code, buf)
+            except Exception:  # noqa: BLE001
+                traceback.print_exc(file=buf)
+                rc = 1
+        finally:
+            _CAPTURE.buf = None
+            sys.stdout, sys.stderr = saved_out, saved_err
+            sys.argv = saved_argv
+            sys.path[:] = saved_path
+            os.chdir(saved_cwd)
+    return rc, buf.getvalue()
+
+
+def run_step_cmd(cmd: Sequence[str], *, cwd: Path | None = None, timeout_sec: int = 900) -> tuple[int, str]:
+    """
+    Drop-in replacement for `run_cmd` used by acceptance/analyze steps.
+    """
+    parsed = parse_py_cmd(cmd) if _ENABLED else None
+    if parsed and (cwd is None or Path(cwd).resolve() == repo_root()) and eligible_for_in_process(parsed[0]):
+        return run_script_inprocess(parsed[0], parsed[1])
+    return run_cmd(cmd, cwd=cwd, timeout_sec=timeout_sec)
@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""
+Suite identity for GdUnit4 JUnit reports (results.xml).
+
+Why:
+  GdUnit4's JUnitXmlReportWriter writes <testsuite name="<file basename>"
+  package="<suite directory without res://>">, so `package` alone is shared by
+  every suite in the same directory. Keying durations or results by it makes
+  sibling suites overwrite each other.
+
+What:
+  - suite_res_path(el) rebuilds the suite file path "res://<package>/<name>.gd"
+    from a <testsuite> element; this is the key discover_suites (run_gdunit.py),
+    the timing store and test-impact selection all use.
+
+Notes:
+  - A name that already carries a script extension (.gd/.cs) is kept as is.
+  - A package that is already a res:// path is not prefixed twice; a missing
+    package yields "res://<name>.gd".
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+SCRIPT_EXTS = (".gd", ".cs")
+
+
+def suite_res_path(el: Any) -> str:
+    """
+    "res://<package>/<name>.gd" for a GdUnit4 <testsuite> element ("" when it has no name).
+    """
+    name = str(el.get("name") or "").strip()
+    if not name:
+        return ""
+    if not name.endswith(SCRIPT_EXTS):
+        name += ".gd"
+    package = str(el.get("package") or "").strip().replace("\\", "/")
+    if package.startswith("res://"):
+        package = package[len("res://"):]
+    package = package.strip("/")
+    return f"res://{package}/{name}" if package else f"res://{name}"
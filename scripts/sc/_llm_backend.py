@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Pluggable LLM backend behind run_codex_exec.
+
+Why:
+  Every llm_* tool hard-depended on the codex executable (rc=127 without it), so
+  their prompt building, batching, parsing and aggregation could not be
+  benchmarked or regression-checked offline.
+
+What:
+  - LLMRequest describes one call; a backend's run(request) returns
+    (rc, trace, cmd) and writes the final answer to request.output_last_message,
+    exactly like `codex exec --output-last-message`.
+  - SC_LLM_BACKEND selects the backend: codex (default, registered by
+    _codex_cli) or fixture.
+  - FixtureBackend answers in-process, without network:
+      replay     recorded responses <fixture dir>/<sha256(prompt)>.txt
+      synthetic  well-formed answers derived from the prompt: one TSV verdict line
+                 per "### Task N:" block, a JSON object following the prompt's
+                 JSON example, "Verdict: OK" otherwise
+      auto       replay, falling back to synthetic (default)
+  - SC_LLM_RECORD_FIXTURES=1 saves every successful codex answer into the fixture
+    dir, so a real run can be replayed offline later.
+
+Knobs:
+  - SC_LLM_FIXTURE_DIR (default logs/cache/llm-fixtures), SC_LLM_FIXTURE_MODE
+    (auto|replay|synthetic), SC_LLM_FIXTURE_LATENCY_MS (simulated latency per call,
+    default 0).
+
+Notes:
+  - The response cache (_llm_cache) is only consulted for the codex backend, so
+    fixture answers never leak into real runs and vice versa.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Protocol
+
+from _util import repo_root
+
+FIXTURE_MODES = ("auto", "replay", "synthetic")
+
+
+@dataclass(frozen=True)
+class LLMRequest:
+    prompt: str
+    output_last_message: Path
+    timeout_sec: int
+    sandbox: str = "read-only"
+    model_reasoning_effort: str | None = None
+    model: str | None = None
+    trace_path: Path | None = None
+    on_line: Callable[[str], None] | None = None
+    stop_when: Callable[[str, int], "str | None"] | None = None
+
+
+class LLMBackend(Protocol):
+    name: str
+
+    def run(self, request: LLMRequest) -> tuple[int, str, list[str]]: ...
+
+
+_FACTORIES: dict[str, Callable[[], LLMBackend]] = {}
+
+
+def register_backend(name: str, factory: Callable[[], LLMBackend]) -> None:
+    _FACTORIES[name] = factory
+
+
+def backend_name() -> str:
+    return str(os.environ.get("SC_LLM_BACKEND") or "codex").strip().lower() or "codex"
+
+
+def get_backend(name: str | None = None) -> LLMBackend:
+    name = name or backend_name()
+    factory = _FACTORIES.get(name)
+    if factory is None:
+        raise ValueError(f"unknown LLM backend {name!r} (known: {', '.join(sorted(_FACTORIES))})")
+    return factory()
+
+
+def prompt_digest(prompt: str) -> str:
+    return hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+
+
+def fixture_dir() -> Path:
+    raw = str(os.environ.get("SC_LLM_FIXTURE_DIR") or "").strip()
+    return Path(raw).resolve() if raw else repo_root() / "logs" / "cache" / "llm-fixtures"
+
+
+def record_fixture(prompt: str, last_message: str) -> None:
+    """
+    Saves a real answer for later replay (only with SC_LLM_RECORD_FIXTURES=1).
+    """
+    if str(os.environ.get("SC_LLM_RECORD_FIXTURES") or "").strip().lower() not in {"1", "true", "yes", "on"}:
+        return
+    path = fixture_dir() / f"{prompt_digest(prompt)}.txt"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    tmp.write_text(last_message, encoding="utf-8")
+    os.replace(tmp, path)
+
+
+_TASK_RE = re.compile(r"^### Task (\d+):", re.MULTILINE)
+_JSON_EXAMPLE_RE = re.compile(r"^\{\s*\n(.*?)^\}", re.MULTILINE | re.DOTALL)
+_JSON_KEY_RE = re.compile(r'^(\s*)"([A-Za-z_][\w-]*)"\s*:\s*(.*)$')
+
+
+def _synthetic_json(example: str) -> dict[str, Any]:
+    keys: list[tuple[int, str, str]] = []
+    for line in example.splitlines():
+        m = _JSON_KEY_RE.match(line)
+        if m:
+            keys.append((len(m.group(1)), m.group(2), m.group(3).strip()))
+    if not keys:
+        return {}
+    top = min(indent for indent, _k, _v in keys)
+    obj: dict[str, Any] = {}
+    for indent, key, value in keys:
+        if indent != top:
+            continue
+        if key == "status":
+            obj[key] = "ok"
+        elif value.startswith("["):
+            obj[key] = []
+        elif value.startswith("{"):
+            obj[key] = {}
+        elif value.startswith(("true", "false")):
+            obj[key] = value.startswith("true")
+        elif re.match(r"-?\d", value):
+            obj[key] = 0
+        else:
+            obj[key] = ""
+    return obj
+
+
+def synthetic_answer(prompt: str) -> str:
+    ids = _TASK_RE.findall(prompt)
+    if ids:
+        return "".join(f"T{tid}\tOK\tsynthetic fixture answer\n" for tid in ids)
+    m = _JSON_EXAMPLE_RE.search(prompt)
+    if m and "json" in prompt.lower():
+        return json.dumps(_synthetic_json(m.group(1)), ensure_ascii=False, indent=2) + "\n"
+    return "## P0\n- none\n\n## P1\n- none\n\nVerdict: OK\n"
+
+
+class FixtureBackend:
+    name = "fixture"
+
+    def __init__(self, *, mode: str | None = None, root: Path | None = None, latency_ms: int | None = None) -> None:
+        self.mode = (mode or str(os.environ.get("SC_LLM_FIXTURE_MODE") or "auto")).strip().lower()
+        if self.mode not in FIXTURE_MODES:
+            raise ValueError(f"SC_LLM_FIXTURE_MODE must be one of {', '.join(FIXTURE_MODES)}, got {self.mode!r}")
+        self.root = root or fixture_dir()
+        if latency_ms is None:
+            try:
+                latency_ms = int(str(os.environ.get("SC_LLM_FIXTURE_LATENCY_MS") or "0").strip() or 0)
+            except ValueError:
+                latency_ms = 0
+        self.latency_ms = max(0, latency_ms)
+
+    def _answer(self, prompt: str) -> tuple[str | None, str]:
+        recorded = self.root / f"{prompt_digest(prompt)}.txt"
+        if self.mode != "synthetic" and recorded.is_file():
+            return recorded.read_text(encoding="utf-8", errors="ignore"), f"replay {recorded.name}"
+        if self.mode == "replay":
+            return None, f"no recorded response {recorded.name} in {self.root}"
+        return synthetic_answer(prompt), "synthetic"
+
+    def run(self, request: LLMRequest) -> tuple[int, str, list[str]]:
+        cmd = ["fixture", self.mode, prompt_digest(request.prompt)[:16]]
+        if self.latency_ms:
+            time.sleep(min(self.latency_ms / 1000.0, max(0, int(request.timeout_sec))))
+        answer, how = self._answer(request.prompt)
+        trace = f"[llm-fixture] {how}\n"
+        if answer is None:
+            rc = 1
+        else:
+            rc = 0
+            if request.on_line is not None:
+                for line in answer.splitlines(keepends=True):
+                    request.on_line(line)
+            trace += answer
+            request.output_last_message.parent.mkdir(parents=True, exist_ok=True)
+            request.output_last_message.write_text(answer, encoding="utf-8")
+        if request.trace_path is not None:
+            request.trace_path.parent.mkdir(parents=True, exist_ok=True)
+            request.trace_path.write_text(trace, encoding="utf-8")
+        return rc, trace, cmd
+
+
+register_backend("fixture", FixtureBackend)
@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Content-addressed on-disk cache for `codex exec` responses.
+
+Why:
+  sc-llm-review, llm_semantic_gate_all, llm_fill_acceptance_refs and the other
+  llm_* scripts called the model on every run, even when the prompt was
+  byte-identical to the previous one (re-running a gate on an unchanged task).
+
+What:
+  - key = sha256(cache version, prompt, sandbox, model_reasoning_effort, model, tag).
+    The tag separates calls that repeat a prompt on purpose (consensus runs).
+    When no model is passed explicitly, the codex config file
+    ($CODEX_HOME/config.toml or ~/.codex/config.toml) is hashed instead, so
+    switching the default model invalidates old entries.
+  - Only successful calls (rc=0 and a non-empty last message) are stored, under
+    logs/cache/llm/<key[:2]>/<key>.json.
+  - Entries older than the TTL are ignored and deleted. After each store the
+    cache is trimmed least-recently-used first (hits refresh the entry's mtime)
+    down to the entry and size limits.
+
+Knobs (env defaults, CLI flags via add_cache_args/apply_cache_args):
+  - SC_LLM_CACHE=0 / --no-llm-cache: bypass the cache completely.
+  - --refresh: ignore cached entries but store the fresh responses.
+  - SC_LLM_CACHE_TTL_SEC (default 7 days), SC_LLM_CACHE_MAX_ENTRIES (default 2000),
+    SC_LLM_CACHE_MAX_MB (default 200).
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import Any
+
+from _util import repo_root
+
+CACHE_VERSION = 1
+
+_PRUNE_LOCK = threading.Lock()
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(str(os.environ.get(name) or "").strip() or default)
+    except ValueError:
+        return default
+
+
+@dataclass(frozen=True)
+class CachePolicy:
+    enabled: bool = True
+    refresh: bool = False
+    ttl_sec: int = 7 * 24 * 3600
+    max_entries: int = 2_000
+    max_bytes: int = 200 * 1024 * 1024
+
+
+def _policy_from_env() -> CachePolicy:
+    return CachePolicy(
+        enabled=str(os.environ.get("SC_LLM_CACHE") or "1").strip().lower() not in {"0", "false", "off", "no"},
+        ttl_sec=_env_int("SC_LLM_CACHE_TTL_SEC", CachePolicy.ttl_sec),
+        max_entries=_env_int("SC_LLM_CACHE_MAX_ENTRIES", CachePolicy.max_entries),
+        max_bytes=_env_int("SC_LLM_CACHE_MAX_MB", CachePolicy.max_bytes // (1024 * 1024)) * 1024 * 1024,
+    )
+
+
+_POLICY = _policy_from_env()
+
+
+def policy() -> CachePolicy:
+    return _POLICY
+
+
+def configure(**changes: Any) -> CachePolicy:
+    global _POLICY
+    _POLICY = replace(_POLICY, **changes)
+    return _POLICY
+
+
+def add_cache_args(ap: argparse.ArgumentParser) -> None:
+    ap.add_argument("--refresh", action="store_true", help="Ignore cached LLM responses (fresh responses are still stored).")
+    ap.add_argument("--no-llm-cache", action="store_true", help="Bypass the LLM response cache under logs/cache/llm entirely.")
+
+
+def apply_cache_args(args: argparse.Namespace) -> CachePolicy:
+    changes: dict[str, Any] = {}
+    if bool(getattr(args, "refresh", False)):
+        changes["refresh"] = True
+    if bool(getattr(args, "no_llm_cache", False)):
+        changes["enabled"] = False
+    return configure(**changes)
+
+
+def cache_root() -> Path:
+    return repo_root() / "logs" / "cache" / "llm"
+
+
+def _codex_config_digest() -> str:
+    home = str(os.environ.get("CODEX_HOME") or "").strip()
+    cfg = (Path(home) if home else Path.home() / ".codex") / "config.toml"
+    try:
+        return "config:" + hashlib.sha256(cfg.read_bytes()).hexdigest()
+    except OSError:
+        return "config:none"
+
+
+def cache_key(*, prompt: str, sandbox: str, model_reasoning_effort: str | None, model: str | None, tag: str = "") -> str:
+    h = hashlib.sha256()
+    for part in (
+        f"v{CACHE_VERSION}",
+        str(sandbox),
+        str(model_reasoning_effort or ""),
+        str(model) if model else _codex_config_digest(),
+        str(tag),
+    ):
+        h.update(part.encode("utf-8") + b"\0")
+    h.update(prompt.encode("utf-8"))
+    return h.hexdigest()
+
+
+def _entry_path(key: str) -> Path:
+    return cache_root() / key[:2] / f"{key}.json"
+
+
+def load_response(key: str) -> dict[str, Any] | None:
+    """
+    Returns the cached entry ({"last_message", "trace", "created", ...}) or None on miss/expiry/refresh.
+    """
+    pol = policy()
+    if not pol.enabled or pol.refresh:
+        return None
+    path = _entry_path(key)
+    try:
+        entry = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if not isinstance(entry, dict) or not str(entry.get("last_message") or "").strip():
+        return None
+    if pol.ttl_sec > 0 and time.time() - float(entry.get("created") or 0) > pol.ttl_sec:
+        try:
+            path.unlink()
+        except OSError:
+            pass
+        return None
+    try:
+        os.utime(path)  # LRU: a hit makes the entry recent again
+    except OSError:
+        pass
+    return entry
+
+
+def store_response(key: str, *, last_message: str, trace: str, meta: dict[str, Any]) -> None:
+    pol = policy()
+    if not pol.enabled or not last_message.strip():
+        return
+    path = _entry_path(key)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    entry = {"version": CACHE_VERSION, "created": time.time(), "meta": meta, "last_message": last_message, "trace": trace}
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    tmp.write_text(json.dumps(entry, ensure_ascii=False), encoding="utf-8")
+    os.replace(tmp, path)
+    prune()
+
+
+def prune() -> None:
+    """
+    Drops expired entries, then least-recently-used ones until the entry/size limits hold.
+    """
+    pol = policy()
+    root = cache_root()
+    if not root.is_dir():
+        return
+    with _PRUNE_LOCK:
+        now = time.time()
+        entries: list[tuple[float, int, Path]] = []
+        for p in root.glob("*/*.json"):
+            try:
+                st = p.stat()
+            except OSError:
+                continue
+            entries.append((st.st_mtime, st.st_size, p))
+        entries.sort()
+        total = sum(size for _, size, _ in entries)
+        count = len(entries)
+        for mtime, size, p in entries:
+            # created <= mtime, so an entry whose mtime is past the TTL is certainly expired.
+            expired = pol.ttl_sec > 0 and now - mtime > pol.ttl_sec
+            if not expired and count <= pol.max_entries and total <= pol.max_bytes:
+                break
+            try:
+                p.unlink()
+            except OSError:
+                continue
+            count -= 1
+            total -= size
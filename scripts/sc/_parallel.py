@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""
+Order-preserving per-file process pool for the encoding scanners.
+
+Why:
+  check_encoding.py, scan_garbled.py and scripts/ci/check_encoding_issues.py each
+  carried a copy of the same --jobs helpers.
+
+What:
+  - resolve_jobs(jobs): --jobs value to a worker count (0 = one per CPU).
+  - map_files(fn, paths, jobs): fn over paths, results in input order; jobs > 1
+    shards the list across a ProcessPoolExecutor, so output is identical to --jobs 1.
+
+Notes:
+  - fn must be picklable (module-level function or functools.partial of one).
+"""
+
+from __future__ import annotations
+
+import os
+from typing import Any, Callable, Sequence
+
+
+def resolve_jobs(jobs: Any) -> int:
+    # 0 means "one worker per CPU".
+    return max(1, int(jobs) if int(jobs) > 0 else (os.cpu_count() or 1))
+
+
+def map_files(fn: Callable[[Any], Any], paths: Sequence[Any], jobs: int) -> list[Any]:
+    """
+    Applies fn to every path in order; jobs > 1 shards the list across a process pool.
+    """
+    if jobs <= 1 or len(paths) < 2:
+        return [fn(p) for p in paths]
+    from concurrent.futures import ProcessPoolExecutor
+
+    chunksize = max(1, len(paths) // (jobs * 4))
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        # Executor.map yields results in input order, so reports stay deterministic.
+        return list(pool.map(fn, paths, chunksize=chunksize))
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Combined-regex prefilter for multi-pattern scans.
+
+Why:
+  Pattern scans (sc-analyze scan_patterns, security/quality gates) ran every
+  rule's regex over every file (and often every line), so scan time grew
+  linearly with the number of rules even though almost no file has a hit.
+
+What:
+  - PatternSet compiles all patterns of a scan into one alternation of named
+    groups, `(?P<_p0>...)|(?P<_p1>...)`, with each pattern's flags scoped inline.
+  - search(text) is a single pass that answers "could any rule match here?".
+    Files (or lines) without a candidate hit skip the per-rule evaluation; the
+    exact per-rule regexes only run where the prefilter fired.
+
+Notes:
+  - The prefilter never drops a real match: if any pattern matches somewhere,
+    the alternation matches too. It may fire on lines/files where the per-rule
+    logic (allowlists, scoping) later finds nothing.
+  - Patterns that cannot be embedded safely (numbered/named backreferences,
+    global inline flags, compile errors) disable the prefilter for that set,
+    so those scans fall back to full evaluation instead of being wrong.
+  - line_mode=True compiles with MULTILINE, so `^`/`$` keep their per-line
+    meaning when the whole file text is prefiltered at once.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import re
+from typing import Mapping
+
+_SCOPED_FLAGS = ((re.IGNORECASE, "i"), (re.MULTILINE, "m"), (re.DOTALL, "s"), (re.VERBOSE, "x"))
+_UNSAFE_RE = re.compile(r"\\[1-9]|\(\?P=|\(\?\(|\(\?[aiLmsux]+\)")
+
+
+def _as_pattern(p: re.Pattern[str] | str) -> re.Pattern[str]:
+    return p if isinstance(p, re.Pattern) else re.compile(p)
+
+
+def _embed(p: re.Pattern[str]) -> str | None:
+    if _UNSAFE_RE.search(p.pattern):
+        return None
+    flags = "".join(ch for flag, ch in _SCOPED_FLAGS if p.flags & flag)
+    return f"(?{flags}:{p.pattern})" if flags else f"(?:{p.pattern})"
+
+
+class PatternSet:
+    """
+    One-pass candidate matcher over a named set of regexes.
+    """
+
+    def __init__(self, patterns: Mapping[str, re.Pattern[str] | str], *, line_mode: bool = False) -> None:
+        self.patterns: dict[str, re.Pattern[str]] = {name: _as_pattern(p) for name, p in patterns.items()}
+        self._combined: re.Pattern[str] | None = None
+        self.fingerprint: str | None = None  # stable id of the combined regex (None when disabled)
+        parts: list[str] = []
+        for i, p in enumerate(self.patterns.values()):
+            body = _embed(p)
+            if body is None:
+                return
+            parts.append(f"(?P<_p{i}>{body})")
+        if not parts:
+            return
+        try:
+            self._combined = re.compile("|".join(parts), re.MULTILINE if line_mode else 0)
+        except re.error:
+            self._combined = None
+            return
+        ident = f"{self._combined.flags}\n{self._combined.pattern}"
+        self.fingerprint = hashlib.sha256(ident.encode("utf-8")).hexdigest()[:16]
+
+    @property
+    def enabled(self) -> bool:
+        return self._combined is not None
+
+    def search(self, text: str) -> bool:
+        """
+        True if any pattern may match in text (always True when the prefilter is disabled).
+        """
+        if self._combined is None:
+            return bool(self.patterns)
+        return self._combined.search(text) is not None
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Memoized prompt-context provider shared by the llm_* tools.
+
+Why:
+  Each LLM tool assembled the same context from scratch: llm_fill_acceptance_refs
+  re-read docs/testing-framework.md for every task prompt and rglob'ed every test
+  directory at startup, llm_generate_red_test and llm_generate_tests_from_acceptance_refs
+  kept their own copies of the excerpt reader, and the PRD excerpt was rebuilt per tool.
+
+What:
+  - file_text(path): file contents cached per process, reused while the file's
+    (mtime_ns, size) stamp is unchanged. Everything below is built on top of it.
+  - testing_framework_excerpt(): the AUTO:TEST_ORG_NAMING_REFS block of
+    docs/testing-framework.md.
+  - prd_excerpt(): prd.txt + prd_yuan.md, truncated.
+  - test_inventory(): repo-relative test files (Game.Core.Tests/**/*.cs,
+    Tests.Godot/tests/**/*.gd) listed from the git index via discover_files instead
+    of a tree walk; cached until .git/index or a test root directory changes.
+
+Notes:
+  - Derived values are memoized on the stamps of their source files, so an edited
+    document is picked up by the next call without restarting the process.
+  - invalidate() drops everything (e.g. after a tool writes new test files).
+"""
+
+from __future__ import annotations
+
+import threading
+from pathlib import Path
+from typing import Any, Callable
+
+from _file_discovery import discover_files
+from _util import repo_root
+
+AUTO_BEGIN = "<!-- BEGIN AUTO:TEST_ORG_NAMING_REFS -->"
+AUTO_END = "<!-- END AUTO:TEST_ORG_NAMING_REFS -->"
+
+PRD_FILES = ("prd.txt", "prd_yuan.md")
+PRD_MAX_CHARS = 10_000
+TEST_ROOTS = (("Game.Core.Tests", ".cs"), ("Tests.Godot/tests", ".gd"))
+
+_Stamp = tuple[tuple[int, int] | None, ...]
+
+_LOCK = threading.Lock()
+_FILES: dict[str, tuple[tuple[int, int] | None, str]] = {}
+_DERIVED: dict[str, tuple[_Stamp, Any]] = {}
+
+
+def _stamp(path: Path) -> tuple[int, int] | None:
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+def file_text(path: Path) -> str:
+    """
+    UTF-8 text of path ("" when missing), re-read only when its stamp changes.
+    """
+    key = str(path.resolve())
+    stamp = _stamp(path)
+    with _LOCK:
+        cached = _FILES.get(key)
+        if cached and cached[0] == stamp:
+            return cached[1]
+    text = path.read_text(encoding="utf-8", errors="ignore") if stamp is not None else ""
+    with _LOCK:
+        _FILES[key] = (stamp, text)
+    return text
+
+
+def _memo(name: str, sources: list[Path], build: Callable[[], Any]) -> Any:
+    stamp = tuple(_stamp(p) for p in sources)
+    with _LOCK:
+        cached = _DERIVED.get(name)
+        if cached and cached[0] == stamp:
+            return cached[1]
+    value = build()
+    with _LOCK:
+        _DERIVED[name] = (stamp, value)
+    return value
+
+
+def invalidate() -> None:
+    with _LOCK:
+        _FILES.clear()
+        _DERIVED.clear()
+
+
+def testing_framework_excerpt() -> str:
+    path = repo_root() / "docs" / "testing-framework.md"
+
+    def build() -> str:
+        text = file_text(path)
+        a = text.find(AUTO_BEGIN)
+        b = text.find(AUTO_END)
+        if a < 0 or b < 0 or b <= a:
+            return ""
+        return text[a + len(AUTO_BEGIN) : b].strip()
+
+    return _memo("testing_framework_excerpt", [path], build)
+
+
+def prd_excerpt(*, max_chars: int = PRD_MAX_CHARS) -> str:
+    paths = [repo_root() / name for name in PRD_FILES]
+
+    def build() -> str:
+        text = "\n".join(file_text(p) for p in paths if p.exists()).strip()
+        return text if len(text) <= max_chars else text[: max_chars - 3] + "..."
+
+    return _memo(f"prd_excerpt:{max_chars}", paths, build)
+
+
+def test_inventory() -> list[str]:
+    """
+    Sorted repo-relative test file paths under TEST_ROOTS. Treat the returned list as read-only.
+    """
+    root = repo_root()
+    bases = [root / base for base, _ext in TEST_ROOTS]
+
+    def build() -> list[str]:
+        out: list[str] = []
+        for (base, ext), base_path in zip(TEST_ROOTS, bases):
+            for f in discover_files(base_path):
+                if f.suffix == ext:
+                    out.append(f.relative_to(root).as_posix())
+        return sorted(out)
+
+    return _memo("test_inventory", [root / ".git" / "index", *bases], build)
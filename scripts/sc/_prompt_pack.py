@@ -0,0 +1,464 @@
+#!/usr/bin/env python3
+"""
+Token-budgeted prompt packing for review prompts.
+
+Why:
+  sc-llm-review cut the diff at a fixed 40-60k chars and every task details blob
+  at 2k chars. Lockfiles, generated code and whitespace churn used up the budget
+  while the code that mattered could be cut off mid-hunk.
+
+What:
+  - A prompt is described as PackItems (key, text, relevance score). Required
+    items are always kept; the others are taken by descending score while they
+    fit the token budget. Truncatable items (prose context) are cut to the
+    remaining budget instead of being dropped.
+  - Diffs are split into per-hunk items (plan_diff). Binary files, generated
+    files/lockfiles and whitespace-only hunks are dropped up front. Hunks are
+    scored by file kind, size of the change and overlap with task keywords.
+    A file's header is charged once, with its first kept hunk.
+  - Everything that was dropped or truncated (and why) is returned, so callers
+    can write it next to the prompt (sc-llm-review: prompt-pack.json).
+  - shard_diff() splits a planned diff into token-bounded shards by module or
+    file (oversized files by hunk runs) for map-reduce reviews of large changes.
+
+Notes:
+  - Tokens are estimated without a tokenizer: ~4 ASCII chars per token, one
+    token per non-ASCII char (CJK text is common in task details).
+  - Kept hunks are rendered in their original diff order, not score order.
+"""
+
+from __future__ import annotations
+
+import os
+import re
+from dataclasses import dataclass, field
+from typing import Any, Iterable
+
+from _source_scan import compile_glob
+
+MIN_TRUNCATE_TOKENS = 64
+TRUNCATION_MARKER = "\n...(truncated to fit the prompt budget)"
+
+GENERATED_GLOBS = (
+    "**/*.lock",
+    "**/package-lock.json",
+    "**/packages.lock.json",
+    "**/*.min.js",
+    "**/*.min.css",
+    "**/*.map",
+    "**/*.g.cs",
+    "**/*.g.i.cs",
+    "**/*.Designer.cs",
+    "**/*.uid",
+    "**/*.import",
+    "**/.godot/**",
+    "**/bin/**",
+    "**/obj/**",
+    "logs/**",
+)
+_GENERATED_RES = tuple(compile_glob(g) for g in GENERATED_GLOBS)
+_GENERATED_MARKERS = ("<auto-generated", "@generated", "code generated by")
+
+_EXT_WEIGHT = {
+    ".cs": 3.0,
+    ".gd": 3.0,
+    ".py": 3.0,
+    ".ps1": 2.5,
+    ".sql": 2.5,
+    ".csproj": 2.0,
+    ".json": 1.5,
+    ".yml": 1.5,
+    ".yaml": 1.5,
+    ".toml": 1.5,
+    ".md": 1.0,
+    ".tscn": 0.5,
+    ".tres": 0.5,
+}
+
+_WORD_RE = re.compile(r"[A-Za-z_][A-Za-z0-9_]{4,}")
+_STOPWORDS = frozenset(
+    {
+        "about", "after", "before", "should", "which", "there", "their", "these", "those", "would",
+        "could", "other", "where", "while", "using", "without", "within", "being", "shall", "empty",
+        "string", "return", "public", "private", "static", "class", "false", "const", "value",
+    }
+)  # fmt: skip
+
+
+def estimate_tokens(text: str) -> int:
+    n_ascii = len(text.encode("ascii", errors="ignore"))
+    return (n_ascii + 3) // 4 + (len(text) - n_ascii)
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    limit = max(0, max_tokens - estimate_tokens(TRUNCATION_MARKER))
+    cut = text[: limit * 4]
+    while cut and estimate_tokens(cut) > limit:
+        cut = cut[: int(len(cut) * 0.9)]
+    return cut.rstrip() + TRUNCATION_MARKER
+
+
+def extract_keywords(*texts: str, limit: int = 200) -> tuple[str, ...]:
+    """
+    Lowercased identifiers/words (5+ chars) from task context, in first-seen order.
+    """
+    seen: dict[str, None] = {}
+    for t in texts:
+        for w in _WORD_RE.findall(t or ""):
+            lw = w.lower()
+            if lw not in _STOPWORDS:
+                seen.setdefault(lw, None)
+    return tuple(seen)[:limit]
+
+
+@dataclass(frozen=True)
+class PackItem:
+    key: str
+    text: str
+    score: float = 0.0
+    required: bool = False
+    truncatable: bool = False
+    group: str | None = None  # items sharing a group pay group_overhead[group] once (diff file headers)
+
+
+@dataclass
+class PackResult:
+    budget_tokens: int
+    used_tokens: int = 0
+    kept: dict[str, str] = field(default_factory=dict)
+    dropped: list[dict[str, Any]] = field(default_factory=list)
+    truncated: list[dict[str, Any]] = field(default_factory=list)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "budget_tokens": self.budget_tokens,
+            "used_tokens": self.used_tokens,
+            "over_budget": self.budget_tokens > 0 and self.used_tokens > self.budget_tokens,
+            "kept_items": len(self.kept),
+            "dropped": self.dropped,
+            "truncated": self.truncated,
+        }
+
+
+def pack(items: Iterable[PackItem], *, budget_tokens: int, group_overhead: dict[str, int] | None = None) -> PackResult:
+    """
+    Keeps required items, then the rest by descending score (smaller first on ties) while they fit.
+    budget_tokens <= 0 means unlimited.
+    """
+    items = list(items)
+    overhead = group_overhead or {}
+    tokens = {it.key: estimate_tokens(it.text) for it in items}
+    res = PackResult(budget_tokens=int(budget_tokens))
+    open_groups: set[str] = set()
+
+    def group_cost(it: PackItem) -> int:
+        return overhead.get(it.group, 0) if it.group and it.group not in open_groups else 0
+
+    def keep(it: PackItem, text: str, cost: int) -> None:
+        res.kept[it.key] = text
+        res.used_tokens += cost
+        if it.group:
+            open_groups.add(it.group)
+
+    for it in items:
+        if it.required:
+            keep(it, it.text, tokens[it.key] + group_cost(it))
+
+    optional = sorted((it for it in items if not it.required), key=lambda it: (-it.score, tokens[it.key]))
+    for it in optional:
+        g = group_cost(it)
+        room = res.budget_tokens - res.used_tokens - g
+        if res.budget_tokens <= 0 or tokens[it.key] <= room:
+            keep(it, it.text, tokens[it.key] + g)
+        elif it.truncatable and room >= MIN_TRUNCATE_TOKENS:
+            text = truncate_to_tokens(it.text, room)
+            keep(it, text, estimate_tokens(text) + g)
+            res.truncated.append({"key": it.key, "tokens": tokens[it.key], "kept_tokens": estimate_tokens(text)})
+        else:
+            res.dropped.append({"key": it.key, "reason": "budget", "tokens": tokens[it.key], "score": it.score})
+    return res
+
+
+@dataclass
+class DiffHunk:
+    header: str
+    lines: list[str] = field(default_factory=list)
+
+    def text(self) -> str:
+        return "\n".join([self.header, *self.lines])
+
+
+@dataclass
+class DiffFile:
+    path: str
+    header: list[str] = field(default_factory=list)
+    hunks: list[DiffHunk] = field(default_factory=list)
+    binary: bool = False
+
+
+def _path_from_diff_header(line: str) -> str:
+    if line.startswith("diff --git ") and " b/" in line:
+        return line.rsplit(" b/", 1)[1].strip()
+    return line.split(" ", 2)[-1].strip()
+
+
+def parse_unified_diff(text: str) -> tuple[str, list[DiffFile]]:
+    """
+    Splits `git diff`/`git show` output into (preamble, files); the preamble is e.g. the commit header.
+    """
+    preamble: list[str] = []
+    files: list[DiffFile] = []
+    cur: DiffFile | None = None
+    hunk: DiffHunk | None = None
+    for line in text.splitlines():
+        if line.startswith("warning: "):
+            # run_cmd merges stderr; git warnings (e.g. CRLF notices) are never diff content
+            # (hunk lines are prefixed, commit message lines indented).
+            continue
+        if line.startswith("diff --"):
+            cur = DiffFile(path=_path_from_diff_header(line), header=[line])
+            files.append(cur)
+            hunk = None
+        elif cur is None:
+            preamble.append(line)
+        elif line.startswith("@@"):
+            hunk = DiffHunk(header=line)
+            cur.hunks.append(hunk)
+        elif hunk is not None:
+            hunk.lines.append(line)
+        else:
+            cur.header.append(line)
+            if line.startswith("Binary files ") or line == "GIT binary patch":
+                cur.binary = True
+            elif line.startswith("+++ b/"):
+                cur.path = line[len("+++ b/") :].strip()
+    return "\n".join(preamble).strip(), files
+
+
+def noise_reason(f: DiffFile) -> str | None:
+    """
+    "binary" / "generated" for files that should never reach a review prompt, else None.
+    """
+    if f.binary:
+        return "binary"
+    if any(rx.match(f.path) for rx in _GENERATED_RES):
+        return "generated"
+    added = [ln[1:].lower() for h in f.hunks[:1] for ln in h.lines[:20] if ln.startswith("+")]
+    if any(m in ln for ln in added for m in _GENERATED_MARKERS):
+        return "generated"
+    return None
+
+
+def is_whitespace_only(h: DiffHunk) -> bool:
+    removed = "".join("".join(ln[1:].split()) for ln in h.lines if ln.startswith("-"))
+    added = "".join("".join(ln[1:].split()) for ln in h.lines if ln.startswith("+"))
+    return removed == added
+
+
+def hunk_score(path: str, h: DiffHunk, keywords: Iterable[str]) -> float:
+    weight = _EXT_WEIGHT.get(os.path.splitext(path)[1].lower(), 1.0)
+    if "test" in path.lower():
+        weight *= 0.8
+    changed = sum(1 for ln in h.lines if ln[:1] in {"+", "-"})
+    body = h.text().lower()
+    hits = sum(1 for k in keywords if k in body)
+    return round(weight + min(changed, 80) / 40 + min(hits, 6) * 0.5, 3)
+
+
+@dataclass(frozen=True)
+class DiffSection:
+    name: str  # short id used in pack keys, e.g. staged|unstaged|commit|base|untracked
+    title: str  # markdown heading
+    text: str  # raw git output
+    kind: str = "diff"  # diff (parsed per hunk) | list (file listing) | raw (opaque, e.g. git error output)
+
+
+@dataclass
+class DiffPlan:
+    sections: list[tuple[DiffSection, str, list[DiffFile]]]
+    items: list[PackItem]
+    group_overhead: dict[str, int]
+    noise: list[dict[str, Any]]
+    item_files: dict[str, str] = field(default_factory=dict)  # pack key -> file path
+
+    def render(self, kept: dict[str, str], dropped: Iterable[dict[str, Any]] = (), *, partial: bool = False) -> str:
+        """
+        Renders the kept items per section in diff order. partial=True (one shard of a sharded review)
+        skips sections without kept content and the omitted-files note.
+        """
+        blocks: list[str] = []
+        for sec, preamble, files in self.sections:
+            if sec.kind != "diff":
+                body = kept.get(f"{sec.name}:text")
+                if body:
+                    fence = "```diff" if sec.kind == "raw" else "```"
+                    blocks.append(f"{sec.title}\n{fence}\n{body}\n```")
+                continue
+            lines: list[str] = []
+            if preamble and f"{sec.name}:preamble" in kept:
+                lines.append(kept[f"{sec.name}:preamble"])
+            for f in files:
+                hunks = [kept[k] for k in (_hunk_key(sec, f, h) for h in f.hunks) if k in kept]
+                if hunks or (not f.hunks and _header_key(sec, f) in kept):
+                    lines.extend(f.header)
+                    lines.extend(hunks)
+            if lines:
+                blocks.append(f"{sec.title}\n```diff\n" + "\n".join(lines) + "\n```")
+            elif (files or preamble) and not partial:
+                blocks.append(f"{sec.title}\n(all hunks omitted; see prompt-pack.json)")
+        if partial:
+            return "\n\n".join(blocks)
+        omitted = _omitted_note(
+            [(n["file"], n["reason"]) for n in self.noise]
+            + [(self.item_files[d["key"]], d["reason"]) for d in dropped if d["key"] in self.item_files]
+        )
+        if omitted:
+            blocks.append(omitted)
+        return "\n\n".join(blocks) if blocks else "## Diff\n(no changes detected)\n"
+
+
+def _hunk_key(sec: DiffSection, f: DiffFile, h: DiffHunk) -> str:
+    rng = h.header.split("@@")[1].strip() if h.header.count("@@") >= 2 else h.header
+    return f"{sec.name}:{f.path}:{rng}"
+
+
+def _header_key(sec: DiffSection, f: DiffFile) -> str:
+    return f"{sec.name}:{f.path}"
+
+
+def _omitted_note(entries: list[tuple[str, str]], *, max_files: int = 20) -> str:
+    by_file: dict[str, dict[str, int]] = {}
+    for path, reason in entries:
+        counts = by_file.setdefault(path, {})
+        counts[reason] = counts.get(reason, 0) + 1
+    if not by_file:
+        return ""
+    lines = ["## Omitted from the diff above (see prompt-pack.json)"]
+    for path, counts in list(by_file.items())[:max_files]:
+        # binary/generated drop the whole file; other reasons are per hunk.
+        parts = [r if r in {"binary", "generated"} else f"{r}: {n} hunk(s)" for r, n in sorted(counts.items())]
+        lines.append(f"- {path} ({', '.join(parts)})")
+    if len(by_file) > max_files:
+        lines.append(f"- ... and {len(by_file) - max_files} more")
+    return "\n".join(lines)
+
+
+def plan_diff(sections: Iterable[DiffSection], *, keywords: Iterable[str] = ()) -> DiffPlan:
+    """
+    Turns diff sections into pack items (one per hunk), dropping binary/generated files and whitespace-only hunks.
+    """
+    keywords = tuple(keywords)
+    plan = DiffPlan(sections=[], items=[], group_overhead={}, noise=[])
+    for sec in sections:
+        if not sec.text.strip():
+            continue
+        if sec.kind != "diff":
+            plan.sections.append((sec, "", []))
+            plan.items.append(PackItem(key=f"{sec.name}:text", text=sec.text.strip(), score=2.0, truncatable=True))
+            continue
+        preamble, files = parse_unified_diff(sec.text)
+        plan.sections.append((sec, preamble, files))
+        if preamble:
+            # Commit header (`git show`): the message states the intent of the change.
+            plan.items.append(PackItem(key=f"{sec.name}:preamble", text=preamble, score=9.0, truncatable=True))
+        for f in files:
+            reason = noise_reason(f)
+            if reason:
+                plan.noise.append({"section": sec.name, "file": f.path, "reason": reason})
+                continue
+            group = _header_key(sec, f)
+            if not f.hunks:
+                # Renames/mode changes/deletions without content: the header is the whole change.
+                weight = _EXT_WEIGHT.get(os.path.splitext(f.path)[1].lower(), 1.0)
+                plan.items.append(PackItem(key=group, text="\n".join(f.header), score=weight))
+                plan.item_files[group] = f.path
+                continue
+            plan.group_overhead[group] = estimate_tokens("\n".join(f.header))
+            for h in f.hunks:
+                key = _hunk_key(sec, f, h)
+                if is_whitespace_only(h):
+                    plan.noise.append({"section": sec.name, "file": f.path, "hunk": h.header, "reason": "whitespace"})
+                    continue
+                plan.items.append(PackItem(key=key, text=h.text(), score=hunk_score(f.path, h, keywords), group=group))
+                plan.item_files[key] = f.path
+    return plan
+
+
+@dataclass(frozen=True)
+class DiffShard:
+    keys: tuple[str, ...]
+    files: tuple[str, ...]
+    tokens: int
+
+
+def _module_of(path: str) -> str:
+    return "/".join(path.split("/")[:-1][:2]) or "(root)"
+
+
+def shard_diff(plan: DiffPlan, *, budget_tokens: int, group_by: str = "module") -> list[DiffShard]:
+    """
+    Splits all diff items into shards of at most budget_tokens (estimated, file headers included).
+
+    Items are grouped by module (first two directory levels) or by file and a group stays in one
+    shard when it fits; oversized groups are split per file, then into runs of hunks. A single
+    hunk larger than the budget gets a shard of its own. Commit preambles go into every shard.
+    """
+    tokens = {it.key: estimate_tokens(it.text) for it in plan.items}
+    shared = [it for it in plan.items if it.key.endswith(":preamble")]
+    shared_cost = sum(tokens[it.key] for it in shared)
+    room = budget_tokens - shared_cost
+
+    units: dict[str, list[PackItem]] = {}
+    for it in plan.items:
+        if it in shared:
+            continue
+        path = plan.item_files.get(it.key)
+        unit = it.key if path is None else (path if group_by == "file" else _module_of(path))
+        units.setdefault(unit, []).append(it)
+
+    def cost(items: list[PackItem], open_groups: set[str]) -> int:
+        groups = {it.group for it in items if it.group and it.group not in open_groups}
+        return sum(tokens[it.key] for it in items) + sum(plan.group_overhead.get(g, 0) for g in groups)
+
+    def split(items: list[PackItem]) -> list[list[PackItem]]:
+        if cost(items, set()) <= room:
+            return [items]
+        by_file: dict[str, list[PackItem]] = {}
+        for it in items:
+            by_file.setdefault(plan.item_files.get(it.key, it.key), []).append(it)
+        if len(by_file) > 1:
+            return [chunk for file_items in by_file.values() for chunk in split(file_items)]
+        runs: list[list[PackItem]] = []
+        run: list[PackItem] = []
+        for it in items:
+            if run and cost([*run, it], set()) > room:
+                runs.append(run)
+                run = []
+            run.append(it)
+        if run:
+            runs.append(run)
+        return runs
+
+    shards: list[DiffShard] = []
+    cur: list[PackItem] = []
+    cur_tokens = shared_cost
+    open_groups: set[str] = set()
+
+    def flush() -> None:
+        items = [*shared, *cur]
+        files = tuple(dict.fromkeys(plan.item_files[it.key] for it in cur if it.key in plan.item_files))
+        shards.append(DiffShard(keys=tuple(it.key for it in items), files=files, tokens=cur_tokens))
+
+    for unit_items in units.values():
+        for chunk in split(unit_items):
+            c = cost(chunk, open_groups)
+            if cur and cur_tokens + c > budget_tokens:
+                flush()
+                cur, cur_tokens, open_groups = [], shared_cost, set()
+                c = cost(chunk, open_groups)
+            cur.extend(chunk)
+            cur_tokens += c
+            open_groups.update(it.group for it in chunk if it.group)
+    if cur:
+        flush()
+    return shards
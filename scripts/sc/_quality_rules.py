@@ -19,7 +19,10 @@ from __future__ import annotations
 import re
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Iterable
+from typing import Any, Collection
+
+from _pattern_set import PatternSet
+from _source_scan import ScanRule, SourceFile, scan_sources
 
 
 @dataclass(frozen=True)
@@ -36,18 +39,15 @@ _BLOCKING_WAIT_RE = re.compile(r"\.GetAwaiter\s*\(\s*\)\s*\.GetResult\s*\(\s*\)"
 _EVENTBUS_LOOKUP_RE = re.compile(r'GetNodeOrNull\s*<\s*EventBusAdapter\s*>\s*\(\s*"/root/EventBus"\s*\)')
 _DOMAIN_EVENT_CONNECT_RE = re.compile(r"Connect\s*\(\s*EventBusAdapter\.SignalName\.DomainEventEmitted\b")
 
-
-def _to_posix(path: Path) -> str:
-    return str(path).replace("\\", "/")
-
-
-def _iter_cs_files(root: Path) -> Iterable[Path]:
-    for p in root.rglob("*.cs"):
-        if not p.is_file():
-            continue
-        if any(seg in {".git", ".godot", "bin", "obj", "logs", "TestResults"} for seg in p.parts):
-            continue
-        yield p
+# Every rule needs at least one of these to fire; files without a candidate hit are skipped.
+_PREFILTER = PatternSet(
+    {
+        "cs.blocking_async_wait": _BLOCKING_WAIT_RE,
+        "cs.eventbus_repeated_lookup": _EVENTBUS_LOOKUP_RE,
+        "cs.domain_event_connect_without_exit_cleanup": _DOMAIN_EVENT_CONNECT_RE,
+        "cs.jsondocument_parse_single_arg": re.escape("JsonDocument.Parse"),
+    }
+)
 
 
 def _is_blocking_wait_hard_scope(rel: str) -> bool:
@@ -128,64 +128,77 @@ def _find_jsondocument_parse_single_arg(text: str) -> list[int]:
     return hits
 
 
-def scan_quality_rules(*, repo_root: Path) -> dict[str, Any]:
+def _check_file(sf: SourceFile) -> list[Finding]:
     findings: list[Finding] = []
-
-    for p in _iter_cs_files(repo_root):
-        rel = _to_posix(p.relative_to(repo_root))
-        text = p.read_text(encoding="utf-8", errors="ignore")
-
-        if _is_blocking_wait_hard_scope(rel) and _BLOCKING_WAIT_RE.search(text):
-            for m in _BLOCKING_WAIT_RE.finditer(text):
-                line = _line_number(text, m.start())
-                sample = text.splitlines()[line - 1].strip() if line - 1 < len(text.splitlines()) else None
-                findings.append(
-                    Finding(
-                        rule="cs.blocking_async_wait",
-                        severity="p0",
-                        file=rel,
-                        line=line,
-                        message="Blocking async wait via GetAwaiter().GetResult() in Game.Core services or Godot runtime scripts.",
-                        sample=sample,
-                    )
+    rel = sf.rel
+    text = sf.text
+
+    if _is_blocking_wait_hard_scope(rel) and _BLOCKING_WAIT_RE.search(text):
+        for m in _BLOCKING_WAIT_RE.finditer(text):
+            line = _line_number(text, m.start())
+            sample = text.splitlines()[line - 1].strip() if line - 1 < len(text.splitlines()) else None
+            findings.append(
+                Finding(
+                    rule="cs.blocking_async_wait",
+                    severity="p0",
+                    file=rel,
+                    line=line,
+                    message="Blocking async wait via GetAwaiter().GetResult() in Game.Core services or Godot runtime scripts.",
+                    sample=sample,
                 )
-
-        # UI-specific rules: apply to runtime UI scripts (both main project and Tests.Godot runtime mirror).
-        if "/Scripts/" in rel and rel.endswith(".cs"):
-            lookups = list(_EVENTBUS_LOOKUP_RE.finditer(text))
-            if len(lookups) > 1:
-                findings.append(
-                    Finding(
-                        rule="cs.eventbus_repeated_lookup",
-                        severity="p1",
-                        file=rel,
-                        line=_line_number(text, lookups[1].start()),
-                        message=f"Repeated GetNodeOrNull<EventBusAdapter>(\"/root/EventBus\") lookups in one file (count={len(lookups)}). Prefer caching/injection.",
-                        sample=lookups[1].group(0),
-                    )
+            )
+
+    # UI-specific rules: apply to runtime UI scripts (both main project and Tests.Godot runtime mirror).
+    if "/Scripts/" in rel and rel.endswith(".cs"):
+        lookups = list(_EVENTBUS_LOOKUP_RE.finditer(text))
+        if len(lookups) > 1:
+            findings.append(
+                Finding(
+                    rule="cs.eventbus_repeated_lookup",
+                    severity="p1",
+                    file=rel,
+                    line=_line_number(text, lookups[1].start()),
+                    message=f"Repeated GetNodeOrNull<EventBusAdapter>(\"/root/EventBus\") lookups in one file (count={len(lookups)}). Prefer caching/injection.",
+                    sample=lookups[1].group(0),
                 )
-
-            if _DOMAIN_EVENT_CONNECT_RE.search(text) and "override void _ExitTree" not in text:
-                findings.append(
-                    Finding(
-                        rule="cs.domain_event_connect_without_exit_cleanup",
-                        severity="p1",
-                        file=rel,
-                        line=None,
-                        message="Connect(DomainEventEmitted) detected but no _ExitTree override found; risk of leaked signal connection.",
-                    )
+            )
+
+        if _DOMAIN_EVENT_CONNECT_RE.search(text) and "override void _ExitTree" not in text:
+            findings.append(
+                Finding(
+                    rule="cs.domain_event_connect_without_exit_cleanup",
+                    severity="p1",
+                    file=rel,
+                    line=None,
+                    message="Connect(DomainEventEmitted) detected but no _ExitTree override found; risk of leaked signal connection.",
                 )
-
-            for pos in _find_jsondocument_parse_single_arg(text):
-                findings.append(
-                    Finding(
-                        rule="cs.jsondocument_parse_single_arg",
-                        severity="p1",
-                        file=rel,
-                        line=_line_number(text, pos),
-                        message="JsonDocument.Parse(...) called without JsonDocumentOptions (no MaxDepth bound). Prefer JsonDocument.Parse(json, options).",
-                    )
+            )
+
+        for pos in _find_jsondocument_parse_single_arg(text):
+            findings.append(
+                Finding(
+                    rule="cs.jsondocument_parse_single_arg",
+                    severity="p1",
+                    file=rel,
+                    line=_line_number(text, pos),
+                    message="JsonDocument.Parse(...) called without JsonDocumentOptions (no MaxDepth bound). Prefer JsonDocument.Parse(json, options).",
                 )
+            )
+
+    return findings
+
+
+QUALITY_RULE = ScanRule(
+    name="quality_rules",
+    check=_check_file,
+    exts=frozenset({".cs"}),
+    skip_dirs=frozenset({".git", ".godot", "bin", "obj", "logs", "TestResults"}),
+    prefilter=_PREFILTER,
+)
+
+
+def scan_quality_rules(*, repo_root: Path, only: Collection[str] | None = None) -> dict[str, Any]:
+    findings: list[Finding] = scan_sources(repo_root, [QUALITY_RULE], only=only)[QUALITY_RULE.name]
 
     by_sev: dict[str, list[dict[str, Any]]] = {"p0": [], "p1": [], "p2": []}
     for f in findings:
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Merge P0-P3 findings from several review outputs into one deduplicated report.
+
+Why:
+  Sharded sc-llm-review runs (--shard-token-budget) produce one review per
+  (agent, diff shard). Reading N x M Markdown files by hand, with the same issue
+  reported from several shards/agents, defeats the point of the review.
+
+What:
+  - parse_findings() extracts (severity, text) pairs from free-form Markdown:
+    "## P1" sections with bullets under them, and inline "- [P1] ...",
+    "- P1: ...", "**P1** ..." lines. "none"-style placeholders are skipped.
+  - parse_verdict() reads the last "Verdict: OK | Needs Fix" line.
+  - merge_findings() dedupes by normalized text (case, markdown, line numbers
+    ignored) plus the set of file paths mentioned, with a fuzzy fallback for
+    near-identical or extended wording; the most severe severity wins and every
+    source (agent#shard) is kept.
+  - final_verdict(): Needs Fix if any source says so or any P0/P1 remains,
+    Unknown if a source produced no output, else OK.
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field
+from difflib import SequenceMatcher
+from typing import Any, Iterable
+
+SEVERITIES = ("P0", "P1", "P2", "P3")
+
+_HEADING_RE = re.compile(r"^\s*#{1,6}\s*(?:\*\*|__)?\s*(P[0-3])(?![\w])", re.IGNORECASE)
+_OTHER_HEADING_RE = re.compile(r"^\s*#{1,6}\s")
+_INLINE_RE = re.compile(
+    r"^\s*(?:[-*+]|\d+[.)])?\s*(?:\*\*|__)?\[?(P[0-3])(?![\w])\]?(?:\*\*|__)?\s*(?:[:：\-–—)|]\s*)?(.*)$",
+    re.IGNORECASE,
+)
+_BULLET_RE = re.compile(r"^(\s*)(?:[-*+]|\d+[.)])\s+(.+)$")
+_SECTION_WORDS_RE = re.compile(r"^(?:findings?|issues?)?\s*[:：]?\s*(?:\((?:none|n/a)\))?\s*$", re.IGNORECASE)
+_VERDICT_RE = re.compile(r"verdict\s*(?:\*\*|__)?\s*[:：]\s*(?:\*\*|__)?\s*(OK|Needs\s+Fix)", re.IGNORECASE)
+_PLACEHOLDERS = frozenset({"none", "n/a", "na", "no findings", "none found", "no issues", "nothing", "-", "无"})
+
+_PATH_RE = re.compile(r"[\w.\-/]+\.(?:cs|gd|py|ps1|json|md|tscn|tres|csproj|ya?ml|toml|sql)\b", re.IGNORECASE)
+_LINE_REF_RE = re.compile(r"(?::|#L|\blines?\s*)\d+(?:\s*-\s*\d+)?", re.IGNORECASE)
+_FUZZY_RATIO = 0.85
+_MIN_CONTAINED_CHARS = 24
+
+
+@dataclass
+class Finding:
+    severity: str
+    text: str
+    paths: tuple[str, ...]
+    sources: list[str] = field(default_factory=list)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {"severity": self.severity, "text": self.text, "paths": list(self.paths), "sources": self.sources}
+
+
+def parse_findings(markdown: str) -> list[tuple[str, str]]:
+    out: list[list[str]] = []
+    current: str | None = None
+    for line in (markdown or "").splitlines():
+        if not line.strip():
+            continue
+        h = _HEADING_RE.match(line)
+        if h:
+            current = h.group(1).upper()
+            continue
+        if _OTHER_HEADING_RE.match(line) or _VERDICT_RE.search(line):
+            current = None
+            continue
+        m = _INLINE_RE.match(line)
+        if m:
+            sev, rest = m.group(1).upper(), m.group(2).strip()
+            if _SECTION_WORDS_RE.match(rest):
+                current = sev
+            else:
+                out.append([sev, rest])
+            continue
+        b = _BULLET_RE.match(line)
+        if b and current:
+            indent, text = b.groups()
+            if len(indent) >= 2 and out:
+                out[-1][1] += " " + text.strip()  # sub-bullet: detail of the previous finding
+            else:
+                out.append([current, text.strip()])
+    return [(sev, text) for sev, text in out if _normalize(text) and _normalize(text) not in _PLACEHOLDERS]
+
+
+def parse_verdict(markdown: str) -> str | None:
+    hits = _VERDICT_RE.findall(markdown or "")
+    if not hits:
+        return None
+    return "OK" if hits[-1].strip().upper() == "OK" else "Needs Fix"
+
+
+def _normalize(text: str) -> str:
+    t = _LINE_REF_RE.sub(" ", text.lower())
+    t = re.sub(r"[`*_>\[\]()\"'.,;:]", " ", t)
+    return re.sub(r"\s+", " ", t).strip(" -")
+
+
+def _same_finding(a: str, b: str) -> bool:
+    if a == b:
+        return True
+    # One report often extends the other's sentence with a fix hint.
+    if min(len(a), len(b)) >= _MIN_CONTAINED_CHARS and (a in b or b in a):
+        return True
+    return SequenceMatcher(None, a, b).ratio() >= _FUZZY_RATIO
+
+
+def merge_findings(batches: Iterable[tuple[str, list[tuple[str, str]]]]) -> list[Finding]:
+    """
+    batches: (source label, findings of that source). Returns findings sorted by severity, then first appearance.
+    """
+    merged: list[Finding] = []
+    norms: list[str] = []
+    for source, findings in batches:
+        for sev, text in findings:
+            norm = _normalize(text)
+            paths = tuple(sorted({p.lower() for p in _PATH_RE.findall(text)}))
+            hit = None
+            for i, f in enumerate(merged):
+                if f.paths != paths:
+                    continue
+                if _same_finding(norms[i], norm):
+                    hit = f
+                    break
+            if hit is None:
+                merged.append(Finding(severity=sev, text=text, paths=paths, sources=[source]))
+                norms.append(norm)
+                continue
+            if SEVERITIES.index(sev) < SEVERITIES.index(hit.severity):
+                hit.severity = sev
+            if source not in hit.sources:
+                hit.sources.append(source)
+    order = {id(f): i for i, f in enumerate(merged)}
+    return sorted(merged, key=lambda f: (SEVERITIES.index(f.severity), order[id(f)]))
+
+
+def final_verdict(verdicts: Iterable[str | None], findings: Iterable[Finding]) -> str:
+    verdicts = list(verdicts)
+    if "Needs Fix" in verdicts or any(f.severity in {"P0", "P1"} for f in findings):
+        return "Needs Fix"
+    if not verdicts or any(v is None for v in verdicts):
+        return "Unknown"
+    return "OK"
+
+
+def render_merged_report(*, title: str, findings: list[Finding], verdict: str, sources: list[str], missing: list[str]) -> str:
+    lines = [f"# {title}", "", f"- merged sources: {len(sources)}"]
+    if missing:
+        lines.append(f"- sources without output: {', '.join(missing)}")
+    lines.append("")
+    for sev in SEVERITIES:
+        lines.append(f"## {sev}")
+        items = [f for f in findings if f.severity == sev]
+        lines.extend([f"- {f.text} (from: {', '.join(f.sources)})" for f in items] or ["- none"])
+        lines.append("")
+    lines.append(f"Verdict: {verdict}")
+    lines.append("")
+    return "\n".join(lines)
@@ -0,0 +1,325 @@
+#!/usr/bin/env python3
+"""
+Single-pass multi-rule source scanner shared by security/quality/arch gates.
+
+Why:
+  security_soft_scan, security_hard_{path,sql,audit}_gate, check_architecture_boundary,
+  _quality_rules and sc-analyze pattern scans each walked the tree with rglob and
+  re-read every file, and security_soft_scan even walked once per rule.
+
+What:
+  - A gate declares ScanRules: a scope (roots, extensions, skip dirs, optional
+    path predicate) and a `check(SourceFile) -> list[finding]` callback.
+  - An optional PatternSet prefilter (scripts/sc/_pattern_set.py) lets the engine
+    skip `check` for files where none of the rule's regexes can match.
+  - scan_sources() lists the union of the rules' roots once via the git index
+    (scripts/sc/_file_discovery.py; os.walk outside git), drops dirs every rule
+    skips, reads each in-scope file once and evaluates all applicable rules
+    on it. Findings come back per rule name, files in sorted path order, so each
+    gate can keep its existing JSON report shape.
+  - Walks and file contents are memoized per process (contents keyed by
+    mtime_ns/size), so gates running in one interpreter (sc-acceptance-check
+    --in-process, sc-analyze --in-process) share a single walk and read.
+  - Across runs, prefilter misses are persisted in logs/cache/source-scan/
+    prefilter-misses.json as {path: [mtime_ns, size, [PatternSet fingerprint, ...]]}.
+    A file whose stat is unchanged skips every rule whose prefilter already
+    missed it, and is not read at all when no rule is left. Since almost no file
+    has a hit, this is most of the scan on an unchanged tree.
+
+  - `only` restricts a scan to a set of root-relative paths (the gates'
+    `--changed-since` mode); touches() tells whether a change set hits a rule's
+    scope, for whole-repo invariants that are only recomputed when it does.
+
+Notes:
+  - SourceFile.text mirrors Path.read_text(encoding="utf-8", errors="ignore")
+    (universal newlines); strict_text is None when the file is not valid UTF-8.
+  - Call clear_source_cache() if files are edited within the same process.
+  - Only negative prefilter results are persisted (a PatternSet never drops a
+    real match, so reusing a miss cannot hide a finding); rules without an
+    enabled prefilter always run. SC_SOURCE_SCAN_CACHE=0 disables the store;
+    deleting the file only costs one full read.
+"""
+
+from __future__ import annotations
+
+import fnmatch
+import json
+import os
+import re
+import stat
+import threading
+from dataclasses import dataclass, field
+from functools import cached_property
+from pathlib import Path
+from typing import Any, Callable, Collection, Iterable
+
+from _file_discovery import discover_files
+from _pattern_set import PatternSet
+from _util import repo_root
+
+SKIP_DIRS = frozenset({".git", ".godot", "bin", "obj", "logs"})
+
+_WALKS: dict[tuple[Path, frozenset[str]], list[Path]] = {}
+_TEXTS: dict[Path, tuple[tuple[int, int], "SourceFile"]] = {}
+_CACHE_LOCK = threading.Lock()
+# Persistent prefilter misses: {abs path: (mtime_ns, size, {fingerprint, ...})}; None until loaded.
+_MISSES: dict[str, tuple[int, int, set[str]]] | None = None
+_MISSES_DIRTY = False
+
+
+def compile_glob(pattern: str) -> re.Pattern[str]:
+    """
+    Compiles a posix glob where "**/" matches zero or more directories.
+    """
+    # fnmatch's "*" already crosses "/", so only "**/" needs special handling.
+    parts = pattern.replace("\\", "/").split("**/")
+    body = "(?:.*/)?".join(fnmatch.translate(p)[4:-3] for p in parts)
+    return re.compile(rf"(?s:{body})\Z")
+
+
+@dataclass(frozen=True)
+class SourceFile:
+    path: Path
+    rel: str  # posix, relative to the scan root
+    raw: bytes
+
+    @cached_property
+    def text(self) -> str:
+        return _normalize_newlines(self.raw.decode("utf-8", errors="ignore"))
+
+    @cached_property
+    def strict_text(self) -> str | None:
+        try:
+            return _normalize_newlines(self.raw.decode("utf-8"))
+        except UnicodeDecodeError:
+            return None
+
+    @cached_property
+    def lines(self) -> list[str]:
+        return self.text.splitlines()
+
+
+def _normalize_newlines(text: str) -> str:
+    return text.replace("\r\n", "\n").replace("\r", "\n")
+
+
+@dataclass(frozen=True)
+class ScanRule:
+    name: str
+    check: Callable[[SourceFile], list[Any]]
+    roots: tuple[str, ...] = ("",)  # dirs relative to the scan root; "" = whole root
+    exts: frozenset[str] | None = None  # lowercase suffixes; None = any file
+    skip_dirs: frozenset[str] = SKIP_DIRS
+    max_bytes: int | None = None
+    match: Callable[[str], bool] | None = None  # extra predicate on SourceFile.rel
+    prefilter: PatternSet | None = None  # every finding requires one of these patterns to match
+    _root_prefixes: tuple[str, ...] = field(init=False, repr=False, compare=False, default=())
+
+    def __post_init__(self) -> None:
+        prefixes = tuple("" if not r.strip("/") else r.replace("\\", "/").strip("/") + "/" for r in self.roots)
+        object.__setattr__(self, "_root_prefixes", prefixes)
+
+    def applies(self, rel: str, size: int) -> bool:
+        if not any(rel.startswith(p) for p in self._root_prefixes):
+            return False
+        if self.exts is not None and os.path.splitext(rel)[1].lower() not in self.exts:
+            return False
+        if self.skip_dirs and any(seg in self.skip_dirs for seg in rel.split("/")[:-1]):
+            return False
+        if self.max_bytes is not None and size > self.max_bytes:
+            return False
+        return self.match is None or self.match(rel)
+
+
+def _walk(base: Path, prune: frozenset[str]) -> list[Path]:
+    with _CACHE_LOCK:
+        for (cached_base, cached_prune), files in _WALKS.items():
+            # A walk of an ancestor that pruned less can be filtered down instead of re-walked.
+            if cached_prune <= prune and (cached_base == base or cached_base in base.parents):
+                return [p for p in files if _under(p, base, prune)]
+    files = discover_files(base, skip_dirs=prune)
+    with _CACHE_LOCK:
+        _WALKS[(base, prune)] = files
+    return files
+
+
+def _under(path: Path, base: Path, prune: frozenset[str]) -> bool:
+    try:
+        rel_parts = path.relative_to(base).parts
+    except ValueError:
+        return False
+    return not any(seg in prune for seg in rel_parts[:-1])
+
+
+def _read(path: Path, rel: str, stamp: tuple[int, int]) -> SourceFile | None:
+    with _CACHE_LOCK:
+        cached = _TEXTS.get(path)
+    if cached and cached[0] == stamp:
+        return cached[1] if cached[1].rel == rel else SourceFile(path=path, rel=rel, raw=cached[1].raw)
+    try:
+        raw = path.read_bytes()
+    except OSError:
+        return None
+    sf = SourceFile(path=path, rel=rel, raw=raw)
+    with _CACHE_LOCK:
+        _TEXTS[path] = (stamp, sf)
+    return sf
+
+
+def miss_store_path() -> Path:
+    return repo_root() / "logs" / "cache" / "source-scan" / "prefilter-misses.json"
+
+
+def _miss_store_enabled() -> bool:
+    return str(os.environ.get("SC_SOURCE_SCAN_CACHE") or "1").strip().lower() not in ("0", "false", "no", "off")
+
+
+def _load_misses() -> dict[str, tuple[int, int, set[str]]]:
+    global _MISSES
+    with _CACHE_LOCK:
+        if _MISSES is None:
+            _MISSES = {}
+            try:
+                raw = json.loads(miss_store_path().read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                raw = {}
+            for key, val in (raw.items() if isinstance(raw, dict) else ()):
+                try:
+                    _MISSES[key] = (int(val[0]), int(val[1]), set(val[2]))
+                except (TypeError, ValueError, IndexError):
+                    continue
+        return _MISSES
+
+
+def _known_misses(path: Path, stamp: tuple[int, int]) -> set[str]:
+    entry = _load_misses().get(str(path))
+    return entry[2] if entry is not None and (entry[0], entry[1]) == stamp else set()
+
+
+def _record_misses(path: Path, stamp: tuple[int, int], misses: set[str]) -> None:
+    global _MISSES_DIRTY
+    known = _load_misses()
+    with _CACHE_LOCK:
+        entry = known.get(str(path))
+        merged = set(misses) | (entry[2] if entry is not None and (entry[0], entry[1]) == stamp else set())
+        if entry is None or (entry[0], entry[1]) != stamp or entry[2] != merged:
+            if merged:
+                known[str(path)] = (stamp[0], stamp[1], merged)
+            else:
+                known.pop(str(path), None)
+            _MISSES_DIRTY = True
+
+
+def _save_misses() -> None:
+    global _MISSES_DIRTY
+    with _CACHE_LOCK:
+        if not _MISSES_DIRTY or _MISSES is None:
+            return
+        payload = {k: [m, sz, sorted(fps)] for k, (m, sz, fps) in sorted(_MISSES.items())}
+        _MISSES_DIRTY = False
+    path = miss_store_path()
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp.write_text(json.dumps(payload, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp, path)
+    except OSError:
+        # Best-effort cache: a read-only logs/ must not fail the gate.
+        try:
+            tmp.unlink()
+        except OSError:
+            pass
+
+
+def _iter_candidates(
+    root: Path, rules: list[ScanRule], only: Collection[str] | None
+) -> Iterable[tuple[Path, str, tuple[int, int], list[ScanRule]]]:
+    root = Path(root).resolve()
+    candidates: set[Path] = set()
+    if only is not None:
+        candidates.update(root.joinpath(*rel.split("/")) for rel in only)
+    else:
+        prune = frozenset.intersection(*(r.skip_dirs for r in rules))
+        prefixes = sorted({p for r in rules for p in r._root_prefixes})
+        bases: list[str] = []
+        for p in prefixes:
+            if not any(p.startswith(b) for b in bases):
+                bases.append(p)
+        for b in bases:
+            candidates.update(_walk(root / b if b else root, prune))
+
+    for path in sorted(candidates):
+        rel = path.relative_to(root).as_posix()
+        try:
+            st = path.stat()
+        except OSError:
+            continue
+        if not stat.S_ISREG(st.st_mode):
+            continue
+        applicable = [r for r in rules if r.applies(rel, st.st_size)]
+        if applicable:
+            yield path, rel, (st.st_mtime_ns, st.st_size), applicable
+
+
+def iter_source_files(
+    root: Path, rules: Iterable[ScanRule], *, only: Collection[str] | None = None
+) -> Iterable[tuple[SourceFile, list[ScanRule]]]:
+    """
+    Yields (file, applicable rules) for every in-scope file under root, in sorted path order.
+    With `only` (posix paths relative to root), just those files are considered and no walk happens.
+    """
+    rules = list(rules)
+    if not rules:
+        return
+    for path, rel, stamp, applicable in _iter_candidates(root, rules, only):
+        sf = _read(path, rel, stamp)
+        if sf is not None:
+            yield sf, applicable
+
+
+def scan_sources(root: Path, rules: Iterable[ScanRule], *, only: Collection[str] | None = None) -> dict[str, list[Any]]:
+    """
+    Evaluates all rules in one walk/read; returns findings per rule name (in file order).
+    """
+    rules = list(rules)
+    out: dict[str, list[Any]] = {r.name: [] for r in rules}
+    if not rules:
+        return out
+    persist = _miss_store_enabled()
+    for path, rel, stamp, applicable in _iter_candidates(root, rules, only):
+        if persist:
+            known = _known_misses(path, stamp)
+            if known:
+                applicable = [r for r in applicable if r.prefilter is None or r.prefilter.fingerprint not in known]
+                if not applicable:
+                    continue  # every rule already missed this exact file: no read
+        sf = _read(path, rel, stamp)
+        if sf is None:
+            continue
+        misses: set[str] = set()
+        for r in applicable:
+            if r.prefilter is not None and not r.prefilter.search(sf.text):
+                if r.prefilter.fingerprint is not None:
+                    misses.add(r.prefilter.fingerprint)
+                continue
+            out[r.name].extend(r.check(sf))
+        if persist and misses:
+            _record_misses(path, stamp, misses)
+    if persist:
+        _save_misses()
+    return out
+
+
+def touches(rule: ScanRule, rels: Iterable[str]) -> bool:
+    """
+    True if any of the posix rel paths (existing or deleted) falls in the rule's scope.
+    """
+    return any(rule.applies(rel, 0) for rel in rels)
+
+
+def clear_source_cache() -> None:
+    global _MISSES, _MISSES_DIRTY
+    with _CACHE_LOCK:
+        _WALKS.clear()
+        _TEXTS.clear()
+        _MISSES, _MISSES_DIRTY = None, False
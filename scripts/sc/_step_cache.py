@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+Content-addressed result cache for sc-acceptance-check steps.
+
+Why:
+  Most deterministic acceptance steps (overlay, contracts, arch, security gates,
+  quality rules, refs validators) only depend on a handful of source/doc files.
+  Re-running them when none of those files changed is pure wall-clock cost.
+
+What:
+  - A step declares its inputs (StepInputs): repo-relative globs, extra params
+    (task id, modes, strict flags) and the artifact files it writes into out_dir.
+  - fingerprint = sha256(step key, cache version, params, sorted (path, sha256(content))).
+  - On a miss the step runs normally; ok/skipped results are stored under
+    logs/cache/acceptance-steps/<step>/<fingerprint>/ together with copies of the
+    declared artifacts. Failed results are never cached.
+  - On a hit the artifacts are restored into the current out_dir, out_dir paths in
+    the StepResult are rewritten and details["cache"] records the reuse.
+
+Notes:
+  - Only artifacts inside out_dir are replayed; fixed-path side outputs under
+    logs/ci/<date>/ (e.g. validate_contracts' contracts-validate.json) are not.
+  - Steps that consume run-scoped evidence (tests, headless/TRX evidence, perf,
+    sc-analyze, LLM gates) must not be cached; they have no StepInputs entry.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+import shutil
+import threading
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+from typing import Any, Callable, Iterable
+
+from _source_scan import compile_glob
+from _step_result import StepResult
+from _util import repo_root
+
+CACHE_VERSION = 1
+KEEP_PER_STEP = 5
+
+_OUT_DIR_TOKEN = "<<OUT_DIR>>"
+_SKIP_DIRS = {".git", ".godot", ".vs", "bin", "obj", "logs", "node_modules", "TestResults", "__pycache__"}
+_STORE_LOCK = threading.Lock()
+
+
+@dataclass(frozen=True)
+class StepInputs:
+    globs: tuple[str, ...]
+    artifacts: tuple[str, ...] = ()
+    params: dict[str, Any] = field(default_factory=dict)
+
+
+def cache_root() -> Path:
+    return repo_root() / "logs" / "cache" / "acceptance-steps"
+
+
+def _static_prefix(pattern: str) -> str:
+    head: list[str] = []
+    for seg in pattern.split("/")[:-1]:
+        if any(ch in seg for ch in "*?["):
+            break
+        head.append(seg)
+    return "/".join(head)
+
+
+def iter_input_files(globs: Iterable[str], *, root: Path | None = None) -> list[str]:
+    """
+    Returns sorted repo-relative posix paths matching any glob ("**/" = any depth).
+    """
+    root = root or repo_root()
+    by_prefix: dict[str, list[re.Pattern[str]]] = {}
+    for g in globs:
+        g = g.replace("\\", "/").strip("/")
+        by_prefix.setdefault(_static_prefix(g), []).append(compile_glob(g))
+
+    found: set[str] = set()
+    for prefix, regexes in by_prefix.items():
+        base = root / prefix if prefix else root
+        if base.is_file():
+            rel = prefix
+            if any(rx.match(rel) for rx in regexes):
+                found.add(rel)
+            continue
+        for dirpath, dirnames, filenames in os.walk(base):
+            dirnames[:] = sorted(d for d in dirnames if d not in _SKIP_DIRS)
+            rel_dir = Path(dirpath).relative_to(root).as_posix()
+            for name in filenames:
+                rel = name if rel_dir == "." else f"{rel_dir}/{name}"
+                if any(rx.match(rel) for rx in regexes):
+                    found.add(rel)
+    return sorted(found)
+
+
+def _file_digest(path: Path) -> str:
+    h = hashlib.sha256()
+    with path.open("rb") as fh:
+        for chunk in iter(lambda: fh.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def compute_fingerprint(key: str, inputs: StepInputs) -> tuple[str, int]:
+    root = repo_root()
+    files = iter_input_files(inputs.globs, root=root)
+    h = hashlib.sha256(f"v{CACHE_VERSION}\n{key}\n".encode("utf-8"))
+    h.update(json.dumps(inputs.params, sort_keys=True, ensure_ascii=False, default=str).encode("utf-8") + b"\n")
+    for rel in files:
+        try:
+            digest = _file_digest(root / rel)
+        except OSError:
+            digest = "-"
+        h.update(f"{rel}\0{digest}\n".encode("utf-8"))
+    return h.hexdigest(), len(files)
+
+
+def _swap_prefix(value: Any, old: str, new: str) -> Any:
+    if isinstance(value, str):
+        return value.replace(old, new)
+    if isinstance(value, list):
+        return [_swap_prefix(v, old, new) for v in value]
+    if isinstance(value, dict):
+        return {k: _swap_prefix(v, old, new) for k, v in value.items()}
+    return value
+
+
+def _entry_dir(key: str, fingerprint: str) -> Path:
+    return cache_root() / key / fingerprint
+
+
+def load_cached(key: str, fingerprint: str, out_dir: Path) -> StepResult | None:
+    entry = _entry_dir(key, fingerprint)
+    try:
+        raw = json.loads((entry / "result.json").read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if not isinstance(raw, dict) or raw.get("version") != CACHE_VERSION:
+        return None
+    result = _swap_prefix(raw.get("result") or {}, _OUT_DIR_TOKEN, str(out_dir))
+    try:
+        out_dir.mkdir(parents=True, exist_ok=True)
+        for rel in raw.get("artifacts") or []:
+            shutil.copyfile(entry / "artifacts" / rel, out_dir / rel)
+        os.utime(entry)
+    except OSError:
+        return None
+    try:
+        return StepResult(**result)
+    except TypeError:
+        return None
+
+
+def store_cached(key: str, fingerprint: str, out_dir: Path, result: StepResult, artifacts: Iterable[str]) -> None:
+    entry = _entry_dir(key, fingerprint)
+    tmp = entry.with_name(f"{fingerprint}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        shutil.rmtree(tmp, ignore_errors=True)
+        (tmp / "artifacts").mkdir(parents=True, exist_ok=True)
+        stored: list[str] = []
+        for rel in artifacts:
+            src = out_dir / rel
+            if src.is_file():
+                shutil.copyfile(src, tmp / "artifacts" / rel)
+                stored.append(rel)
+        payload = {
+            "version": CACHE_VERSION,
+            "step": key,
+            "fingerprint": fingerprint,
+            "artifacts": stored,
+            "result": _swap_prefix(dict(result.__dict__), str(out_dir), _OUT_DIR_TOKEN),
+        }
+        (tmp / "result.json").write_text(json.dumps(payload, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+        with _STORE_LOCK:
+            shutil.rmtree(entry, ignore_errors=True)
+            os.replace(tmp, entry)
+            _prune(entry.parent)
+    except OSError:
+        # Best-effort cache: a read-only logs/ must not fail the gate.
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+def _prune(step_dir: Path) -> None:
+    entries = [p for p in step_dir.iterdir() if p.is_dir() and not p.name.endswith(".tmp")]
+    entries.sort(key=lambda p: p.stat().st_mtime, reverse=True)
+    for stale in entries[KEEP_PER_STEP:]:
+        shutil.rmtree(stale, ignore_errors=True)
+
+
+def cached_step(key: str, inputs: StepInputs, out_dir: Path, run: Callable[[], StepResult]) -> Callable[[], StepResult]:
+    """
+    Wraps a step thunk: reuse the stored result when the input fingerprint matches.
+    """
+
+    def _run() -> StepResult:
+        fingerprint, n_files = compute_fingerprint(key, inputs)
+        hit = load_cached(key, fingerprint, out_dir)
+        if hit is not None:
+            details = dict(hit.details or {})
+            details["cache"] = {"hit": True, "fingerprint": fingerprint, "inputs": n_files}
+            return replace(hit, details=details)
+        result = run()
+        if result.status in ("ok", "skipped"):
+            store_cached(key, fingerprint, out_dir, result, inputs.artifacts)
+        details = dict(result.details or {})
+        details["cache"] = {"hit": False, "fingerprint": fingerprint, "inputs": n_files}
+        return replace(result, details=details)
+
+    return _run
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Dependency-aware step scheduler for sc-acceptance-check.
+
+Why:
+  Most acceptance steps are independent subprocesses (overlay, contracts, arch,
+  security gates, quality rules). Running them one after another leaves the CPU
+  idle for most of the gate's wall clock.
+
+What:
+  - Each step is declared as a PlannedStep with:
+      deps:  step keys that must finish before this step starts
+             (e.g. tests-all -> headless-e2e-evidence)
+      locks: shared resources that must not be used concurrently
+             (e.g. two steps writing logs/ci/<date>/encoding/session-*.json)
+  - Deps on keys that are not part of the plan are ignored (step filtered by --only).
+  - Results are always returned in declaration order, so summary.json and report.md
+    stay identical in shape to a serial run.
+  - jobs <= 1 runs the plan serially in declaration order (legacy behavior).
+"""
+
+from __future__ import annotations
+
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Callable
+
+from _step_result import StepResult
+
+
+@dataclass(frozen=True)
+class PlannedStep:
+    key: str
+    run: Callable[[], StepResult]
+    deps: tuple[str, ...] = ()
+    locks: tuple[str, ...] = ()
+
+
+def _validate_plan(plan: list[PlannedStep]) -> None:
+    seen: set[str] = set()
+    for p in plan:
+        if p.key in seen:
+            raise ValueError(f"duplicate step key in plan: {p.key}")
+        seen.add(p.key)
+    # Deps may only point backwards (declaration order), which also rules out cycles.
+    declared: set[str] = set()
+    for p in plan:
+        for d in p.deps:
+            if d in seen and d not in declared:
+                raise ValueError(f"step {p.key} depends on later step {d}")
+        declared.add(p.key)
+
+
+def run_planned_steps(plan: list[PlannedStep], *, jobs: int = 1) -> list[StepResult]:
+    _validate_plan(plan)
+    if int(jobs) <= 1 or len(plan) <= 1:
+        return [p.run() for p in plan]
+
+    keys = {p.key for p in plan}
+    results: dict[str, StepResult] = {}
+    pending: list[PlannedStep] = list(plan)
+    running: dict[Future[StepResult], PlannedStep] = {}
+    held_locks: set[str] = set()
+
+    def _ready(p: PlannedStep) -> bool:
+        if any(d in keys and d not in results for d in p.deps):
+            return False
+        return not any(lk in held_locks for lk in p.locks)
+
+    with ThreadPoolExecutor(max_workers=int(jobs), thread_name_prefix="sc-step") as pool:
+        while pending or running:
+            # Submit in declaration order so earlier steps win contended locks.
+            for p in list(pending):
+                if len(running) >= int(jobs):
+                    break
+                if not _ready(p):
+                    continue
+                pending.remove(p)
+                held_locks.update(p.locks)
+                running[pool.submit(p.run)] = p
+
+            if not running:
+                # Unreachable with a validated plan; guard against silent hangs.
+                raise RuntimeError(f"step scheduler stalled: {[p.key for p in pending]}")
+
+            done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+            for fut in done:
+                p = running.pop(fut)
+                held_locks.difference_update(p.locks)
+                results[p.key] = fut.result()
+
+    return [results[p.key] for p in plan]
@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""
+Shared, memoized Taskmaster triplet index.
+
+Why:
+  resolve_triplet and many validators each re-read tasks.json/tasks_back.json/
+  tasks_gameplay.json and do a linear scan per lookup. Batch tools that loop over
+  all task ids end up quadratic, and in-process runs (--in-process) re-parse the
+  same files once per step.
+
+What:
+  - load_task_index() parses the three files once and builds id -> task dicts
+    (master by str(id), views by taskmaster_id).
+  - The index is cached per process, keyed by the resolved paths, and reused
+    while every file's (mtime_ns, size) stamp is unchanged.
+  - Across processes, the normalized index is pickled under logs/cache/task-index/,
+    keyed by a sha256 of the three files' bytes (plus paths), so a changed file
+    automatically maps to a new entry. Set SC_TASK_INDEX_CACHE=0 to disable.
+
+Notes:
+  - Lookups keep the legacy semantics: first matching entry wins, master ids are
+    compared as strings, view entries are matched by integer taskmaster_id.
+  - Returned task dicts are shared across callers: treat them as read-only.
+    Scripts that edit and write back task files must keep loading their own copy.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import pickle
+import threading
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+from typing import Any
+
+from _util import repo_root
+
+_Stamp = tuple[tuple[int, int] | None, ...]
+
+_CACHE: dict[tuple[str, str, str], tuple[_Stamp, "TaskIndex"]] = {}
+_CACHE_LOCK = threading.Lock()
+
+DISK_CACHE_VERSION = 1
+DISK_CACHE_KEEP = 8
+
+
+def default_task_paths() -> tuple[Path, Path, Path]:
+    # SC_TASKS_DIR points every tool at another task set (e.g. the synthetic one of llm_bench.py).
+    override = str(os.environ.get("SC_TASKS_DIR") or "").strip()
+    tasks_dir = Path(override).resolve() if override else repo_root() / ".taskmaster" / "tasks"
+    return (
+        tasks_dir / "tasks.json",
+        tasks_dir / "tasks_back.json",
+        tasks_dir / "tasks_gameplay.json",
+    )
+
+
+def _stamp(path: Path) -> tuple[int, int] | None:
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+def _read_bytes(path: Path) -> bytes | None:
+    try:
+        return path.read_bytes()
+    except FileNotFoundError:
+        return None
+
+
+def _decode_json(raw: bytes | None) -> Any:
+    return None if raw is None else json.loads(raw.decode("utf-8"))
+
+
+def _index_view(view: Any) -> tuple[list[dict[str, Any]], dict[Any, dict[str, Any]]]:
+    if not isinstance(view, list):
+        return [], {}
+    entries = [t for t in view if isinstance(t, dict)]
+    by_id: dict[Any, dict[str, Any]] = {}
+    for t in entries:
+        key = t.get("taskmaster_id")
+        if key is None or isinstance(key, (list, dict)):
+            continue
+        by_id.setdefault(key, t)
+    return entries, by_id
+
+
+@dataclass(frozen=True)
+class TaskIndex:
+    tasks_json_path: Path
+    tasks_back_path: Path
+    tasks_gameplay_path: Path
+    tasks_json: dict[str, Any]
+    views_are_lists: bool
+    master_tasks: list[dict[str, Any]] = field(default_factory=list)
+    back_tasks: list[dict[str, Any]] = field(default_factory=list)
+    gameplay_tasks: list[dict[str, Any]] = field(default_factory=list)
+    master_by_id: dict[str, dict[str, Any]] = field(default_factory=dict)
+    back_by_id: dict[Any, dict[str, Any]] = field(default_factory=dict)
+    gameplay_by_id: dict[Any, dict[str, Any]] = field(default_factory=dict)
+
+    def current_task_id(self) -> str:
+        for t in self.master_tasks:
+            if str(t.get("status")) == "in-progress":
+                return str(t.get("id"))
+        raise ValueError("No task with status=in-progress found in tasks.json")
+
+    def master(self, task_id: str | int) -> dict[str, Any] | None:
+        return self.master_by_id.get(str(task_id))
+
+    def require_master(self, task_id: str | int) -> dict[str, Any]:
+        t = self.master(task_id)
+        if t is None:
+            raise KeyError(f"Task id not found in tasks.json: {task_id}")
+        return t
+
+    def back(self, task_id: str | int) -> dict[str, Any] | None:
+        tid = _int_id(task_id)
+        return None if tid is None else self.back_by_id.get(tid)
+
+    def gameplay(self, task_id: str | int) -> dict[str, Any] | None:
+        tid = _int_id(task_id)
+        return None if tid is None else self.gameplay_by_id.get(tid)
+
+    def master_ids(self) -> list[str]:
+        return [str(t.get("id")) for t in self.master_tasks]
+
+    def int_task_ids(self) -> list[int]:
+        out: set[int] = set()
+        for t in self.master_tasks:
+            try:
+                out.add(int(str(t.get("id") or "").strip()))
+            except ValueError:
+                continue
+        return sorted(out)
+
+
+def _int_id(task_id: str | int) -> int | None:
+    try:
+        return int(str(task_id))
+    except ValueError:
+        return None
+
+
+def _build_index(paths: tuple[Path, Path, Path], raws: tuple[bytes | None, bytes | None, bytes | None]) -> TaskIndex:
+    tasks_json_p, back_p, gameplay_p = paths
+    if raws[0] is None:
+        raise FileNotFoundError(f"tasks.json not found: {tasks_json_p}")
+    tasks_json = _decode_json(raws[0])
+    if not isinstance(tasks_json, dict):
+        tasks_json = {}
+    raw_master = (tasks_json.get("master") or {}).get("tasks") or []
+    master_tasks = [t for t in raw_master if isinstance(t, dict)] if isinstance(raw_master, list) else []
+    master_by_id: dict[str, dict[str, Any]] = {}
+    for t in master_tasks:
+        master_by_id.setdefault(str(t.get("id")), t)
+
+    back_raw = _decode_json(raws[1])
+    gameplay_raw = _decode_json(raws[2])
+    back_tasks, back_by_id = _index_view(back_raw)
+    gameplay_tasks, gameplay_by_id = _index_view(gameplay_raw)
+
+    return TaskIndex(
+        tasks_json_path=tasks_json_p,
+        tasks_back_path=back_p,
+        tasks_gameplay_path=gameplay_p,
+        tasks_json=tasks_json,
+        views_are_lists=isinstance(back_raw, list) and isinstance(gameplay_raw, list),
+        master_tasks=master_tasks,
+        back_tasks=back_tasks,
+        gameplay_tasks=gameplay_tasks,
+        master_by_id=master_by_id,
+        back_by_id=back_by_id,
+        gameplay_by_id=gameplay_by_id,
+    )
+
+
+def disk_cache_dir() -> Path:
+    return repo_root() / "logs" / "cache" / "task-index"
+
+
+def _disk_cache_enabled() -> bool:
+    return str(os.environ.get("SC_TASK_INDEX_CACHE") or "1").strip().lower() not in {"0", "false", "no", "off"}
+
+
+def _content_key(key: tuple[str, str, str], raws: tuple[bytes | None, bytes | None, bytes | None]) -> str:
+    h = hashlib.sha256(f"v{DISK_CACHE_VERSION}\n".encode("utf-8"))
+    for path_s, raw in zip(key, raws):
+        h.update(path_s.encode("utf-8") + b"\0")
+        h.update(b"-" if raw is None else hashlib.sha256(raw).digest())
+    return h.hexdigest()
+
+
+def _load_from_disk(content_key: str) -> TaskIndex | None:
+    p = disk_cache_dir() / f"{content_key}.pickle"
+    try:
+        with p.open("rb") as fh:
+            obj = pickle.load(fh)
+    except Exception:  # noqa: BLE001
+        return None
+    if not isinstance(obj, TaskIndex):
+        return None
+    try:
+        os.utime(p)  # keep recently used entries on prune
+    except OSError:
+        pass
+    return obj
+
+
+def _store_to_disk(content_key: str, index: TaskIndex) -> None:
+    out_dir = disk_cache_dir()
+    try:
+        out_dir.mkdir(parents=True, exist_ok=True)
+        tmp = out_dir / f"{content_key}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with tmp.open("wb") as fh:
+            pickle.dump(index, fh, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, out_dir / f"{content_key}.pickle")
+        entries = sorted(out_dir.glob("*.pickle"), key=lambda x: x.stat().st_mtime, reverse=True)
+        for stale in entries[DISK_CACHE_KEEP:]:
+            stale.unlink(missing_ok=True)
+    except OSError:
+        # Best-effort cache: a read-only checkout must still work.
+        pass
+
+
+def load_task_index(
+    *,
+    tasks_json_path: str | Path | None = None,
+    tasks_back_path: str | Path | None = None,
+    tasks_gameplay_path: str | Path | None = None,
+) -> TaskIndex:
+    default_tasks_json, default_back, default_gameplay = default_task_paths()
+    paths = (
+        Path(tasks_json_path) if tasks_json_path else default_tasks_json,
+        Path(tasks_back_path) if tasks_back_path else default_back,
+        Path(tasks_gameplay_path) if tasks_gameplay_path else default_gameplay,
+    )
+    key = (str(paths[0].resolve()), str(paths[1].resolve()), str(paths[2].resolve()))
+    stamp = tuple(_stamp(p) for p in paths)
+    with _CACHE_LOCK:
+        cached = _CACHE.get(key)
+        if cached and cached[0] == stamp:
+            return cached[1]
+    raws = (_read_bytes(paths[0]), _read_bytes(paths[1]), _read_bytes(paths[2]))
+    use_disk = _disk_cache_enabled()
+    content_key = _content_key(key, raws)
+    index = _load_from_disk(content_key) if use_disk else None
+    if index is not None:
+        index = replace(index, tasks_json_path=paths[0], tasks_back_path=paths[1], tasks_gameplay_path=paths[2])
+    else:
+        index = _build_index(paths, raws)
+        if use_disk:
+            _store_to_disk(content_key, index)
+    with _CACHE_LOCK:
+        _CACHE[key] = (stamp, index)
+    return index
+
+
+def clear_task_index_cache() -> None:
+    with _CACHE_LOCK:
+        _CACHE.clear()
@@ -5,6 +5,7 @@ from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
 
+from _task_index import default_task_paths, load_task_index
 from _util import repo_root
 
 
@@ -37,12 +38,7 @@ def load_json(path: Path) -> Any:
 
 
 def default_paths() -> tuple[Path, Path, Path]:
-    root = repo_root()
-    return (
-        root / ".taskmaster" / "tasks" / "tasks.json",
-        root / ".taskmaster" / "tasks" / "tasks_back.json",
-        root / ".taskmaster" / "tasks" / "tasks_gameplay.json",
-    )
+    return default_task_paths()
 
 
 def iter_master_tasks(tasks_json: dict[str, Any]) -> list[dict[str, Any]]:
@@ -68,19 +64,6 @@ def find_master_task(tasks_json: dict[str, Any], task_id: str) -> dict[str, Any]
     raise KeyError(f"Task id not found in tasks.json: {task_id_s}")
 
 
-def _find_view_task(view_tasks: list[dict[str, Any]], task_id: str) -> dict[str, Any] | None:
-    try:
-        tid_int = int(str(task_id))
-    except ValueError:
-        return None
-    for t in view_tasks:
-        if not isinstance(t, dict):
-            continue
-        if t.get("taskmaster_id") == tid_int:
-            return t
-    return None
-
-
 def resolve_triplet(
     *,
     task_id: str | None = None,
@@ -89,25 +72,15 @@ def resolve_triplet(
     tasks_gameplay_path: str | None = None,
     taskdoc_dir: str = "taskdoc",
 ) -> TaskmasterTriplet:
-    default_tasks_json, default_back, default_gameplay = default_paths()
-    tasks_json_p = Path(tasks_json_path) if tasks_json_path else default_tasks_json
-    tasks_back_p = Path(tasks_back_path) if tasks_back_path else default_back
-    tasks_gameplay_p = Path(tasks_gameplay_path) if tasks_gameplay_path else default_gameplay
-
-    tasks_json = load_json(tasks_json_p)
-    resolved_id = str(task_id) if task_id else resolve_current_task_id(tasks_json)
-    master_task = find_master_task(tasks_json, resolved_id)
-
-    back_task = None
-    gameplay_task = None
-    if tasks_back_p.exists():
-        back_obj = load_json(tasks_back_p)
-        if isinstance(back_obj, list):
-            back_task = _find_view_task(back_obj, resolved_id)
-    if tasks_gameplay_p.exists():
-        gameplay_obj = load_json(tasks_gameplay_p)
-        if isinstance(gameplay_obj, list):
-            gameplay_task = _find_view_task(gameplay_obj, resolved_id)
+    index = load_task_index(
+        tasks_json_path=tasks_json_path,
+        tasks_back_path=tasks_back_path,
+        tasks_gameplay_path=tasks_gameplay_path,
+    )
+    resolved_id = str(task_id) if task_id else index.current_task_id()
+    master_task = index.require_master(resolved_id)
+    back_task = index.back(resolved_id)
+    gameplay_task = index.gameplay(resolved_id)
 
     taskdoc_p = repo_root() / taskdoc_dir / f"{resolved_id}.md"
     taskdoc_path = str(taskdoc_p) if taskdoc_p.exists() else None
@@ -117,8 +90,8 @@ def resolve_triplet(
         master=master_task,
         back=back_task,
         gameplay=gameplay_task,
-        tasks_json_path=str(tasks_json_p),
-        tasks_back_path=str(tasks_back_p),
-        tasks_gameplay_path=str(tasks_gameplay_p),
+        tasks_json_path=str(index.tasks_json_path),
+        tasks_back_path=str(index.tasks_back_path),
+        tasks_gameplay_path=str(index.tasks_gameplay_path),
         taskdoc_path=taskdoc_path,
     )
@@ -0,0 +1,481 @@
+#!/usr/bin/env python3
+"""
+Test-impact selection for `sc-test --changed-since REV`.
+
+Why:
+  sc-test always ran the whole xUnit solution and the whole GdUnit4 hard suite,
+  even for a one-line change, so the local edit/test loop cost minutes.
+
+What:
+  - Impact map (logs/cache/test-impact/map.json), built by
+    `sc-test --build-impact-map`: every xUnit test class runs alone under coverlet
+    (`dotnet test --filter FullyQualifiedName~<class>.`) and every source file
+    with hit lines in its coverage.cobertura.xml maps to that class.
+  - Acceptance refs: a changed file listed in a task's contractRefs, acceptance
+    `Refs:` or test_refs (tasks_back.json / tasks_gameplay.json) selects all test
+    files referenced by that task.
+  - GdUnit4 suites: changed suites run, plus suites whose text references a
+    changed Godot file (res:// path) or a changed C# type by name. Only suites
+    under GDUNIT_HARD_ROOTS (the directories the full gdunit-hard run covers)
+    are candidates, so a selection never runs e.g. tests/UI or Security/Backlog.
+  - select() returns the xUnit classes and GdUnit4 suites to run, or a full run
+    with the reason: no usable map, build/project files changed (*.csproj, *.sln,
+    Directory.Build.*, project.godot, addons/...), a C# source the map has never
+    seen, a Godot runtime file no suite references, or the periodic safety net
+    (no full run of that kind for --full-run-interval-hours).
+
+Notes:
+  - The map is per test class, not per test method: coverlet only reports
+    coverage per test run, and one run per class keeps a rebuild affordable.
+  - Test files that changed always run (new tests are not in the map yet).
+  - A C# file that the map knows but no class covers selects nothing.
+  - Coverage thresholds are only meaningful on full runs; sc-test skips them
+    when it runs a selection.
+"""
+
+from __future__ import annotations
+
+import fnmatch
+import json
+import re
+import shutil
+import tempfile
+import time
+import xml.etree.ElementTree as ET
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Iterable
+
+from _file_discovery import discover_files
+from _task_index import default_task_paths
+from _util import repo_root, resolve_dotnet_exe, run_cmd, write_json
+
+MAP_VERSION = 1
+
+XUNIT_ROOT = "Game.Core.Tests"
+XUNIT_PROJECT = "Game.Core.Tests/Game.Core.Tests.csproj"
+CS_SOURCE_ROOTS = ("Game.Core",)
+GODOT_PROJECT = "Tests.Godot"
+GDUNIT_ROOT = "Tests.Godot/tests"
+# gdunit-hard suite directories, relative to GODOT_PROJECT (run_gdunit.py --add).
+GDUNIT_HARD_ROOTS = ("tests/Scenes", "tests/Adapters/Config", "tests/Security/Hard")
+GODOT_RUNTIME_ROOTS = ("Game.Godot",)
+GODOT_RUNTIME_EXTS = (".gd", ".cs", ".tscn", ".tres", ".gdshader")
+
+# Any change here can affect every test: always fall back to a full run.
+FULL_RUN_PATTERNS = (
+    "*.csproj",
+    "*.sln",
+    "*.props",
+    "*.targets",
+    "Directory.Build.*",
+    "global.json",
+    "nuget.config",
+    "*.runsettings",
+    "project.godot",
+    "export_presets.cfg",
+    "Tests.Godot/addons/*",
+    "addons/*",
+)
+
+_NAMESPACE_RE = re.compile(r"^\s*namespace\s+([\w.]+)", re.MULTILINE)
+_CLASS_RE = re.compile(r"^\s*(?:public|internal)\s+(?:sealed\s+|static\s+|partial\s+|abstract\s+)*class\s+(\w+)", re.MULTILINE)
+_TEST_ATTR_RE = re.compile(r"\[\s*(?:Fact|Theory)\b")
+_CLASS_NAME_RE = re.compile(r"^\s*class_name\s+(\w+)", re.MULTILINE)
+_CS_TYPE_RE = re.compile(r"^\s*(?:public|internal)\s+(?:[\w]+\s+)*(?:class|record|struct|interface|enum)\s+(\w+)", re.MULTILINE)
+_REFS_RE = re.compile(r"Refs\s*:\s*(.+)$", re.IGNORECASE)
+
+
+def cache_dir() -> Path:
+    return repo_root() / "logs" / "cache" / "test-impact"
+
+
+def map_path() -> Path:
+    return cache_dir() / "map.json"
+
+
+def state_path() -> Path:
+    return cache_dir() / "state.json"
+
+
+def _read_json(path: Path) -> dict[str, Any]:
+    try:
+        obj = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    return obj if isinstance(obj, dict) else {}
+
+
+def _read_text(path: Path) -> str:
+    try:
+        return path.read_text(encoding="utf-8", errors="ignore")
+    except OSError:
+        return ""
+
+
+def _matches_any(rel: str, patterns: Iterable[str]) -> bool:
+    name = rel.rsplit("/", 1)[-1]
+    return any(fnmatch.fnmatch(rel, p) or fnmatch.fnmatch(name, p) for p in patterns)
+
+
+def _under(rel: str, roots: Iterable[str]) -> bool:
+    return any(rel == r or rel.startswith(r.rstrip("/") + "/") for r in roots)
+
+
+# ---------------------------------------------------------------------------
+# xUnit classes
+
+
+def test_classes_in(path: Path) -> list[str]:
+    """
+    Fully-qualified names of the classes in a C# test file that contain [Fact]/[Theory] methods.
+    """
+    text = _read_text(path)
+    if not _TEST_ATTR_RE.search(text):
+        return []
+    ns = _NAMESPACE_RE.search(text)
+    prefix = f"{ns.group(1)}." if ns else ""
+    matches = list(_CLASS_RE.finditer(text))
+    out: list[str] = []
+    for i, m in enumerate(matches):
+        end = matches[i + 1].start() if i + 1 < len(matches) else len(text)
+        if _TEST_ATTR_RE.search(text, m.end(), end):
+            out.append(prefix + m.group(1))
+    return out
+
+
+def discover_test_classes() -> dict[str, str]:
+    """
+    {fully-qualified test class: repo-relative test file}.
+    """
+    root = repo_root()
+    out: dict[str, str] = {}
+    for f in discover_files(root / XUNIT_ROOT):
+        if f.suffix == ".cs":
+            for fqn in test_classes_in(f):
+                out[fqn] = f.relative_to(root).as_posix()
+    return out
+
+
+def xunit_filter(classes: Iterable[str]) -> str:
+    # Trailing dot: Foo.BarTests. must not also select Foo.BarTestsExtra.
+    return "|".join(f"FullyQualifiedName~{c}." for c in sorted(set(classes)))
+
+
+def _covered_sources(cobertura: Path, root: Path) -> set[str]:
+    try:
+        xml_root = ET.parse(cobertura).getroot()
+    except (OSError, ET.ParseError):
+        return set()
+    bases = [Path(s.text.strip()) for s in xml_root.iter("source") if s.text and s.text.strip()]
+    out: set[str] = set()
+    for cls in xml_root.iter("class"):
+        filename = str(cls.get("filename") or "").strip()
+        if not filename or not any(int(line.get("hits") or 0) > 0 for line in cls.iter("line")):
+            continue
+        candidates = [Path(filename)] if Path(filename).is_absolute() else [b / filename for b in bases] + [root / filename]
+        for cand in candidates:
+            try:
+                rel = cand.resolve().relative_to(root).as_posix()
+            except ValueError:
+                continue
+            out.add(rel)
+            break
+    return out
+
+
+def build_impact_map(*, configuration: str, log_dir: Path, timeout_sec: int = 600) -> dict[str, Any]:
+    """
+    Runs every xUnit test class alone under coverage and writes map.json. Returns the map.
+    """
+    root = repo_root()
+    dotnet = resolve_dotnet_exe()
+    project = str(root / XUNIT_PROJECT)
+    rc, out = run_cmd([dotnet, "build", project, "-c", configuration], cwd=root, timeout_sec=1_800)
+    (log_dir / "impact-map-build.log").write_text(out, encoding="utf-8")
+    if rc != 0:
+        raise RuntimeError(f"dotnet build failed (rc={rc}); see {log_dir / 'impact-map-build.log'}")
+
+    classes = discover_test_classes()
+    sources: dict[str, set[str]] = {}
+    failed: list[str] = []
+    scratch = Path(tempfile.mkdtemp(prefix="sc-test-impact-"))
+    try:
+        for i, fqn in enumerate(sorted(classes), start=1):
+            results = scratch / f"{i:04d}"
+            cmd = [
+                dotnet,
+                "test",
+                project,
+                "--no-build",
+                "-c",
+                configuration,
+                "--filter",
+                xunit_filter([fqn]),
+                "--collect:XPlat Code Coverage",
+                "--results-directory",
+                str(results),
+            ]
+            rc, _out = run_cmd(cmd, cwd=root, timeout_sec=timeout_sec)
+            covs = sorted(results.rglob("coverage.cobertura.xml")) if results.is_dir() else []
+            if not covs:
+                failed.append(fqn)
+                continue
+            for src in _covered_sources(covs[0], root):
+                sources.setdefault(src, set()).add(fqn)
+            print(f"[sc-test] impact map {i}/{len(classes)} {fqn} rc={rc}")
+    finally:
+        shutil.rmtree(scratch, ignore_errors=True)
+
+    known = [
+        f.relative_to(root).as_posix() for base in CS_SOURCE_ROOTS for f in discover_files(root / base) if f.suffix == ".cs"
+    ]
+    head = run_cmd(["git", "rev-parse", "HEAD"], cwd=root, timeout_sec=30)[1].strip()
+    impact_map = {
+        "version": MAP_VERSION,
+        "built_at": int(time.time()),
+        "head": head,
+        "configuration": configuration,
+        "tests": classes,
+        "sources": {k: sorted(v) for k, v in sorted(sources.items())},
+        "known_sources": sorted(known),
+        "failed_classes": failed,
+    }
+    write_json(map_path(), impact_map)
+    return impact_map
+
+
+def load_impact_map() -> dict[str, Any] | None:
+    obj = _read_json(map_path())
+    if obj.get("version") != MAP_VERSION or not isinstance(obj.get("sources"), dict):
+        return None
+    return obj
+
+
+# ---------------------------------------------------------------------------
+# Acceptance refs and GdUnit4 suites
+
+
+def _norm_ref(raw: str) -> str:
+    return raw.strip().strip("`'\"").replace("\\", "/").lstrip("./")
+
+
+def task_ref_groups() -> list[tuple[set[str], set[str]]]:
+    """
+    Per task in tasks_back/tasks_gameplay: (trigger paths, referenced test files).
+    """
+    _tasks_json, back, gameplay = default_task_paths()
+    groups: list[tuple[set[str], set[str]]] = []
+    for path in (back, gameplay):
+        try:
+            view = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            continue
+        for task in view if isinstance(view, list) else []:
+            if not isinstance(task, dict):
+                continue
+            tests: set[str] = set()
+            for raw in task.get("test_refs") or []:
+                tests.add(_norm_ref(str(raw)))
+            for item in task.get("acceptance") or []:
+                m = _REFS_RE.search(str(item))
+                if m:
+                    tests.update(_norm_ref(r) for r in re.split(r"[,\s]+", m.group(1)) if r.strip())
+            tests = {t for t in tests if t.endswith((".cs", ".gd"))}
+            if not tests:
+                continue
+            triggers = set(tests)
+            triggers.update(_norm_ref(str(r)) for r in task.get("contractRefs") or [] if str(r).strip())
+            groups.append((triggers, tests))
+    return groups
+
+
+def _res_path(rel: str) -> str:
+    if rel.startswith(GODOT_PROJECT + "/"):
+        return "res://" + rel[len(GODOT_PROJECT) + 1 :]
+    return "res://" + rel
+
+
+def gdunit_suites() -> dict[str, str]:
+    """
+    {repo-relative suite path: suite text} for every GdUnit4 suite of the gdunit-hard run (GDUNIT_HARD_ROOTS).
+    """
+    root = repo_root()
+    out: dict[str, str] = {}
+    for rel in GDUNIT_HARD_ROOTS:
+        base = root / GODOT_PROJECT / rel
+        if not base.is_dir():
+            continue
+        for f in discover_files(base):
+            if f.suffix == ".gd" and f.name.startswith("test_"):
+                out[f.relative_to(root).as_posix()] = _read_text(f)
+    return out
+
+
+def _gd_needles(rel: str) -> list[str]:
+    needles = [_res_path(rel)]
+    path = repo_root() / rel
+    text = _read_text(path)
+    if rel.endswith(".gd"):
+        needles += _CLASS_NAME_RE.findall(text)
+    elif rel.endswith(".cs"):
+        needles += [t for t in _CS_TYPE_RE.findall(text) if len(t) > 3]
+    return needles
+
+
+def _referencing_suites(suites: dict[str, str], needles: list[str]) -> set[str]:
+    out: set[str] = set()
+    for suite, text in suites.items():
+        for n in needles:
+            if n.startswith("res://"):
+                if n in text:
+                    out.add(suite)
+                    break
+            elif re.search(rf"\b{re.escape(n)}\b", text):
+                out.add(suite)
+                break
+    return out
+
+
+# ---------------------------------------------------------------------------
+# Selection
+
+
+@dataclass
+class Selection:
+    kind: str  # "xunit" | "gdunit"
+    mode: str = "impacted"  # "impacted" | "full"
+    reason: str = ""
+    tests: set[str] = field(default_factory=set)  # xUnit FQNs or repo-relative suite paths
+    why: dict[str, list[str]] = field(default_factory=dict)  # changed file -> selected tests
+
+    def full(self, reason: str) -> "Selection":
+        if self.mode != "full":
+            self.mode, self.reason = "full", reason
+        return self
+
+    def add(self, changed: str, tests: Iterable[str]) -> None:
+        tests = set(tests)
+        if not tests:
+            return
+        self.tests |= tests
+        self.why.setdefault(changed, [])
+        self.why[changed] = sorted(set(self.why[changed]) | tests)
+
+    def to_dict(self) -> dict[str, Any]:
+        out: dict[str, Any] = {"mode": self.mode}
+        if self.mode == "full":
+            out["reason"] = self.reason
+        else:
+            out["selected"] = sorted(self.tests)
+            out["because"] = self.why
+        return out
+
+
+def last_full_run(kind: str) -> float | None:
+    value = _read_json(state_path()).get(kind)
+    return float(value) if isinstance(value, (int, float)) else None
+
+
+def record_full_run(kind: str, *, now: float | None = None) -> None:
+    state = _read_json(state_path())
+    state[kind] = int(now if now is not None else time.time())
+    write_json(state_path(), state)
+
+
+def _periodic_due(kind: str, interval_hours: float, now: float) -> bool:
+    if interval_hours <= 0:
+        return False
+    last = last_full_run(kind)
+    return last is None or now - last >= interval_hours * 3600
+
+
+def _select_xunit(changed: list[str], groups: list[tuple[set[str], set[str]]], impact_map: dict[str, Any] | None) -> Selection:
+    sel = Selection("xunit")
+    root = repo_root()
+    if impact_map is None:
+        return sel.full("no impact map (build it with --build-impact-map)")
+    sources: dict[str, list[str]] = impact_map.get("sources") or {}
+    known = set(impact_map.get("known_sources") or [])
+    tests_by_file: dict[str, list[str]] = {}
+    for fqn, rel in (impact_map.get("tests") or {}).items():
+        tests_by_file.setdefault(rel, []).append(fqn)
+
+    for rel in changed:
+        if _matches_any(rel, FULL_RUN_PATTERNS):
+            return sel.full(f"build/project file changed: {rel}")
+        if not rel.endswith(".cs"):
+            continue
+        if _under(rel, [XUNIT_ROOT]):
+            sel.add(rel, test_classes_in(root / rel) or tests_by_file.get(rel, []))
+        elif _under(rel, CS_SOURCE_ROOTS):
+            if rel in sources:
+                sel.add(rel, sources[rel])
+            elif rel not in known and (root / rel).exists():
+                return sel.full(f"C# source not in impact map: {rel}")
+        for triggers, tests in groups:
+            if rel in triggers:
+                for t in tests:
+                    if t.endswith(".cs") and _under(t, [XUNIT_ROOT]):
+                        sel.add(rel, test_classes_in(root / t))
+    return sel
+
+
+def _select_gdunit(changed: list[str], groups: list[tuple[set[str], set[str]]]) -> Selection:
+    sel = Selection("gdunit")
+    suites = gdunit_suites()
+    for rel in changed:
+        if _matches_any(rel, FULL_RUN_PATTERNS):
+            return sel.full(f"build/project file changed: {rel}")
+        if _under(rel, [GDUNIT_ROOT]):
+            if rel in suites:
+                sel.add(rel, [rel])
+            elif (
+                rel.endswith(".gd")
+                and not rel.rsplit("/", 1)[-1].startswith("test_")
+                and _under(rel, [f"{GODOT_PROJECT}/{r}" for r in GDUNIT_HARD_ROOTS])
+            ):
+                return sel.full(f"GdUnit4 helper changed: {rel}")
+            continue  # suites outside the hard roots are not part of gdunit-hard
+        if _under(rel, GODOT_RUNTIME_ROOTS) and rel.endswith(GODOT_RUNTIME_EXTS):
+            hits = _referencing_suites(suites, _gd_needles(rel)) if (repo_root() / rel).exists() else set()
+            if not hits:
+                return sel.full(f"Godot runtime file not referenced by any suite: {rel}")
+            sel.add(rel, hits)
+        elif _under(rel, CS_SOURCE_ROOTS) and rel.endswith(".cs") and (repo_root() / rel).exists():
+            sel.add(rel, _referencing_suites(suites, _gd_needles(rel)))
+        for triggers, tests in groups:
+            if rel in triggers:
+                sel.add(rel, [t for t in tests if t in suites])
+    return sel
+
+
+def select_tests(
+    changed: list[str],
+    *,
+    kinds: Iterable[str],
+    full_run_interval_hours: float = 24.0,
+    now: float | None = None,
+) -> dict[str, Selection]:
+    """
+    changed: repo-relative posix paths (changed_files()). kinds: subset of {"xunit", "gdunit"}.
+    """
+    now = now if now is not None else time.time()
+    groups = task_ref_groups()
+    out: dict[str, Selection] = {}
+    for kind in kinds:
+        if kind == "xunit":
+            sel = _select_xunit(changed, groups, load_impact_map())
+        else:
+            sel = _select_gdunit(changed, groups)
+        if sel.mode != "full" and _periodic_due(kind, full_run_interval_hours, now):
+            sel.full(f"periodic full run (none in the last {full_run_interval_hours:g}h)")
+        out[kind] = sel
+    return out
+
+
+def gdunit_add_paths(suites: Iterable[str]) -> list[str]:
+    """
+    Suite paths relative to the Godot test project, as run_gdunit.py --add expects.
+    """
+    return [s[len(GODOT_PROJECT) + 1 :] for s in sorted(suites) if s.startswith(GODOT_PROJECT + "/")]
@@ -0,0 +1,367 @@
+#!/usr/bin/env python3
+"""
+Historical per-test timing store (SQLite) fed by sc-test artifacts.
+
+Why:
+  run_dotnet.py keeps tests.trx and run_gdunit.py keeps JUnit results.xml per day,
+  but nothing aggregated durations across runs, so slow or slowly degrading xUnit
+  tests and GdUnit4 suites went unnoticed, and shard balancing only knew the last
+  run's suite times.
+
+What:
+  - logs/cache/test-timings.sqlite3: one row per ingested artifact (runs), per
+    test case (results) and per suite (suites). Re-ingesting the same artifact
+    is a no-op (keyed on path + mtime + size).
+  - parse_trx / parse_junit read the artifacts (xUnit suite = test class,
+    GdUnit4 suite = "res://<dir>/<file>.gd", rebuilt from the JUnit package +
+    name by _junit.suite_res_path); ingest_path stores one, by extension.
+  - slowest(), trend() and regressions() back scripts/sc/test_timings.py.
+  - suite_durations() (median of recent runs) feeds run_gdunit.py shard
+    balancing; order_suites() puts recently failing suites first, then the
+    fastest, for fail-fast ordering of selected suites in sc-test.
+
+Notes:
+  - regressions() compares the median of the last `recent` runs of each test with
+    the `baseline` runs before them using a robust z-score (median / MAD), so a
+    single noisy baseline run does not hide or fake a slowdown.
+  - The store is a cache: deleting it only loses history.
+"""
+
+from __future__ import annotations
+
+import os
+import sqlite3
+import statistics
+import time
+import xml.etree.ElementTree as ET
+from contextlib import closing
+from pathlib import Path
+from typing import Any, Iterable
+
+from _junit import suite_res_path
+from _util import repo_root
+
+KINDS = ("xunit", "gdunit")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    source TEXT UNIQUE NOT NULL,
+    path TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    run_id TEXT,
+    started_at REAL NOT NULL,
+    ingested_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS results (
+    run INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    suite TEXT NOT NULL,
+    test TEXT NOT NULL,
+    duration_ms REAL NOT NULL,
+    outcome TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS suites (
+    run INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    suite TEXT NOT NULL,
+    duration_ms REAL NOT NULL,
+    failed INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS results_test ON results(suite, test);
+CREATE INDEX IF NOT EXISTS suites_suite ON suites(suite);
+CREATE INDEX IF NOT EXISTS runs_kind ON runs(kind, started_at);
+"""
+
+_FAILED = {"failed", "error", "timeout", "aborted"}
+
+
+def db_path() -> Path:
+    return repo_root() / "logs" / "cache" / "test-timings.sqlite3"
+
+
+def connect(path: Path | None = None) -> sqlite3.Connection:
+    path = path or db_path()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(str(path), timeout=30)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA foreign_keys=ON")
+    conn.executescript(_SCHEMA)
+    return conn
+
+
+def _local(tag: str) -> str:
+    return tag.rsplit("}", 1)[-1]
+
+
+def _trx_duration_ms(raw: str) -> float:
+    # hh:mm:ss.fffffff
+    try:
+        h, m, s = raw.split(":")
+        return (int(h) * 3600 + int(m) * 60 + float(s)) * 1000.0
+    except ValueError:
+        return 0.0
+
+
+def parse_trx(path: Path) -> list[tuple[str, str, float, str]]:
+    """
+    (test class, test name, duration ms, outcome) per UnitTestResult.
+    """
+    root = ET.parse(path).getroot()
+    classes: dict[str, str] = {}
+    for el in root.iter():
+        if _local(el.tag) == "UnitTest":
+            for child in el:
+                if _local(child.tag) == "TestMethod":
+                    classes[str(el.get("id") or "")] = str(child.get("className") or "").split(",")[0].strip()
+    out: list[tuple[str, str, float, str]] = []
+    for el in root.iter():
+        if _local(el.tag) != "UnitTestResult":
+            continue
+        name = str(el.get("testName") or "")
+        cls = classes.get(str(el.get("testId") or ""), "")
+        if cls and name.startswith(cls + "."):
+            name = name[len(cls) + 1 :]
+        out.append((cls or "?", name, _trx_duration_ms(str(el.get("duration") or "")), str(el.get("outcome") or "").lower()))
+    return out
+
+
+def parse_junit(path: Path) -> list[tuple[str, str, float, str]]:
+    """
+    (suite, test name, duration ms, outcome) per testcase; suite is the res:// suite file path.
+    """
+    root = ET.parse(path).getroot()
+    out: list[tuple[str, str, float, str]] = []
+    for suite in root.iter("testsuite"):
+        # package is only the suite directory: sibling suites share it.
+        suite_name = suite_res_path(suite) or "?"
+        for case in suite.iter("testcase"):
+            tags = {_local(c.tag) for c in case}
+            outcome = "failed" if tags & {"failure", "error"} else ("skipped" if "skipped" in tags else "passed")
+            try:
+                ms = float(case.get("time") or 0) * 1000.0
+            except ValueError:
+                ms = 0.0
+            out.append((suite_name, str(case.get("name") or "?"), ms, outcome))
+    return out
+
+
+def _suite_totals(path: Path, kind: str, rows: list[tuple[str, str, float, str]]) -> dict[str, tuple[float, bool]]:
+    totals: dict[str, tuple[float, bool]] = {}
+    for suite, _name, ms, outcome in rows:
+        cur = totals.get(suite, (0.0, False))
+        totals[suite] = (cur[0] + ms, cur[1] or outcome in _FAILED)
+    if kind == "gdunit":
+        # The suite's own time includes before()/after() hooks; prefer it over the sum of cases.
+        for suite in ET.parse(path).getroot().iter("testsuite"):
+            name = suite_res_path(suite) or "?"
+            try:
+                if name in totals and suite.get("time") is not None:
+                    totals[name] = (float(suite.get("time") or 0) * 1000.0, totals[name][1])
+            except ValueError:
+                continue
+    return totals
+
+
+def ingest(conn: sqlite3.Connection, path: Path, *, kind: str, run_id: str | None = None) -> int:
+    """
+    Stores one artifact. Returns the number of test rows added (0 when already ingested or unreadable).
+    """
+    path = path.resolve()
+    try:
+        st = path.stat()
+        rows = parse_trx(path) if kind == "xunit" else parse_junit(path)
+        totals = _suite_totals(path, kind, rows)
+    except (OSError, ET.ParseError):
+        return 0
+    source = f"{path}:{st.st_mtime_ns}:{st.st_size}"
+    with conn:
+        cur = conn.execute(
+            "INSERT OR IGNORE INTO runs(source, path, kind, run_id, started_at, ingested_at) VALUES (?, ?, ?, ?, ?, ?)",
+            (source, str(path), kind, run_id, st.st_mtime, time.time()),
+        )
+        if cur.rowcount == 0:
+            return 0
+        run = cur.lastrowid
+        conn.executemany(
+            "INSERT INTO results(run, suite, test, duration_ms, outcome) VALUES (?, ?, ?, ?, ?)",
+            [(run, suite, name, ms, outcome) for suite, name, ms, outcome in rows],
+        )
+        conn.executemany(
+            "INSERT INTO suites(run, suite, duration_ms, failed) VALUES (?, ?, ?, ?)",
+            [(run, suite, ms, int(failed)) for suite, (ms, failed) in totals.items()],
+        )
+    return len(rows)
+
+
+def ingest_path(conn: sqlite3.Connection, path: Path, *, run_id: str | None = None) -> int:
+    kind = "xunit" if path.suffix.lower() == ".trx" else "gdunit"
+    return ingest(conn, path, kind=kind, run_id=run_id)
+
+
+def discover_artifacts(root: Path | None = None) -> list[Path]:
+    """
+    Every tests.trx under logs/unit and results.xml under logs/e2e, oldest first (for backfill).
+    """
+    root = root or repo_root()
+    found: list[Path] = []
+    for cur, _dirs, names in os.walk(root / "logs" / "unit"):
+        found.extend(Path(cur) / n for n in names if n.lower().endswith(".trx"))
+    for cur, _dirs, names in os.walk(root / "logs" / "e2e"):
+        found.extend(Path(cur) / n for n in names if n == "results.xml")
+    return sorted(found, key=lambda p: p.stat().st_mtime)
+
+
+def _recent_run_ids(conn: sqlite3.Connection, kind: str, runs: int) -> list[int]:
+    return [
+        r[0]
+        for r in conn.execute("SELECT id FROM runs WHERE kind = ? ORDER BY started_at DESC, id DESC LIMIT ?", (kind, runs))
+    ]
+
+
+def _in(ids: Iterable[int]) -> str:
+    return ",".join(str(int(i)) for i in ids) or "NULL"
+
+
+def slowest(conn: sqlite3.Connection, *, kind: str, runs: int = 10, limit: int = 20) -> list[dict[str, Any]]:
+    """
+    Tests by median duration over the last `runs` runs of kind.
+    """
+    ids = _recent_run_ids(conn, kind, runs)
+    samples: dict[tuple[str, str], list[float]] = {}
+    for suite, test, ms in conn.execute(f"SELECT suite, test, duration_ms FROM results WHERE run IN ({_in(ids)})"):
+        samples.setdefault((suite, test), []).append(ms)
+    rows = [
+        {
+            "suite": suite,
+            "test": test,
+            "median_ms": round(statistics.median(v), 1),
+            "max_ms": round(max(v), 1),
+            "samples": len(v),
+        }
+        for (suite, test), v in samples.items()
+    ]
+    return sorted(rows, key=lambda r: -r["median_ms"])[:limit]
+
+
+def trend(conn: sqlite3.Connection, *, pattern: str, kind: str | None = None, runs: int = 30) -> list[dict[str, Any]]:
+    """
+    Duration history (oldest first) of tests whose "suite.test" contains pattern.
+    """
+    kinds = [kind] if kind else list(KINDS)
+    ids = [i for k in kinds for i in _recent_run_ids(conn, k, runs)]
+    like = f"%{pattern}%"
+    history: dict[tuple[str, str], list[dict[str, Any]]] = {}
+    for suite, test, ms, outcome, started_at, run_id in conn.execute(
+        "SELECT r.suite, r.test, r.duration_ms, r.outcome, runs.started_at, runs.run_id "
+        f"FROM results r JOIN runs ON runs.id = r.run WHERE r.run IN ({_in(ids)}) "
+        "AND (r.suite || '.' || r.test) LIKE ? ORDER BY runs.started_at",
+        (like,),
+    ):
+        history.setdefault((suite, test), []).append(
+            {"at": int(started_at), "run_id": run_id, "ms": round(ms, 1), "outcome": outcome}
+        )
+    return [{"suite": s, "test": t, "points": pts} for (s, t), pts in sorted(history.items())]
+
+
+def regressions(
+    conn: sqlite3.Connection,
+    *,
+    kind: str,
+    recent: int = 3,
+    baseline: int = 20,
+    min_z: float = 3.0,
+    min_ratio: float = 1.2,
+    min_delta_ms: float = 5.0,
+    min_baseline_samples: int = 5,
+) -> list[dict[str, Any]]:
+    """
+    Tests whose median over the last `recent` runs is significantly above the median of the `baseline` runs before.
+    """
+    ids = _recent_run_ids(conn, kind, recent + baseline)
+    recent_ids, base_ids = set(ids[:recent]), set(ids[recent:])
+    if not recent_ids or not base_ids:
+        return []
+    now: dict[tuple[str, str], list[float]] = {}
+    base: dict[tuple[str, str], list[float]] = {}
+    for run, suite, test, ms, outcome in conn.execute(
+        f"SELECT run, suite, test, duration_ms, outcome FROM results WHERE run IN ({_in(ids)})"
+    ):
+        if outcome not in {"passed", ""}:
+            continue
+        (now if run in recent_ids else base).setdefault((suite, test), []).append(ms)
+    out: list[dict[str, Any]] = []
+    for key, cur in now.items():
+        ref = base.get(key) or []
+        if len(ref) < min_baseline_samples:
+            continue
+        ref_median = statistics.median(ref)
+        cur_median = statistics.median(cur)
+        mad = statistics.median(abs(x - ref_median) for x in ref)
+        # 1.4826 * MAD estimates sigma; floor at 1ms so perfectly stable tests do not divide by zero.
+        sigma = max(1.4826 * mad, 1.0) / (len(cur) ** 0.5)
+        z = (cur_median - ref_median) / sigma
+        ratio = cur_median / ref_median if ref_median > 0 else float("inf")
+        if z >= min_z and ratio >= min_ratio and cur_median - ref_median >= min_delta_ms:
+            out.append(
+                {
+                    "suite": key[0],
+                    "test": key[1],
+                    "baseline_median_ms": round(ref_median, 1),
+                    "recent_median_ms": round(cur_median, 1),
+                    "ratio": round(ratio, 2),
+                    "z": round(z, 1),
+                    "baseline_samples": len(ref),
+                    "recent_samples": len(cur),
+                }
+            )
+    return sorted(out, key=lambda r: (-r["z"], -r["ratio"]))
+
+
+def suite_durations(conn: sqlite3.Connection, *, kind: str = "gdunit", runs: int = 10) -> dict[str, float]:
+    """
+    {suite: median seconds} over the last `runs` runs of kind.
+    """
+    ids = _recent_run_ids(conn, kind, runs)
+    samples: dict[str, list[float]] = {}
+    for suite, ms in conn.execute(f"SELECT suite, duration_ms FROM suites WHERE run IN ({_in(ids)})"):
+        samples.setdefault(suite, []).append(ms)
+    return {suite: round(statistics.median(v) / 1000.0, 3) for suite, v in samples.items()}
+
+
+def order_suites(conn: sqlite3.Connection, suites: Iterable[str], *, kind: str = "gdunit", runs: int = 10) -> list[str]:
+    """
+    Fail-fast order: suites that failed in the last `runs` runs first, then by median duration (unknown last).
+    """
+    ids = _recent_run_ids(conn, kind, runs)
+    failed = {
+        r[0] for r in conn.execute(f"SELECT DISTINCT suite FROM suites WHERE failed = 1 AND run IN ({_in(ids)})")
+    }
+    durations = suite_durations(conn, kind=kind, runs=runs)
+    return sorted(suites, key=lambda s: (s not in failed, s not in durations, durations.get(s, 0.0), s))
+
+
+def open_existing() -> sqlite3.Connection | None:
+    """
+    Connection to the store, or None when nothing was ingested yet (readers must not create it).
+    """
+    path = db_path()
+    if not path.is_file():
+        return None
+    try:
+        return connect(path)
+    except sqlite3.Error:
+        return None
+
+
+def ingest_quietly(paths: Iterable[Path], *, run_id: str | None = None) -> int:
+    """
+    Best-effort ingestion for test runners: a broken store must never fail the test run.
+    """
+    added = 0
+    try:
+        with closing(connect()) as conn:
+            for p in paths:
+                if p.is_file():
+                    added += ingest_path(conn, p, run_id=run_id)
+    except sqlite3.Error as e:
+        print(f"[test-timings] WARN: ingestion skipped: {e}")
+    return added
@@ -8,6 +8,9 @@ import subprocess
 from pathlib import Path
 from typing import Any, Iterable, Sequence
 
+from _artifact_index import ci_root, record_artifact
+from _file_discovery import discover_files
+
 
 def repo_root() -> Path:
     # scripts/sc/_util.py -> scripts/sc -> scripts -> repo root
@@ -23,8 +26,7 @@ def ensure_dir(path: Path) -> None:
 
 
 def ci_dir(name: str) -> Path:
-    root = repo_root()
-    out_dir = root / "logs" / "ci" / today_str() / name
+    out_dir = ci_root() / today_str() / name
     ensure_dir(out_dir)
     return out_dir
 
@@ -32,11 +34,16 @@ def ci_dir(name: str) -> Path:
 def write_text(path: Path, content: str) -> None:
     ensure_dir(path.parent)
     path.write_text(content, encoding="utf-8")
+    record_artifact(path)
 
 
 def write_json(path: Path, payload: Any) -> None:
     ensure_dir(path.parent)
     path.write_text(json.dumps(payload, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+    if isinstance(payload, dict):
+        record_artifact(path, task_id=payload.get("task_id"), status=payload.get("status"))
+    else:
+        record_artifact(path)
 
 
 def run_cmd(
@@ -111,15 +118,12 @@ def iter_files(
     skip_dirs: set[str],
     max_bytes: int = 512 * 1024,
 ) -> Iterable[Path]:
-    for cur_root, dirs, files in os.walk(root):
-        dirs[:] = [d for d in dirs if d not in skip_dirs]
-        for name in files:
-            p = Path(cur_root) / name
-            if p.suffix.lower() not in include_exts:
-                continue
-            try:
-                if p.stat().st_size > max_bytes:
-                    continue
-            except OSError:
+    for p in discover_files(root, skip_dirs=skip_dirs):
+        if p.suffix.lower() not in include_exts:
+            continue
+        try:
+            if p.stat().st_size > max_bytes:
                 continue
-            yield p
+        except OSError:
+            continue
+        yield p
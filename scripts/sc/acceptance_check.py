@@ -11,9 +11,10 @@ import argparse
 import os
 import uuid
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable
 
 from _acceptance_report import write_markdown_report
+from _acceptance_step_inputs import acceptance_step_inputs
 from _acceptance_steps import (
     StepResult,
     step_acceptance_anchors_validate,
@@ -41,7 +42,10 @@ from _acceptance_steps import (
     step_ui_event_security,
     task_requires_headless_e2e,
 )
+from _inprocess import enable_in_process
 from _risk_summary import write_risk_summary
+from _step_cache import cached_step
+from _step_scheduler import PlannedStep, run_planned_steps
 from _taskmaster import resolve_triplet
 from _unit_metrics import collect_unit_metrics
 from _util import ci_dir, repo_root, today_str, write_json, write_text
@@ -76,8 +80,20 @@ def main() -> int:
     ap.add_argument("--require-headless-e2e", action="store_true", help="fail when acceptance refs include .gd but this run does not produce headless artifacts")
     ap.add_argument("--subtasks-coverage", default="skip", choices=["skip", "warn", "require"])
     ap.add_argument("--subtasks-timeout-sec", type=int, default=600, help="Timeout for subtasks coverage LLM gate.")
+    ap.add_argument("--jobs", type=int, default=1, help="Max concurrent independent steps (dependency-ordered). Default: 1 (serial).")
+    ap.add_argument("--in-process", action="store_true", help="Run python validator steps in this interpreter (import + main()) instead of spawning py -3 per step.")
+    ap.add_argument("--no-cache", action="store_true", help="Re-run every step; ignore results cached under logs/cache/acceptance-steps for unchanged inputs.")
+    ap.add_argument(
+        "--changed-since",
+        default=None,
+        metavar="REV",
+        help="File-level gates (arch, rules, security) scan only files changed since REV; repo-wide invariants re-run only when their inputs changed.",
+    )
     ap.add_argument("--only", default=None, help="Comma-separated step filter (adr,links,subtasks,overlay,contracts,arch,build,security,quality,rules,tests,perf,risk). Default: all.")
     args = ap.parse_args()
+    if args.in_process:
+        enable_in_process()
+    changed_since = str(args.changed_since or "").strip() or None
 
     task_id = _parse_task_id(args.task_id)
     try:
@@ -92,7 +108,7 @@ def main() -> int:
     def enabled(key: str) -> bool:
         return True if only is None else (key in only)
 
-    steps: list[StepResult] = []
+    plan: list[PlannedStep] = []
     has_gd_refs = task_requires_headless_e2e(triplet)
     needs_headless = bool(args.require_headless_e2e) and has_gd_refs
     require_executed = bool(args.require_executed_refs)
@@ -102,82 +118,201 @@ def main() -> int:
     run_id = uuid.uuid4().hex
     write_text(out_dir / "run_id.txt", run_id + "\n")
 
+    def static(result: StepResult) -> PlannedStep:
+        return PlannedStep(result.name, lambda: result)
+
+    def cached(key: str, run: Callable[[], StepResult], **params: Any) -> Callable[[], StepResult]:
+        # Reuse the last ok result of deterministic steps whose declared inputs are unchanged.
+        # Diff-scoped results depend on the base ref, not just file contents: never cache them.
+        inputs = acceptance_step_inputs(key, **params)
+        if args.no_cache or inputs is None or params.get("changed_since"):
+            return run
+        return cached_step(key, inputs, out_dir, run)
+
+    # Locks guard shared outputs: sc-analyze re-runs validate_contracts/check_encoding which write
+    # fixed paths under logs/ci/<date>/, and dotnet build/test share obj/ + bin/.
     if enabled("adr"):
-        steps.append(step_adr_compliance(out_dir, triplet, strict_status=bool(args.strict_adr_status)))
+        plan.append(PlannedStep("adr-compliance", lambda: step_adr_compliance(out_dir, triplet, strict_status=bool(args.strict_adr_status))))
     if enabled("links"):
-        steps.append(step_sc_analyze_task_context(out_dir, task_id=str(triplet.task_id), mode=ctx_mode))
-        steps.append(step_task_context_required_fields(out_dir, task_id=str(triplet.task_id), mode=ctx_mode, stage="refactor"))
-        steps.append(step_sc_internal_imports(out_dir))
-        steps.append(step_task_links_validate(out_dir))
-        steps.append(step_task_test_refs_validate(out_dir, task_id=str(triplet.task_id), require_non_empty=bool(args.require_task_test_refs)))
-        steps.append(step_acceptance_refs_validate(out_dir, task_id=str(triplet.task_id)))
-        steps.append(step_acceptance_anchors_validate(out_dir, task_id=str(triplet.task_id)))
+        plan.append(
+            PlannedStep(
+                "sc-analyze",
+                lambda: step_sc_analyze_task_context(out_dir, task_id=str(triplet.task_id), mode=ctx_mode),
+                locks=("contracts-report", "encoding-report"),
+            )
+        )
+        plan.append(
+            PlannedStep(
+                "task-context-required",
+                lambda: step_task_context_required_fields(out_dir, task_id=str(triplet.task_id), mode=ctx_mode, stage="refactor"),
+                deps=("sc-analyze",),
+            )
+        )
+        plan.append(PlannedStep("sc-internal-imports", cached("sc-internal-imports", lambda: step_sc_internal_imports(out_dir))))
+        plan.append(PlannedStep("task-links-validate", cached("task-links-validate", lambda: step_task_links_validate(out_dir))))
+        plan.append(
+            PlannedStep(
+                "task-test-refs-validate",
+                cached(
+                    "task-test-refs-validate",
+                    lambda: step_task_test_refs_validate(out_dir, task_id=str(triplet.task_id), require_non_empty=bool(args.require_task_test_refs)),
+                    task_id=str(triplet.task_id),
+                    require_non_empty=bool(args.require_task_test_refs),
+                ),
+            )
+        )
+        plan.append(
+            PlannedStep(
+                "acceptance-refs-validate",
+                cached("acceptance-refs-validate", lambda: step_acceptance_refs_validate(out_dir, task_id=str(triplet.task_id)), task_id=str(triplet.task_id)),
+            )
+        )
+        plan.append(
+            PlannedStep(
+                "acceptance-anchors-validate",
+                cached("acceptance-anchors-validate", lambda: step_acceptance_anchors_validate(out_dir, task_id=str(triplet.task_id)), task_id=str(triplet.task_id)),
+            )
+        )
     elif ctx_mode in ("warn", "require"):
-        steps.append(
-            StepResult(
-                name="task-context-required",
-                status="fail" if ctx_mode == "require" else "skipped",
-                rc=1 if ctx_mode == "require" else 0,
-                details={"error": "links_step_disabled", "hint": "include 'links' in --only (or omit --only) when using --task-context-required warn|require"},
+        plan.append(
+            static(
+                StepResult(
+                    name="task-context-required",
+                    status="fail" if ctx_mode == "require" else "skipped",
+                    rc=1 if ctx_mode == "require" else 0,
+                    details={"error": "links_step_disabled", "hint": "include 'links' in --only (or omit --only) when using --task-context-required warn|require"},
+                )
             )
         )
     if enabled("subtasks"):
         if subtasks_mode == "skip":
-            steps.append(StepResult(name="subtasks-coverage", status="skipped", rc=0, details={"reason": "subtasks_coverage_skip"}))
+            plan.append(static(StepResult(name="subtasks-coverage", status="skipped", rc=0, details={"reason": "subtasks_coverage_skip"})))
         else:
-            steps.append(step_subtasks_coverage_llm(out_dir, triplet, timeout_sec=int(args.subtasks_timeout_sec)))
+            plan.append(PlannedStep("subtasks-coverage", lambda: step_subtasks_coverage_llm(out_dir, triplet, timeout_sec=int(args.subtasks_timeout_sec))))
     elif subtasks_mode in ("warn", "require"):
-        steps.append(
-            StepResult(
-                name="subtasks-coverage",
-                status="fail" if subtasks_mode == "require" else "skipped",
-                rc=1 if subtasks_mode == "require" else 0,
-                details={"error": "subtasks_step_disabled", "hint": "include 'subtasks' in --only (or omit --only) when using --subtasks-coverage warn|require"},
+        plan.append(
+            static(
+                StepResult(
+                    name="subtasks-coverage",
+                    status="fail" if subtasks_mode == "require" else "skipped",
+                    rc=1 if subtasks_mode == "require" else 0,
+                    details={"error": "subtasks_step_disabled", "hint": "include 'subtasks' in --only (or omit --only) when using --subtasks-coverage warn|require"},
+                )
             )
         )
     if enabled("overlay"):
-        steps.append(step_overlay_validate(out_dir))
+        plan.append(PlannedStep("validate-task-overlays", cached("validate-task-overlays", lambda: step_overlay_validate(out_dir))))
     if enabled("contracts"):
-        steps.append(step_contracts_validate(out_dir))
+        plan.append(
+            PlannedStep(
+                "contracts-validate",
+                cached("contracts-validate", lambda: step_contracts_validate(out_dir, changed_since=changed_since), changed_since=changed_since),
+                locks=("contracts-report",),
+            )
+        )
     if enabled("arch"):
-        steps.append(step_architecture_boundary(out_dir))
+        plan.append(
+            PlannedStep(
+                "architecture-boundary",
+                cached("architecture-boundary", lambda: step_architecture_boundary(out_dir, changed_since=changed_since), changed_since=changed_since),
+            )
+        )
     if enabled("build"):
-        steps.append(step_build_warnaserror(out_dir))
+        plan.append(
+            PlannedStep(
+                "dotnet-build-warnaserror",
+                cached("dotnet-build-warnaserror", lambda: step_build_warnaserror(out_dir), target="Rouge.csproj"),
+                locks=("dotnet",),
+            )
+        )
     if enabled("quality"):
-        steps.append(step_test_quality_soft(out_dir, triplet, strict=bool(args.strict_test_quality)))
+        plan.append(PlannedStep("test-quality", lambda: step_test_quality_soft(out_dir, triplet, strict=bool(args.strict_test_quality))))
     if enabled("rules"):
-        steps.append(step_quality_rules(out_dir, strict=bool(args.strict_quality_rules)))
+        plan.append(
+            PlannedStep(
+                "quality-rules",
+                cached(
+                    "quality-rules",
+                    lambda: step_quality_rules(out_dir, strict=bool(args.strict_quality_rules), changed_since=changed_since),
+                    strict=bool(args.strict_quality_rules),
+                    changed_since=changed_since,
+                ),
+            )
+        )
     if enabled("security"):
-        steps.append(step_security_hard(out_dir, path_mode=str(args.security_path_gate), sql_mode=str(args.security_sql_gate), audit_schema_mode=str(args.security_audit_schema_gate)))
-        steps.append(step_ui_event_security(out_dir, json_guards_mode=str(args.ui_event_json_guards), source_verify_mode=str(args.ui_event_source_verify)))
-        steps.append(step_security_soft(out_dir))
+        plan.append(
+            PlannedStep(
+                "security-hard",
+                cached(
+                    "security-hard",
+                    lambda: step_security_hard(
+                        out_dir,
+                        path_mode=str(args.security_path_gate),
+                        sql_mode=str(args.security_sql_gate),
+                        audit_schema_mode=str(args.security_audit_schema_gate),
+                        changed_since=changed_since,
+                    ),
+                    path_mode=str(args.security_path_gate),
+                    sql_mode=str(args.security_sql_gate),
+                    audit_schema_mode=str(args.security_audit_schema_gate),
+                    changed_since=changed_since,
+                ),
+            )
+        )
+        plan.append(
+            PlannedStep(
+                "ui-event-security",
+                cached(
+                    "ui-event-security",
+                    lambda: step_ui_event_security(out_dir, json_guards_mode=str(args.ui_event_json_guards), source_verify_mode=str(args.ui_event_source_verify)),
+                    json_guards_mode=str(args.ui_event_json_guards),
+                    source_verify_mode=str(args.ui_event_source_verify),
+                ),
+            )
+        )
+        plan.append(PlannedStep("security-soft", lambda: step_security_soft(out_dir, changed_since=changed_since), locks=("encoding-report",)))
 
     godot_bin = args.godot_bin or os.environ.get("GODOT_BIN")
     if enabled("tests"):
         test_type = "all" if has_gd_refs else "unit"
         if test_type != "unit" and not godot_bin:
-            steps.append(StepResult(name="tests-all", status="fail", rc=2, details={"error": "missing_godot_bin", "hint": "set --godot-bin or env GODOT_BIN"}))
+            plan.append(static(StepResult(name="tests-all", status="fail", rc=2, details={"error": "missing_godot_bin", "hint": "set --godot-bin or env GODOT_BIN"})))
         else:
-            steps.append(step_tests_all(out_dir, godot_bin, run_id=run_id, test_type=test_type))
+            plan.append(PlannedStep("tests-all", lambda: step_tests_all(out_dir, godot_bin, run_id=run_id, test_type=test_type), locks=("dotnet",)))
             if needs_headless:
-                steps.append(step_headless_e2e_evidence(out_dir, expected_run_id=run_id))
+                plan.append(PlannedStep("headless-e2e-evidence", lambda: step_headless_e2e_evidence(out_dir, expected_run_id=run_id), deps=("tests-all",)))
             if require_executed:
-                steps.append(step_acceptance_execution_evidence(out_dir, task_id=str(triplet.task_id), run_id=run_id))
-            steps.append(step_security_audit_evidence(out_dir, expected_run_id=run_id, mode=audit_mode))
+                plan.append(
+                    PlannedStep(
+                        "acceptance-executed-evidence",
+                        lambda: step_acceptance_execution_evidence(out_dir, task_id=str(triplet.task_id), run_id=run_id),
+                        deps=("tests-all",),
+                    )
+                )
+            plan.append(
+                PlannedStep(
+                    "security-audit-executed-evidence",
+                    lambda: step_security_audit_evidence(out_dir, expected_run_id=run_id, mode=audit_mode),
+                    deps=("tests-all",),
+                )
+            )
     elif needs_headless:
-        steps.append(StepResult(name="headless-e2e-evidence", status="fail", rc=1, details={"error": "tests_step_disabled", "hint": "include 'tests' in --only (or omit --only) when using --require-headless-e2e"}))
+        plan.append(static(StepResult(name="headless-e2e-evidence", status="fail", rc=1, details={"error": "tests_step_disabled", "hint": "include 'tests' in --only (or omit --only) when using --require-headless-e2e"})))
     elif require_executed:
-        steps.append(StepResult(name="acceptance-executed-evidence", status="fail", rc=1, details={"error": "tests_step_disabled", "hint": "include 'tests' in --only (or omit --only) when using --require-executed-refs"}))
+        plan.append(static(StepResult(name="acceptance-executed-evidence", status="fail", rc=1, details={"error": "tests_step_disabled", "hint": "include 'tests' in --only (or omit --only) when using --require-executed-refs"})))
     elif audit_mode == "require":
-        steps.append(StepResult(name="security-audit-executed-evidence", status="fail", rc=1, details={"error": "tests_step_disabled", "hint": "include 'tests' in --only (or omit --only) when using --security-audit-evidence require"}))
+        plan.append(static(StepResult(name="security-audit-executed-evidence", status="fail", rc=1, details={"error": "tests_step_disabled", "hint": "include 'tests' in --only (or omit --only) when using --security-audit-evidence require"})))
     elif audit_mode == "warn":
-        steps.append(StepResult(name="security-audit-executed-evidence", status="ok", rc=0, details={"mode": "warn", "reason": "tests_step_disabled"}))
+        plan.append(static(StepResult(name="security-audit-executed-evidence", status="ok", rc=0, details={"mode": "warn", "reason": "tests_step_disabled"})))
 
     env_v = os.environ.get("PERF_P95_THRESHOLD_MS")
     env_p95 = int(env_v) if (env_v and env_v.isdigit()) else None
     perf_p95_ms = max(0, int(args.perf_p95_ms)) if args.perf_p95_ms is not None else (env_p95 if env_p95 is not None else (20 if args.require_perf else 0))
     if enabled("perf"):
-        steps.append(step_perf_budget(out_dir, max_p95_ms=perf_p95_ms))
+        # The smoke run inside tests-all produces the headless.log this step parses.
+        plan.append(PlannedStep("perf-budget", lambda: step_perf_budget(out_dir, max_p95_ms=perf_p95_ms), deps=("tests-all",)))
+
+    steps: list[StepResult] = run_planned_steps(plan, jobs=max(1, int(args.jobs)))
 
     hard_failed = False
     for s in steps:
@@ -222,6 +357,10 @@ def main() -> int:
         "task_id": triplet.task_id,
         "title": triplet.master.get("title"),
         "only": args.only,
+        "jobs": max(1, int(args.jobs)),
+        "in_process": bool(args.in_process),
+        "cache": not bool(args.no_cache),
+        "changed_since": changed_since,
         "status": "fail" if hard_failed else "ok",
         "steps": [s.__dict__ for s in steps],
         "out_dir": str(out_dir),
@@ -18,8 +18,11 @@ import re
 from pathlib import Path
 from typing import Any
 
+from _inprocess import enable_in_process, run_step_cmd
+from _pattern_set import PatternSet
+from _source_scan import ScanRule, SourceFile, scan_sources
 from _taskmaster import resolve_triplet
-from _util import ci_dir, iter_files, repo_root, run_cmd, write_json, write_text
+from _util import ci_dir, repo_root, write_json, write_text
 
 
 TEXT_EXTS = {
@@ -58,12 +61,10 @@ def scan_patterns(target: Path, patterns: dict[str, str], max_hits: int) -> dict
     for p in compiled:
         findings["patterns"][p] = {"hits": [], "count": 0}
 
-    for path in iter_files(target, include_exts=TEXT_EXTS, skip_dirs=SKIP_DIRS):
-        try:
-            text = path.read_text(encoding="utf-8")
-        except Exception:
-            continue
-
+    def check(sf: SourceFile) -> list[Any]:
+        text = sf.strict_text
+        if text is None:
+            return []
         for name, rx in compiled.items():
             for m in rx.finditer(text):
                 findings["patterns"][name]["count"] += 1
@@ -75,10 +76,21 @@ def scan_patterns(target: Path, patterns: dict[str, str], max_hits: int) -> dict
                     snippet = text[start:end].replace("\r", "").replace("\n", "\\n")
                     findings["patterns"][name]["hits"].append(
                         {
-                            "path": str(path.relative_to(repo_root())),
+                            "path": str(sf.path.relative_to(repo_root())),
                             "snippet": snippet,
                         }
                     )
+        return []
+
+    rule = ScanRule(
+        name="patterns",
+        check=check,
+        exts=frozenset(TEXT_EXTS),
+        skip_dirs=frozenset(SKIP_DIRS),
+        max_bytes=512 * 1024,
+        prefilter=PatternSet(compiled),
+    )
+    scan_sources(target, [rule])
     return findings
 
 
@@ -109,7 +121,7 @@ def run_checks(out_dir: Path, focus: str) -> list[dict[str, Any]]:
                     }
                 )
                 return
-        rc, out = run_cmd(cmd, cwd=repo_root(), timeout_sec=timeout_sec)
+        rc, out = run_step_cmd(cmd, cwd=repo_root(), timeout_sec=timeout_sec)
         write_text(log_path, out)
         checks.append({"name": name, "cmd": cmd, "rc": rc, "log": str(log_path), "status": "ok" if rc == 0 else "fail"})
 
@@ -200,11 +212,14 @@ def build_parser() -> argparse.ArgumentParser:
     ap.add_argument("--format", choices=["text", "json", "report"], default="text")
     ap.add_argument("--max-pattern-hits", type=int, default=10)
     ap.add_argument("--strict", action="store_true", help="exit non-zero on any pattern hits")
+    ap.add_argument("--in-process", action="store_true", help="run python checks in this interpreter (import + main()) instead of spawning py -3")
     return ap
 
 
 def main() -> int:
     args = build_parser().parse_args()
+    if args.in_process:
+        enable_in_process()
 
     out_dir = ci_dir("sc-analyze")
     target = (repo_root() / args.target).resolve()
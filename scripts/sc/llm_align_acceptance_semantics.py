@@ -21,6 +21,9 @@ import argparse
 from pathlib import Path
 from typing import Any
 
+from _checkpoint import add_resume_args, digest, open_checkpoint  # type: ignore
+from _codex_cli import run_codex_exec  # type: ignore
+from _llm_cache import add_cache_args, apply_cache_args  # type: ignore
 from _taskmaster import default_paths, load_json  # type: ignore
 from _util import ci_dir, repo_root, run_cmd, today_str, write_json, write_text  # type: ignore
 
@@ -35,7 +38,6 @@ from _acceptance_semantics_align import (  # noqa: E402
     load_semantic_hints,
     normalize_acceptance_lines,
     render_task_context,
-    run_codex_exec,
     safe_parse_json,
     validate_output,
 )
@@ -66,7 +68,10 @@ def main() -> int:
     ap.add_argument("--align-view-descriptions-to-master", action="store_true")
     ap.add_argument("--semantic-findings-json", default="", help="Optional sc-semantic-gate-all/summary.json for hints.")
     ap.add_argument("--timeout-sec", type=int, default=240)
+    add_cache_args(ap)
+    add_resume_args(ap)
     args = ap.parse_args()
+    apply_cache_args(args)
 
     tasks_json_path, tasks_back_path, tasks_gameplay_path = default_paths()
     tasks_json = load_json(tasks_json_path)
@@ -110,6 +115,8 @@ def main() -> int:
         write_text(out_dir / "preflight-migrate-optional-hints.log", out)
         preflight_ran = True
 
+    # The prompt digest already covers mode/description flags, so the run params stay empty.
+    checkpoint = open_checkpoint(out_dir, resume=bool(args.resume))
     results: list[dict[str, Any]] = []
     changed = 0
     skipped = 0
@@ -173,32 +180,37 @@ def main() -> int:
         prompt = build_prompt(task_context)
         write_text(task_out / "prompt.md", prompt)
 
-        last_msg_path = task_out / "output.json"
-        rc, trace = run_codex_exec(prompt=prompt, out_last_message=last_msg_path, timeout_sec=int(args.timeout_sec))
-        write_text(task_out / "trace.log", trace)
-        if rc != 0:
-            failed += 1
-            results.append({"task_id": tid, "status": "fail", "reason": f"codex_rc:{rc}", "dir": str(task_out)})
-            continue
+        prompt_digest = digest(prompt)
+        out_obj = checkpoint.lookup(tid, digest=prompt_digest)
+        resumed = out_obj is not None
+        if not resumed:
+            last_msg_path = task_out / "output.json"
+            rc, trace, _cmd = run_codex_exec(prompt=prompt, output_last_message=last_msg_path, timeout_sec=int(args.timeout_sec))
+            write_text(task_out / "trace.log", trace)
+            if rc != 0:
+                failed += 1
+                results.append({"task_id": tid, "status": "fail", "reason": f"codex_rc:{rc}", "dir": str(task_out)})
+                continue
 
-        out_text = last_msg_path.read_text(encoding="utf-8", errors="ignore") if last_msg_path.exists() else ""
-        out_obj = safe_parse_json(out_text)
-        if not out_obj:
-            failed += 1
-            results.append({"task_id": tid, "status": "fail", "reason": "invalid_json", "dir": str(task_out)})
-            continue
+            out_text = last_msg_path.read_text(encoding="utf-8", errors="ignore") if last_msg_path.exists() else ""
+            out_obj = safe_parse_json(out_text)
+            if not out_obj:
+                failed += 1
+                results.append({"task_id": tid, "status": "fail", "reason": "invalid_json", "dir": str(task_out)})
+                continue
 
-        ok, reason = validate_output(
-            task_id=tid,
-            mode=mode,
-            view_inputs=view_inputs,
-            out_obj=out_obj,
-            align_view_descriptions=bool(args.align_view_descriptions_to_master),
-        )
-        if not ok:
-            failed += 1
-            results.append({"task_id": tid, "status": "fail", "reason": reason, "dir": str(task_out)})
-            continue
+            ok, reason = validate_output(
+                task_id=tid,
+                mode=mode,
+                view_inputs=view_inputs,
+                out_obj=out_obj,
+                align_view_descriptions=bool(args.align_view_descriptions_to_master),
+            )
+            if not ok:
+                failed += 1
+                results.append({"task_id": tid, "status": "fail", "reason": reason, "dir": str(task_out)})
+                continue
+            checkpoint.record(tid, digest=prompt_digest, data=out_obj)
 
         if args.apply:
             if back_entry is not None and isinstance(out_obj.get("back"), dict):
@@ -215,7 +227,9 @@ def main() -> int:
                     apply_acceptance(gameplay_entry, new_acc)
             changed += 1
 
-        results.append({"task_id": tid, "status": "ok", "dir": str(task_out), "applied": bool(args.apply), "mode": mode})
+        results.append(
+            {"task_id": tid, "status": "ok", "dir": str(task_out), "applied": bool(args.apply), "mode": mode, "resumed": resumed}
+        )
 
     if args.apply:
         write_json(tasks_back_path, back)
@@ -239,6 +253,7 @@ def main() -> int:
             "structural_for_not_done": bool(args.structural_for_not_done),
             "append_only_for_done": bool(args.append_only_for_done),
             "align_view_descriptions_to_master": bool(args.align_view_descriptions_to_master),
+            "checkpoint": checkpoint.report(),
             "results": results,
         },
     )
@@ -248,7 +263,7 @@ def main() -> int:
         f"SC_ALIGN_ACCEPTANCE status={status} apply={bool(args.apply)} scope={args.scope} "
         f"structural_for_not_done={bool(args.structural_for_not_done)} append_only_for_done={bool(args.append_only_for_done)} "
         f"align_view_descriptions_to_master={bool(args.align_view_descriptions_to_master)} "
-        f"tasks={len(task_ids)} changed={changed} skipped={skipped} failed={failed} out={out_dir}"
+        f"tasks={len(task_ids)} changed={changed} skipped={skipped} failed={failed} reused={checkpoint.reused} out={out_dir}"
     )
     return 0 if status == "ok" else 1
 
@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+sc-llm-bench: offline end-to-end throughput benchmark of the LLM batch tools.
+
+Goal:
+  Measure prompt building, batch packing, dispatch, TSV parsing and aggregation of
+  llm_semantic_gate_all on a large synthetic task set, without codex or network.
+
+How:
+  - Generates N synthetic tasks (tasks.json + tasks_back.json + tasks_gameplay.json)
+    into a scratch directory and points the gate at them (SC_TASKS_DIR).
+  - Runs the real script in a subprocess with SC_LLM_BACKEND=fixture
+    (scripts/sc/_llm_backend.py) for every --parallel value and --repeat; outputs,
+    verdict store and caches of the runs go to the scratch directory (SC_CI_ROOT).
+  - --latency-ms simulates per-call model latency, so the effect of --parallel and
+    batch sizing on wall clock can be compared.
+
+Output:
+  logs/ci/<YYYY-MM-DD>/sc-llm-bench/summary.json (wall time, tasks/s, batches per run)
+
+Usage (Windows):
+  py -3 scripts/sc/llm_bench.py --tasks 500
+  py -3 scripts/sc/llm_bench.py --tasks 500 --parallel 1,4,8 --latency-ms 200
+  py -3 scripts/sc/llm_bench.py --tasks 500 --fixture-mode replay --fixture-dir logs/cache/llm-fixtures
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+from _llm_backend import FIXTURE_MODES
+from _util import ci_dir, repo_root, split_csv, today_str, write_json
+
+_WORDS = (
+    "inventory save load combat turn enemy reward shop card deck relic map node event boss "
+    "damage block energy status buff debuff scene signal localization audio settings replay seed "
+    "profile unlock achievement tutorial hud tooltip animation sentry telemetry budget frame"
+).split()
+
+
+def _sentence(rng: random.Random, n: int) -> str:
+    words = [rng.choice(_WORDS) for _ in range(n)]
+    return " ".join(words).capitalize() + "."
+
+
+def _write_task_set(tasks_dir: Path, *, count: int, seed: int) -> None:
+    rng = random.Random(seed)
+    master: list[dict[str, Any]] = []
+    back: list[dict[str, Any]] = []
+    gameplay: list[dict[str, Any]] = []
+    for tid in range(1, count + 1):
+        title = _sentence(rng, 5).rstrip(".")
+        master.append(
+            {
+                "id": tid,
+                "title": title,
+                "description": _sentence(rng, 24),
+                "details": " ".join(_sentence(rng, 16) for _ in range(rng.randint(2, 6))),
+                "testStrategy": _sentence(rng, 12),
+                "status": "pending",
+                "subtasks": [],
+            }
+        )
+        for view, prefix, out in (("back", "NG", back), ("gameplay", "GM", gameplay)):
+            out.append(
+                {
+                    "id": f"{prefix}-{tid:04d}",
+                    "taskmaster_id": tid,
+                    "title": title,
+                    "description": _sentence(rng, 20),
+                    "labels": sorted({rng.choice(_WORDS) for _ in range(3)}),
+                    "overlay_refs": [f"docs/architecture/overlays/bench/{view}-{tid % 7}.md"],
+                    "acceptance": [
+                        f"{_sentence(rng, 14)} Refs: Game.Core.Tests/Bench/Task{tid}Tests.cs"
+                        for _ in range(rng.randint(3, 8))
+                    ],
+                }
+            )
+    tasks_dir.mkdir(parents=True, exist_ok=True)
+    (tasks_dir / "tasks.json").write_text(json.dumps({"master": {"tasks": master}}, ensure_ascii=False), encoding="utf-8")
+    (tasks_dir / "tasks_back.json").write_text(json.dumps(back, ensure_ascii=False), encoding="utf-8")
+    (tasks_dir / "tasks_gameplay.json").write_text(json.dumps(gameplay, ensure_ascii=False), encoding="utf-8")
+
+
+def _run_gate(*, scratch: Path, tasks_dir: Path, label: str, parallel: int, args: argparse.Namespace) -> dict[str, Any]:
+    ci_root = scratch / "ci" / label
+    env = dict(os.environ)
+    env.update(
+        {
+            "SC_LLM_BACKEND": "fixture",
+            "SC_LLM_FIXTURE_MODE": str(args.fixture_mode),
+            "SC_LLM_FIXTURE_LATENCY_MS": str(int(args.latency_ms)),
+            "SC_TASKS_DIR": str(tasks_dir),
+            "SC_CI_ROOT": str(ci_root),
+            "SC_LLM_CACHE": "0",
+            "SC_TASK_INDEX_CACHE": "0",
+        }
+    )
+    if str(args.fixture_dir or "").strip():
+        env["SC_LLM_FIXTURE_DIR"] = str(Path(args.fixture_dir).resolve())
+    cmd = [
+        sys.executable,
+        str(repo_root() / "scripts" / "sc" / "llm_semantic_gate_all.py"),
+        "--full",
+        "--verdict-store",
+        str(scratch / f"verdicts-{label}.json"),
+        "--parallel",
+        str(parallel),
+        "--batch-size",
+        str(int(args.batch_size)),
+        "--max-prompt-chars",
+        str(int(args.max_prompt_chars)),
+    ]
+    started = time.perf_counter()
+    proc = subprocess.run(cmd, env=env, cwd=str(repo_root()), stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+    wall = time.perf_counter() - started
+
+    summary_path = ci_root / today_str() / "sc-semantic-gate-all" / "summary.json"
+    gate: dict[str, Any] = {}
+    if summary_path.is_file():
+        gate = json.loads(summary_path.read_text(encoding="utf-8"))
+    audited = int(gate.get("audited_tasks") or 0)
+    return {
+        "label": label,
+        "parallel": parallel,
+        "rc": proc.returncode,
+        "wall_sec": round(wall, 3),
+        "tasks_per_sec": round(audited / wall, 1) if wall > 0 else None,
+        "batches": gate.get("batches"),
+        "audited_tasks": audited,
+        "counts": gate.get("counts"),
+        "output_tail": proc.stdout.splitlines()[-3:] if proc.returncode != 0 or not gate else [],
+    }
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="sc-llm-bench: offline throughput benchmark of llm_semantic_gate_all")
+    ap.add_argument("--tasks", type=int, default=500, help="Synthetic task count (default: 500).")
+    ap.add_argument("--parallel", default="1,4", help="Comma-separated --parallel values to compare (default: 1,4).")
+    ap.add_argument("--repeat", type=int, default=1, help="Runs per --parallel value (default: 1).")
+    ap.add_argument("--batch-size", type=int, default=8, help="Passed to the gate (default: 8).")
+    ap.add_argument("--max-prompt-chars", type=int, default=24_000, help="Passed to the gate (default: 24000).")
+    ap.add_argument("--latency-ms", type=int, default=0, help="Simulated latency per LLM call (default: 0).")
+    ap.add_argument("--fixture-mode", choices=list(FIXTURE_MODES), default="synthetic", help="Fixture backend mode (default: synthetic).")
+    ap.add_argument("--fixture-dir", default="", help="Recorded responses for --fixture-mode replay|auto (default: logs/cache/llm-fixtures).")
+    ap.add_argument("--seed", type=int, default=1, help="Seed of the synthetic task set (default: 1).")
+    ap.add_argument("--keep", action="store_true", help="Keep the scratch directory (task set, run outputs) for inspection.")
+    args = ap.parse_args()
+
+    if int(args.tasks) <= 0:
+        print("[sc-llm-bench] ERROR: --tasks must be > 0")
+        return 2
+    try:
+        parallels = [max(1, int(x)) for x in split_csv(args.parallel)] or [1]
+    except ValueError:
+        print("[sc-llm-bench] ERROR: --parallel must be a comma-separated list of integers")
+        return 2
+
+    out_dir = ci_dir("sc-llm-bench")
+    scratch = Path(tempfile.mkdtemp(prefix="sc-llm-bench-"))
+    runs: list[dict[str, Any]] = []
+    try:
+        tasks_dir = scratch / "tasks"
+        _write_task_set(tasks_dir, count=int(args.tasks), seed=int(args.seed))
+        for parallel in parallels:
+            for rep in range(1, max(1, int(args.repeat)) + 1):
+                run = _run_gate(scratch=scratch, tasks_dir=tasks_dir, label=f"p{parallel}-r{rep}", parallel=parallel, args=args)
+                runs.append(run)
+                print(
+                    f"[sc-llm-bench] parallel={parallel} run={rep} rc={run['rc']} wall={run['wall_sec']}s "
+                    f"tasks/s={run['tasks_per_sec']} batches={run['batches']}"
+                )
+    finally:
+        if not args.keep:
+            shutil.rmtree(scratch, ignore_errors=True)
+
+    ok = all(r["rc"] == 0 and r["audited_tasks"] == int(args.tasks) for r in runs)
+    summary = {
+        "cmd": "sc-llm-bench",
+        "date": today_str(),
+        "tool": "llm_semantic_gate_all",
+        "status": "ok" if ok else "fail",
+        "tasks": int(args.tasks),
+        "batch_size": int(args.batch_size),
+        "max_prompt_chars": int(args.max_prompt_chars),
+        "latency_ms": int(args.latency_ms),
+        "fixture_mode": str(args.fixture_mode),
+        "seed": int(args.seed),
+        "scratch": str(scratch) if args.keep else None,
+        "runs": runs,
+    }
+    write_json(out_dir / "summary.json", summary)
+    print(f"SC_LLM_BENCH status={summary['status']} runs={len(runs)} out={out_dir}")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
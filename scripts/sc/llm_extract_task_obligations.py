@@ -35,8 +35,6 @@ from __future__ import annotations
 import argparse
 import json
 import re
-import shutil
-import subprocess
 import sys
 from pathlib import Path
 from typing import Any
@@ -48,44 +46,12 @@ def _bootstrap_imports() -> None:
 
 _bootstrap_imports()
 
+from _codex_cli import add_stream_args, json_stop, run_codex_exec  # noqa: E402
+from _llm_cache import add_cache_args, apply_cache_args  # noqa: E402
 from _taskmaster import resolve_triplet  # noqa: E402
 from _util import ci_dir, repo_root, write_json, write_text  # noqa: E402
 
 
-def _run_codex_exec(*, prompt: str, out_last_message: Path, timeout_sec: int) -> tuple[int, str, list[str]]:
-    exe = shutil.which("codex")
-    if not exe:
-        return 127, "codex executable not found in PATH\n", ["codex"]
-    cmd = [
-        exe,
-        "exec",
-        "-s",
-        "read-only",
-        "-C",
-        str(repo_root()),
-        "--output-last-message",
-        str(out_last_message),
-        "-",
-    ]
-    try:
-        proc = subprocess.run(
-            cmd,
-            input=prompt,
-            text=True,
-            encoding="utf-8",
-            errors="ignore",
-            cwd=str(repo_root()),
-            stdout=subprocess.PIPE,
-            stderr=subprocess.STDOUT,
-            timeout=timeout_sec,
-        )
-    except subprocess.TimeoutExpired:
-        return 124, "codex exec timeout\n", cmd
-    except Exception as exc:  # noqa: BLE001
-        return 1, f"codex exec failed to start: {exc}\n", cmd
-    return proc.returncode or 0, proc.stdout or "", cmd
-
-
 def _extract_json_object(text: str) -> dict[str, Any]:
     text = str(text or "").strip()
     try:
@@ -276,7 +242,10 @@ def main() -> int:
     ap.add_argument("--task-id", default=None, help="Taskmaster id (e.g. 17). Default: first status=in-progress task.")
     ap.add_argument("--timeout-sec", type=int, default=360, help="codex exec timeout in seconds (default: 360).")
     ap.add_argument("--max-prompt-chars", type=int, default=80_000, help="Max prompt size (default: 80000).")
+    add_cache_args(ap)
+    add_stream_args(ap)
     args = ap.parse_args()
+    apply_cache_args(args)
 
     try:
         triplet = resolve_triplet(task_id=str(args.task_id) if args.task_id else None)
@@ -329,7 +298,13 @@ def main() -> int:
     trace_path = out_dir / "trace.log"
     write_text(prompt_path, prompt)
 
-    rc, trace_out, cmd = _run_codex_exec(prompt=prompt, out_last_message=last_msg_path, timeout_sec=int(args.timeout_sec))
+    rc, trace_out, cmd = run_codex_exec(
+        prompt=prompt,
+        output_last_message=last_msg_path,
+        timeout_sec=int(args.timeout_sec),
+        trace_path=trace_path,
+        stop_when=json_stop("status", "obligations", "uncovered_obligation_ids") if args.early_stop else None,
+    )
     write_text(trace_path, trace_out)
     last_msg = last_msg_path.read_text(encoding="utf-8", errors="ignore") if last_msg_path.exists() else ""
 
@@ -22,7 +22,10 @@ def _bootstrap_imports() -> None:
 
 _bootstrap_imports()
 
+from _checkpoint import add_resume_args, digest, open_checkpoint  # noqa: E402
 from _codex_cli import extract_json_object, extract_testing_framework_excerpt, run_codex_exec, truncate  # noqa: E402
+from _llm_cache import add_cache_args, apply_cache_args  # noqa: E402
+from _prompt_context import prd_excerpt, test_inventory  # noqa: E402
 from _taskmaster import default_paths, iter_master_tasks, load_json  # noqa: E402
 from _util import ci_dir, repo_root, write_json, write_text  # noqa: E402
 
@@ -60,31 +63,9 @@ def _split_refs_blob(blob: str) -> list[str]:
     return [p.strip().replace("\\", "/") for p in s.split() if p.strip()]
 
 
-def _extract_prd_excerpt() -> str:
-    root = repo_root()
-    parts: list[str] = []
-    for name in ["prd.txt", "prd_yuan.md"]:
-        p = root / name
-        if p.exists():
-            parts.append(p.read_text(encoding="utf-8", errors="ignore"))
-    return truncate("\n".join(parts).strip(), max_chars=10_000)
-
-
 def _list_existing_tests() -> list[str]:
-    root = repo_root()
-    out: list[str] = []
-    for base, ext in [("Game.Core.Tests", ".cs"), ("Tests.Godot/tests", ".gd")]:
-        p = root / base
-        if not p.exists():
-            continue
-        for f in p.rglob(f"*{ext}"):
-            if not f.is_file():
-                continue
-            rel = str(f.relative_to(root)).replace("\\", "/")
-            if _is_allowed_test_path(rel):
-                out.append(rel)
-    out.sort()
-    return out
+    # Served from the git-index-backed inventory (scripts/sc/_prompt_context.py), not a tree walk.
+    return [rel for rel in test_inventory() if _is_allowed_test_path(rel)]
 
 
 def _pick_existing_candidates(*, all_tests: list[str], task_id: int, title: str, limit: int) -> list[str]:
@@ -247,7 +228,10 @@ def main() -> int:
     ap.add_argument("--max-refs-per-item", type=int, default=2, help="Max refs per acceptance item (default: 2).")
     ap.add_argument("--candidate-limit", type=int, default=30, help="Max existing candidate tests to provide to the model.")
     ap.add_argument("--max-tasks", type=int, default=0, help="Optional safety cap; 0 means no limit.")
+    add_cache_args(ap)
+    add_resume_args(ap)
     args = ap.parse_args()
+    apply_cache_args(args)
 
     root = repo_root()
     out_dir = ci_dir("sc-llm-acceptance-refs")
@@ -262,7 +246,7 @@ def main() -> int:
         return 2
 
     all_tests = _list_existing_tests()
-    prd_excerpt = _extract_prd_excerpt()
+    prd_text = prd_excerpt()
     back_by_id = {int(t.get("taskmaster_id")): t for t in back if isinstance(t, dict) and isinstance(t.get("taskmaster_id"), int)}
     gameplay_by_id = {
         int(t.get("taskmaster_id")): t for t in gameplay if isinstance(t, dict) and isinstance(t.get("taskmaster_id"), int)
@@ -279,6 +263,7 @@ def main() -> int:
     if args.max_tasks and int(args.max_tasks) > 0:
         task_ids = task_ids[: int(args.max_tasks)]
 
+    checkpoint = open_checkpoint(out_dir, resume=bool(args.resume))
     results: list[dict[str, Any]] = []
     updated_total = 0
 
@@ -312,7 +297,7 @@ def main() -> int:
 
         candidates = _pick_existing_candidates(all_tests=all_tests, task_id=tid, title=title, limit=int(args.candidate_limit))
         prompt = _build_prompt(
-            prd_excerpt=prd_excerpt,
+            prd_excerpt=prd_text,
             task_id=tid,
             title=title,
             master_details=master_details,
@@ -326,18 +311,23 @@ def main() -> int:
         trace_path = out_dir / f"codex-trace-{tid}.log"
         write_text(prompt_path, prompt)
 
-        rc, trace_out, cmd = run_codex_exec(prompt=prompt, output_last_message=last_msg_path, timeout_sec=int(args.timeout_sec))
-        write_text(trace_path, trace_out)
-        if rc != 0 or not last_msg_path.exists():
-            results.append({"task_id": tid, "status": "fail", "error": "codex_exec_failed", "rc": rc, "cmd": cmd})
-            continue
+        prompt_digest = digest(prompt)
+        obj = checkpoint.lookup(tid, digest=prompt_digest)
+        resumed = obj is not None
+        if not resumed:
+            rc, trace_out, cmd = run_codex_exec(prompt=prompt, output_last_message=last_msg_path, timeout_sec=int(args.timeout_sec))
+            write_text(trace_path, trace_out)
+            if rc != 0 or not last_msg_path.exists():
+                results.append({"task_id": tid, "status": "fail", "error": "codex_exec_failed", "rc": rc, "cmd": cmd})
+                continue
 
-        raw = last_msg_path.read_text(encoding="utf-8", errors="ignore")
-        try:
-            obj = extract_json_object(raw)
-        except Exception as exc:  # noqa: BLE001
-            results.append({"task_id": tid, "status": "fail", "error": f"invalid_model_json:{exc}"})
-            continue
+            raw = last_msg_path.read_text(encoding="utf-8", errors="ignore")
+            try:
+                obj = extract_json_object(raw)
+            except Exception as exc:  # noqa: BLE001
+                results.append({"task_id": tid, "status": "fail", "error": f"invalid_model_json:{exc}"})
+                continue
+            checkpoint.record(tid, digest=prompt_digest, data=obj)
 
         def _index_map(v: Any) -> dict[int, list[str]]:
             out: dict[int, list[str]] = {}
@@ -382,15 +372,23 @@ def main() -> int:
             )
 
         updated_total += updated
-        results.append({"task_id": tid, "status": "ok", "updated": updated})
-
-    write_json(out_dir / "summary.json", {"cmd": "sc-llm-fill-acceptance-refs", "updated_total": updated_total, "results": results})
+        results.append({"task_id": tid, "status": "ok", "updated": updated, "resumed": resumed})
+
+    write_json(
+        out_dir / "summary.json",
+        {
+            "cmd": "sc-llm-fill-acceptance-refs",
+            "updated_total": updated_total,
+            "checkpoint": checkpoint.report(),
+            "results": results,
+        },
+    )
 
     if args.write and updated_total:
         back_p.write_text(json.dumps(back, ensure_ascii=False, indent=2) + "\n", encoding="utf-8", newline="\n")
         gameplay_p.write_text(json.dumps(gameplay, ensure_ascii=False, indent=2) + "\n", encoding="utf-8", newline="\n")
 
-    print(f"SC_LLM_ACCEPTANCE_REFS status=ok updated={updated_total} out={out_dir}")
+    print(f"SC_LLM_ACCEPTANCE_REFS status=ok updated={updated_total} reused={checkpoint.reused} out={out_dir}")
     return 0
 
 
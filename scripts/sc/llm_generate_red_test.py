@@ -24,8 +24,6 @@ from __future__ import annotations
 import argparse
 import json
 import re
-import shutil
-import subprocess
 import sys
 from pathlib import Path
 from typing import Any
@@ -38,6 +36,9 @@ def _bootstrap_imports() -> None:
 
 _bootstrap_imports()
 
+from _codex_cli import run_codex_exec  # noqa: E402
+from _llm_cache import add_cache_args, apply_cache_args  # noqa: E402
+from _prompt_context import testing_framework_excerpt  # noqa: E402
 from _taskmaster import resolve_triplet  # noqa: E402
 from _util import ci_dir, repo_root, run_cmd, write_json, write_text  # noqa: E402
 
@@ -75,57 +76,6 @@ def _extract_json_object(text: str) -> dict[str, Any]:
     return obj
 
 
-AUTO_BEGIN = "<!-- BEGIN AUTO:TEST_ORG_NAMING_REFS -->"
-AUTO_END = "<!-- END AUTO:TEST_ORG_NAMING_REFS -->"
-
-
-def _extract_testing_framework_excerpt() -> str:
-    path = repo_root() / "docs" / "testing-framework.md"
-    if not path.exists():
-        return ""
-    text = _read_text(path)
-    a = text.find(AUTO_BEGIN)
-    b = text.find(AUTO_END)
-    if a < 0 or b < 0 or b <= a:
-        return ""
-    excerpt = text[a + len(AUTO_BEGIN) : b].strip()
-    return excerpt
-
-
-def _run_codex_exec(*, prompt: str, out_last_message: Path, timeout_sec: int) -> tuple[int, str, list[str]]:
-    exe = shutil.which("codex")
-    if not exe:
-        return 127, "codex executable not found in PATH\n", ["codex"]
-    cmd = [
-        exe,
-        "exec",
-        "-s",
-        "read-only",
-        "-C",
-        str(repo_root()),
-        "--output-last-message",
-        str(out_last_message),
-        "-",
-    ]
-    try:
-        proc = subprocess.run(
-            cmd,
-            input=prompt,
-            text=True,
-            encoding="utf-8",
-            errors="ignore",
-            cwd=str(repo_root()),
-            stdout=subprocess.PIPE,
-            stderr=subprocess.STDOUT,
-            timeout=timeout_sec,
-        )
-    except subprocess.TimeoutExpired:
-        return 124, "codex exec timeout\n", cmd
-    except Exception as exc:  # noqa: BLE001
-        return 1, f"codex exec failed to start: {exc}\n", cmd
-    return proc.returncode or 0, proc.stdout or "", cmd
-
-
 def _build_prompt(*, task_id: str, context: dict[str, Any]) -> str:
     master = context.get("master") if isinstance(context.get("master"), dict) else {}
     back = context.get("back") if isinstance(context.get("back"), dict) else {}
@@ -144,7 +94,7 @@ def _build_prompt(*, task_id: str, context: dict[str, Any]) -> str:
     taskdoc_md = str(context.get("taskdoc_markdown") or "")
     taskdoc_md = _truncate(taskdoc_md, max_chars=12_000)
 
-    testing_excerpt = _extract_testing_framework_excerpt()
+    testing_excerpt = testing_framework_excerpt()
     testing_excerpt = _truncate(testing_excerpt, max_chars=10_000)
 
     constraints = "\n".join(
@@ -208,7 +158,9 @@ def main() -> int:
     ap.add_argument("--task-id", required=True, help="Task id (master id, e.g. 11).")
     ap.add_argument("--timeout-sec", type=int, default=600, help="codex exec timeout in seconds (default: 600).")
     ap.add_argument("--verify-red", action="store_true", help="Run sc-build tdd --stage red after writing the file.")
+    add_cache_args(ap)
     args = ap.parse_args()
+    apply_cache_args(args)
 
     task_id = str(args.task_id).split(".", 1)[0].strip()
     if not task_id.isdigit():
@@ -278,7 +230,7 @@ def main() -> int:
 
     last_msg_path = out_dir / f"codex-last-message-{task_id}.txt"
     trace_path = out_dir / f"codex-trace-{task_id}.log"
-    rc, trace_out, cmd = _run_codex_exec(prompt=prompt, out_last_message=last_msg_path, timeout_sec=int(args.timeout_sec))
+    rc, trace_out, cmd = run_codex_exec(prompt=prompt, output_last_message=last_msg_path, timeout_sec=int(args.timeout_sec))
     write_text(trace_path, trace_out)
 
     last_msg = _read_text(last_msg_path) if last_msg_path.exists() else ""
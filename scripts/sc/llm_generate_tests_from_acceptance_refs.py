@@ -24,6 +24,7 @@ def _bootstrap_imports() -> None:
 _bootstrap_imports()
 
 from _codex_cli import extract_json_object, extract_testing_framework_excerpt, run_codex_exec, truncate  # noqa: E402
+from _llm_cache import add_cache_args, apply_cache_args  # noqa: E402
 from _taskmaster import resolve_triplet  # noqa: E402
 from _util import ci_dir, repo_root, run_cmd, write_json, write_text  # noqa: E402
 
@@ -125,7 +126,9 @@ def main() -> int:
     ap.add_argument("--verify", choices=["none", "unit", "all", "auto"], default="auto")
     ap.add_argument("--godot-bin", default=None, help="Godot mono console path (required for verify=all/auto when .gd refs exist)")
     ap.add_argument("--timeout-sec", type=int, default=600, help="Per-file codex exec timeout (seconds).")
+    add_cache_args(ap)
     args = ap.parse_args()
+    apply_cache_args(args)
 
     task_id = str(args.task_id).split(".", 1)[0]
     triplet = resolve_triplet(task_id=task_id)
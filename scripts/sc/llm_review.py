@@ -10,6 +10,23 @@ Stop-loss design:
   - Default is soft: failures/empty outputs become "skipped" (summary=warn).
   - Use --strict to fail the run when an agent cannot produce output.
 
+Concurrency:
+  - Agents run one at a time by default, so wall clock is the sum of agent latencies.
+  - --parallel N runs up to N LLM agents at once against the same --timeout-sec
+    deadline (each still capped by its per-agent timeout); the deterministic agents
+    are computed in-process meanwhile. Results keep the --agents order.
+
+Prompt budget:
+  - Task details, acceptance evidence and the diff are packed into
+    --prompt-token-budget (scripts/sc/_prompt_pack.py): binary/generated files and
+    whitespace-only hunks are dropped, remaining hunks are ranked by relevance to the
+    task. What was dropped or truncated is written to prompt-pack.json.
+  - --shard-token-budget N reviews large diffs in shards instead: the diff is split by
+    module (or file, --shard-by) into prompts of at most ~N tokens, every LLM agent
+    reviews every shard (dispatched through the --parallel pool), and the per-shard
+    P0-P3 findings are merged and deduplicated into review-<agent>.md and
+    review-merged.md (scripts/sc/_review_merge.py) with a final verdict.
+
 Deterministic mapping:
   Two agents are mapped to sc-acceptance-check artifacts (no LLM call):
     - adr-compliance-checker
@@ -20,15 +37,18 @@ from __future__ import annotations
 
 import argparse
 import os
-import shutil
-import subprocess
 import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
 
 from _acceptance_artifacts import build_acceptance_evidence
+from _codex_cli import run_codex_exec
 from _deterministic_review import DETERMINISTIC_AGENTS, build_deterministic_review
+from _llm_cache import add_cache_args, apply_cache_args
+from _prompt_pack import DiffSection, PackItem, extract_keywords, pack, plan_diff, shard_diff
+from _review_merge import SEVERITIES, final_verdict, merge_findings, parse_findings, parse_verdict, render_merged_report
 from _taskmaster import TaskmasterTriplet, resolve_triplet
 from _util import ci_dir, repo_root, run_cmd, split_csv, today_str, write_json, write_text
 
@@ -55,31 +75,40 @@ def _truncate(text: str, *, max_chars: int) -> str:
     return text[: max_chars - 3] + "..."
 
 
-def _build_task_context(triplet: TaskmasterTriplet | None) -> str:
+def _task_details(triplet: TaskmasterTriplet | None) -> dict[str, str]:
+    if not triplet:
+        return {}
+    return {
+        "master.details": str(triplet.master.get("details") or "").strip(),
+        "tasks_back.details": str((triplet.back or {}).get("details") or "").strip(),
+        "tasks_gameplay.details": str((triplet.gameplay or {}).get("details") or "").strip(),
+    }
+
+
+def _build_task_context(triplet: TaskmasterTriplet | None, details: dict[str, str | None]) -> str:
+    """
+    details maps each _task_details() key to its packed text; None means it was dropped for the prompt budget.
+    """
     if not triplet:
         return ""
     title = str(triplet.master.get("title") or "").strip()
     adr = ", ".join(triplet.adr_refs()) or "(none)"
     ch = ", ".join(triplet.arch_refs()) or "(none)"
     overlay = triplet.overlay() or "(none)"
-    master_details = _truncate(str(triplet.master.get("details") or ""), max_chars=2_000)
-    back_details = _truncate(str((triplet.back or {}).get("details") or ""), max_chars=2_000)
-    gameplay_details = _truncate(str((triplet.gameplay or {}).get("details") or ""), max_chars=2_000)
-    return "\n".join(
-        [
-            "Task Context:",
-            f"- id: {triplet.task_id}",
-            f"- title: {title}",
-            f"- adrRefs: {adr}",
-            f"- archRefs: {ch}",
-            f"- overlay: {overlay}",
-            "",
-            "Task Details (truncated):",
-            f"- master.details: {master_details or '(empty)'}",
-            f"- tasks_back.details: {back_details or '(empty)'}",
-            f"- tasks_gameplay.details: {gameplay_details or '(empty)'}",
-        ]
-    )
+    lines = [
+        "Task Context:",
+        f"- id: {triplet.task_id}",
+        f"- title: {title}",
+        f"- adrRefs: {adr}",
+        f"- archRefs: {ch}",
+        f"- overlay: {overlay}",
+        "",
+        "Task Details:",
+    ]
+    for key in ("master.details", "tasks_back.details", "tasks_gameplay.details"):
+        text = details.get(key, "")
+        lines.append(f"- {key}: {'(omitted: prompt budget)' if text is None else (text or '(empty)')}")
+    return "\n".join(lines)
 
 def _resolve_threat_model(value: str | None) -> str:
     s = str(value or "").strip().lower()
@@ -208,64 +237,289 @@ def _auto_resolve_commit_for_task(task_id: str) -> str | None:
     return None
 
 
-def _build_diff_context(args: argparse.Namespace) -> str:
+def _collect_diff_sections(args: argparse.Namespace) -> list[DiffSection]:
     if args.uncommitted:
         rc1, unstaged = _git_capture(["git", "diff", "--no-color"], timeout_sec=60)
         rc2, staged = _git_capture(["git", "diff", "--no-color", "--staged"], timeout_sec=60)
-        rc3, untracked = _git_capture(["git", "ls-files", "--others", "--exclude-standard"], timeout_sec=30)
+        # logs/ holds this tool's own outputs; listing them would change the prompt on every run.
+        rc3, untracked = _git_capture(["git", "ls-files", "--others", "--exclude-standard", "--", ".", ":(exclude)logs"], timeout_sec=30)
         if rc1 != 0 or rc2 != 0 or rc3 != 0:
-            return _truncate("\n".join([unstaged, staged, untracked]), max_chars=40_000)
-        blocks: list[str] = []
-        if staged.strip():
-            blocks.append("## Staged diff\n```diff\n" + staged.strip() + "\n```")
-        if unstaged.strip():
-            blocks.append("## Unstaged diff\n```diff\n" + unstaged.strip() + "\n```")
-        if untracked.strip():
-            blocks.append("## Untracked files\n```\n" + untracked.strip() + "\n```")
-        return "\n\n".join(blocks) if blocks else "## Diff\n(no changes detected)\n"
+            return [DiffSection(name="git", title="## Diff (git output)", text="\n".join([unstaged, staged, untracked]), kind="raw")]
+        return [
+            DiffSection(name="staged", title="## Staged diff", text=staged),
+            DiffSection(name="unstaged", title="## Unstaged diff", text=unstaged),
+            DiffSection(name="untracked", title="## Untracked files", text=untracked, kind="list"),
+        ]
 
     if args.commit:
         _rc, out = _git_capture(["git", "show", "--no-color", args.commit], timeout_sec=60)
-        return "## Commit diff\n```diff\n" + _truncate(out.strip(), max_chars=60_000) + "\n```"
+        return [DiffSection(name="commit", title="## Commit diff", text=out)]
 
     base = args.base
     _rc, out = _git_capture(["git", "diff", "--no-color", f"{base}...HEAD"], timeout_sec=60)
-    return f"## Diff vs {base}\n```diff\n" + _truncate(out.strip(), max_chars=60_000) + "\n```"
-
-
-def _run_codex_exec(*, prompt: str, output_last_message: Path, timeout_sec: int) -> tuple[int, str, list[str]]:
-    exe = shutil.which("codex")
-    if not exe:
-        return 127, "codex executable not found in PATH\n", ["codex"]
-
-    cmd = [
-        exe,
-        "exec",
-        "-s",
-        "read-only",
-        "-C",
-        str(repo_root()),
-        "--output-last-message",
-        str(output_last_message),
-        "-",
-    ]
-    try:
-        proc = subprocess.run(
-            cmd,
-            input=prompt,
-            text=True,
-            encoding="utf-8",
-            errors="ignore",
-            cwd=str(repo_root()),
-            stdout=subprocess.PIPE,
-            stderr=subprocess.STDOUT,
-            timeout=timeout_sec,
+    return [DiffSection(name="base", title=f"## Diff vs {base}", text=out)]
+
+
+def _pack_review_context(
+    *,
+    triplet: TaskmasterTriplet | None,
+    fixed_blocks: tuple[str, ...],
+    acceptance_ctx: str,
+    diff_sections: list[DiffSection],
+    budget_tokens: int,
+    shard_token_budget: int = 0,
+    shard_by: str = "module",
+) -> tuple[str, str, tuple[str, ...], dict[str, Any]]:
+    """
+    Fits task details, acceptance evidence and diff hunks into budget_tokens.
+    With shard_token_budget > 0 only the context is budgeted and the whole diff is split into shards.
+    Returns (task_ctx, acceptance_ctx, diff contexts (one per shard), pack report).
+    """
+    details = _task_details(triplet)
+    title = str(triplet.master.get("title") or "") if triplet else ""
+    keywords = extract_keywords(title, *details.values(), acceptance_ctx)
+    plan = plan_diff(diff_sections, keywords=keywords)
+
+    items = [PackItem(key=f"fixed:{i}", text=b, required=True) for i, b in enumerate(fixed_blocks)]
+    if triplet:
+        # The task header (id/title/refs) is always sent; only the details blobs compete for budget.
+        items.append(PackItem(key="task", text=_build_task_context(triplet, {}), required=True))
+    items += [PackItem(key=f"task:{k}", text=v, score=6.0, truncatable=True) for k, v in details.items() if v]
+    if acceptance_ctx:
+        items.append(PackItem(key="acceptance-evidence", text=acceptance_ctx, score=5.0, truncatable=True))
+    shards = shard_diff(plan, budget_tokens=shard_token_budget, group_by=shard_by) if shard_token_budget > 0 else []
+    if len(shards) <= 1:
+        # A diff that fits one shard is reviewed like an unsharded one.
+        shards = []
+        items += plan.items
+    res = pack(items, budget_tokens=budget_tokens, group_overhead=plan.group_overhead)
+
+    task_ctx = _build_task_context(triplet, {k: (res.kept.get(f"task:{k}") if v else "") for k, v in details.items()})
+    report = {
+        **res.to_dict(),
+        "noise": plan.noise,
+        "keywords": len(keywords),
+        "diff_hunks": sum(1 for it in plan.items if it.group),
+    }
+    acceptance = res.kept.get("acceptance-evidence", "")
+    if not shards:
+        return task_ctx, acceptance, (plan.render(res.kept, res.dropped),), report
+
+    texts = {it.key: it.text for it in plan.items}
+    diffs: list[str] = []
+    for i, sh in enumerate(shards, start=1):
+        head = "\n".join(
+            [
+                f"## Review shard {i}/{len(shards)}",
+                "This prompt holds only part of the change; the other shards are reviewed separately.",
+                "Report findings for the files below only.",
+                f"- files: {', '.join(sh.files) or '(none)'}",
+            ]
         )
-    except subprocess.TimeoutExpired:
-        return 124, "codex exec timeout\n", cmd
-    except Exception as exc:  # noqa: BLE001
-        return 1, f"codex exec failed to start: {exc}\n", cmd
-    return proc.returncode or 0, proc.stdout or "", cmd
+        diffs.append(head + "\n\n" + plan.render({k: texts[k] for k in sh.keys}, partial=True))
+    report["shards"] = [{"index": i, "tokens": sh.tokens, "files": list(sh.files)} for i, sh in enumerate(shards, start=1)]
+    return task_ctx, acceptance, tuple(diffs), report
+
+
+@dataclass(frozen=True)
+class _ReviewContext:
+    out_dir: Path
+    task_id: str | None
+    claude_agents_root: Path
+    context_blocks: tuple[str, ...]  # template, task, threat model, acceptance evidence (non-empty only)
+    diff_shards: tuple[str, ...]  # one diff context per shard; a single entry when the review is not sharded
+    strict: bool
+    total_timeout_sec: int
+    agent_timeout_sec: int
+    agent_timeout_overrides: dict[str, int]
+    deadline_ts: float  # time.monotonic() deadline shared by all agents
+
+
+def _rel(path: Path) -> str:
+    return str(path.relative_to(repo_root())).replace("\\", "/")
+
+
+def _budget_exhausted(agent: str, rc: _ReviewContext) -> ReviewResult:
+    return ReviewResult(
+        agent=agent,
+        status="fail" if rc.strict else "skipped",
+        rc=124,
+        cmd=None,
+        prompt_path=None,
+        output_path=None,
+        details={
+            "note": "Skipped due to total timeout budget exhausted.",
+            "total_timeout_sec": rc.total_timeout_sec,
+            "agent_timeout_sec": rc.agent_timeout_overrides.get(agent, rc.agent_timeout_sec),
+        },
+    )
+
+
+def _run_llm_review(agent: str, rc: _ReviewContext, shard: int | None = None) -> ReviewResult:
+    """
+    One codex exec call: the agent against the whole diff (shard=None) or against diff shard `shard`.
+    """
+    remaining = int(rc.deadline_ts - time.monotonic())
+    if remaining <= 0:
+        return _budget_exhausted(agent, rc)
+
+    suffix = "" if shard is None else f"-shard-{shard + 1:02d}"
+    diff_ctx = rc.diff_shards[shard or 0]
+    agent_prompt, prompt_meta = _agent_prompt(agent, claude_agents_root=rc.claude_agents_root)
+    prompt = "\n\n".join([agent_prompt, *rc.context_blocks, diff_ctx]).strip() + "\n"
+    prompt_path = rc.out_dir / f"prompt-{agent}{suffix}.md"
+    output_path = rc.out_dir / f"review-{agent}{suffix}.md"
+    trace_path = rc.out_dir / f"trace-{agent}{suffix}.log"
+    write_text(prompt_path, prompt)
+
+    agent_cap = rc.agent_timeout_overrides.get(agent, rc.agent_timeout_sec)
+    effective_timeout = max(1, min(int(agent_cap), int(remaining)))
+    rc_code, trace_out, cmd = run_codex_exec(
+        prompt=prompt, output_last_message=output_path, timeout_sec=effective_timeout, trace_path=trace_path
+    )
+    write_text(trace_path, trace_out)
+
+    last_msg = ""
+    if output_path.is_file():
+        last_msg = output_path.read_text(encoding="utf-8", errors="ignore")
+
+    status = "ok" if (rc_code == 0 and last_msg.strip()) else ("fail" if rc.strict else "skipped")
+    details: dict[str, Any] = {
+        "trace": _rel(trace_path),
+        "claude_agents_root": str(rc.claude_agents_root),
+        "agent_prompt_source": prompt_meta.get("agent_prompt_source"),
+        "total_timeout_sec": rc.total_timeout_sec,
+        "agent_timeout_sec": effective_timeout,
+        "note": "This step is best-effort. Use --strict to make it a hard gate.",
+    }
+    if shard is not None:
+        details["shard"] = shard + 1
+    return ReviewResult(
+        agent=agent,
+        status=status,
+        rc=rc_code,
+        cmd=cmd,
+        prompt_path=_rel(prompt_path),
+        output_path=_rel(output_path),
+        details=details,
+    )
+
+
+def _run_agent(agent: str, rc: _ReviewContext) -> ReviewResult:
+    if agent not in DETERMINISTIC_AGENTS:
+        return _run_llm_review(agent, rc)
+    if int(rc.deadline_ts - time.monotonic()) <= 0:
+        return _budget_exhausted(agent, rc)
+
+    det = build_deterministic_review(agent=agent, out_dir=rc.out_dir, task_id=rc.task_id)
+    return ReviewResult(
+        agent=agent,
+        status=str(det.get("status")),
+        rc=det.get("rc"),
+        cmd=det.get("cmd"),
+        prompt_path=det.get("prompt_path"),
+        output_path=det.get("output_path"),
+        details={
+            "claude_agents_root": str(rc.claude_agents_root),
+            "agent_prompt_source": _agent_prompt(agent, claude_agents_root=rc.claude_agents_root)[1].get("agent_prompt_source"),
+            **(det.get("details") or {}),
+            "note": "Deterministic mapping: generated from sc-acceptance-check artifacts.",
+        },
+    )
+
+
+def _read_review(rel: str | None) -> str:
+    path = repo_root() / rel if rel else None
+    return path.read_text(encoding="utf-8", errors="ignore") if path and path.is_file() else ""
+
+
+def _reduce_reviews(*, title: str, reviews: list[tuple[str, str | None]], out_path: Path) -> tuple[str, list[Any]]:
+    """
+    reviews: (source label, repo-relative review path or None when the source produced no output).
+    Writes the merged Markdown report to out_path and returns (verdict, merged findings).
+    """
+    batches: list[tuple[str, list[tuple[str, str]]]] = []
+    verdicts: list[str | None] = []
+    missing: list[str] = []
+    for label, rel in reviews:
+        text = _read_review(rel)
+        if not text.strip():
+            missing.append(label)
+            verdicts.append(None)
+            continue
+        batches.append((label, parse_findings(text)))
+        verdicts.append(parse_verdict(text))
+    findings = merge_findings(batches)
+    verdict = final_verdict(verdicts, findings)
+    write_text(
+        out_path,
+        render_merged_report(title=title, findings=findings, verdict=verdict, sources=[label for label, _ in batches], missing=missing),
+    )
+    return verdict, findings
+
+
+def _severity_counts(findings: list[Any]) -> dict[str, int]:
+    return {sev: sum(1 for f in findings if f.severity == sev) for sev in SEVERITIES}
+
+
+def _merge_shard_reviews(agent: str, rc: _ReviewContext, shard_results: list[ReviewResult]) -> ReviewResult:
+    """
+    Reduces the per-shard reviews of one agent into review-<agent>.md (deduplicated P0-P3 findings).
+    """
+    output_path = rc.out_dir / f"review-{agent}.md"
+    verdict, findings = _reduce_reviews(
+        title=f"{agent}: merged review of {len(shard_results)} diff shards",
+        reviews=[(f"{agent}#{(r.details or {}).get('shard')}", r.output_path if r.status == "ok" else None) for r in shard_results],
+        out_path=output_path,
+    )
+    ok = all(r.status == "ok" for r in shard_results)
+    return ReviewResult(
+        agent=agent,
+        status="ok" if ok else ("fail" if rc.strict else "skipped"),
+        rc=max((int(r.rc) for r in shard_results if r.rc is not None), default=None),
+        cmd=shard_results[0].cmd if shard_results else None,
+        prompt_path=None,
+        output_path=_rel(output_path),
+        details={
+            "claude_agents_root": str(rc.claude_agents_root),
+            "shards": [
+                {"shard": (r.details or {}).get("shard"), "status": r.status, "rc": r.rc, "review": r.output_path}
+                for r in shard_results
+            ],
+            "merged_verdict": verdict,
+            "findings": _severity_counts(findings),
+            "total_timeout_sec": rc.total_timeout_sec,
+            "note": "Sharded review: findings merged across diff shards. This step is best-effort. Use --strict to make it a hard gate.",
+        },
+    )
+
+
+def _write_merged_review(rc: _ReviewContext, results: list[ReviewResult]) -> dict[str, Any]:
+    """
+    Cross-agent reduce step of a sharded run: review-merged.md + review-findings.json.
+    """
+    reviews: list[tuple[str, str | None]] = []
+    for r in results:
+        shards = (r.details or {}).get("shards")
+        if shards:
+            reviews.extend((f"{r.agent}#{s['shard']}", s["review"] if s["status"] == "ok" else None) for s in shards)
+        else:
+            reviews.append((r.agent, r.output_path if r.status == "ok" else None))
+    md_path = rc.out_dir / "review-merged.md"
+    json_path = rc.out_dir / "review-findings.json"
+    verdict, findings = _reduce_reviews(
+        title=f"sc-llm-review: merged findings ({len(rc.diff_shards)} diff shards)",
+        reviews=reviews,
+        out_path=md_path,
+    )
+    write_json(json_path, {"verdict": verdict, "findings": [f.to_dict() for f in findings]})
+    return {
+        "shards": len(rc.diff_shards),
+        "verdict": verdict,
+        "findings": _severity_counts(findings),
+        "report": _rel(md_path),
+        "findings_json": _rel(json_path),
+    }
 
 
 def main() -> int:
@@ -302,6 +556,32 @@ def main() -> int:
         default="",
         help="Optional per-agent override map: agent=seconds,agent=seconds (e.g. code-reviewer=600,security-auditor=450).",
     )
+    ap.add_argument(
+        "--parallel",
+        type=int,
+        default=1,
+        help="Run up to N LLM agents concurrently (per-agent timeouts and the total budget still apply). Default: 1 (serial).",
+    )
+    ap.add_argument(
+        "--prompt-token-budget",
+        type=int,
+        default=24_000,
+        help="Estimated token budget for the shared prompt context (task details, acceptance evidence, diff); "
+        "the agent role prompt comes on top. 0 = unlimited (generated/binary/whitespace-only changes are still dropped).",
+    )
+    ap.add_argument(
+        "--shard-token-budget",
+        type=int,
+        default=0,
+        help="Split the diff into shards of at most ~N estimated tokens; every LLM agent reviews every shard and the "
+        "findings are merged (review-merged.md). 0 = off (single prompt per agent).",
+    )
+    ap.add_argument(
+        "--shard-by",
+        choices=["module", "file"],
+        default="module",
+        help="Shard grouping unit: module (first two path levels) or file. Default: module.",
+    )
     ap.add_argument("--strict", action="store_true", help="Fail if any agent cannot produce output (default: soft)")
     ap.add_argument(
         "--threat-model",
@@ -313,7 +593,9 @@ def main() -> int:
         default=None,
         help="Claude agents root (default: env CLAUDE_AGENTS_ROOT or $env:USERPROFILE\\.claude\\agents). Used to load lst97 agent prompts.",
     )
+    add_cache_args(ap)
     args = ap.parse_args()
+    apply_cache_args(args)
 
     if args.uncommitted and args.commit:
         print("[sc-llm-review] ERROR: --uncommitted and --commit are mutually exclusive.")
@@ -386,14 +668,12 @@ def main() -> int:
         if sec > 0:
             per_agent_overrides[k] = sec
 
-    ctx = _build_task_context(triplet)
     threat_model = _resolve_threat_model(args.threat_model)
     threat_ctx = _build_threat_model_context(threat_model)
     acceptance_ctx = ""
     acceptance_meta: dict[str, Any] | None = None
     if triplet:
         acceptance_ctx, acceptance_meta = build_acceptance_evidence(task_id=triplet.task_id)
-    diff_ctx = _build_diff_context(args)
     template_ctx = ""
     template_file = str(args.template_file or "").strip()
     if template_file:
@@ -420,111 +700,63 @@ def main() -> int:
                     ]
                 ).strip()
 
-    results: list[ReviewResult] = []
-    hard_fail = False
-    had_warnings = False
-    start_ts = time.monotonic()
-    deadline_ts = start_ts + total_timeout_sec
-
+    ctx, acceptance_ctx, diff_shards, pack_report = _pack_review_context(
+        triplet=triplet,
+        fixed_blocks=tuple(b for b in (template_ctx, threat_ctx) if b),
+        acceptance_ctx=acceptance_ctx,
+        diff_sections=_collect_diff_sections(args),
+        budget_tokens=int(args.prompt_token_budget),
+        shard_token_budget=int(args.shard_token_budget),
+        shard_by=args.shard_by,
+    )
+    write_json(out_dir / "prompt-pack.json", pack_report)
+
+    rc_ctx = _ReviewContext(
+        out_dir=out_dir,
+        task_id=triplet.task_id if triplet else None,
+        claude_agents_root=claude_agents_root,
+        context_blocks=tuple(b for b in (template_ctx, ctx, threat_ctx, acceptance_ctx) if b),
+        diff_shards=diff_shards,
+        strict=bool(args.strict),
+        total_timeout_sec=total_timeout_sec,
+        agent_timeout_sec=per_agent_timeout_sec,
+        agent_timeout_overrides=per_agent_overrides,
+        deadline_ts=time.monotonic() + total_timeout_sec,
+    )
+    parallel = max(1, int(args.parallel))
+    sharded = len(diff_shards) > 1
+    # Work units: one per LLM agent, or one per (agent, shard) when the diff is sharded.
+    units = [(a, i if sharded else None) for a in agents if a not in DETERMINISTIC_AGENTS for i in range(len(diff_shards))]
+    unit_results: dict[tuple[str, int | None], ReviewResult] = {}
+    by_agent: dict[str, ReviewResult] = {}
+    if parallel > 1 and len(units) > 1:
+        # LLM units run concurrently (each still capped by its agent timeout and the shared deadline);
+        # deterministic agents are computed here while the codex processes are in flight.
+        with ThreadPoolExecutor(max_workers=min(parallel, len(units)), thread_name_prefix="sc-llm-review") as pool:
+            futures = {unit: pool.submit(_run_llm_review, unit[0], rc_ctx, unit[1]) for unit in units}
+            for agent in agents:
+                if agent in DETERMINISTIC_AGENTS:
+                    by_agent[agent] = _run_agent(agent, rc_ctx)
+            for unit, fut in futures.items():
+                unit_results[unit] = fut.result()
+    else:
+        for agent in agents:
+            if agent in DETERMINISTIC_AGENTS:
+                by_agent[agent] = _run_agent(agent, rc_ctx)
+                continue
+            for unit in [u for u in units if u[0] == agent]:
+                unit_results[unit] = _run_llm_review(unit[0], rc_ctx, unit[1])
     for agent in agents:
-        remaining = int(deadline_ts - time.monotonic())
-        if remaining <= 0:
-            status = "fail" if args.strict else "skipped"
-            if status != "ok":
-                had_warnings = True
-            if status == "fail":
-                hard_fail = True
-            results.append(
-                ReviewResult(
-                    agent=agent,
-                    status=status,
-                    rc=124,
-                    cmd=None,
-                    prompt_path=None,
-                    output_path=None,
-                    details={
-                        "note": "Skipped due to total timeout budget exhausted.",
-                        "total_timeout_sec": total_timeout_sec,
-                        "agent_timeout_sec": per_agent_overrides.get(agent, per_agent_timeout_sec),
-                    },
-                )
-            )
-            continue
-
         if agent in DETERMINISTIC_AGENTS:
-            det = build_deterministic_review(agent=agent, out_dir=out_dir, task_id=triplet.task_id if triplet else None)
-            verdict = (det.get("details") or {}).get("verdict")
-            if det.get("status") != "ok" or verdict not in {None, "OK"}:
-                had_warnings = True
-            if det.get("status") == "fail":
-                hard_fail = True
-            results.append(
-                ReviewResult(
-                    agent=agent,
-                    status=str(det.get("status")),
-                    rc=det.get("rc"),
-                    cmd=det.get("cmd"),
-                    prompt_path=det.get("prompt_path"),
-                    output_path=det.get("output_path"),
-                    details={
-                        "claude_agents_root": str(claude_agents_root),
-                        "agent_prompt_source": _agent_prompt(agent, claude_agents_root=claude_agents_root)[1].get("agent_prompt_source"),
-                        **(det.get("details") or {}),
-                        "note": "Deterministic mapping: generated from sc-acceptance-check artifacts.",
-                    },
-                )
-            )
             continue
-
-        agent_prompt, prompt_meta = _agent_prompt(agent, claude_agents_root=claude_agents_root)
-        blocks = [agent_prompt]
-        if template_ctx:
-            blocks.append(template_ctx)
-        if ctx:
-            blocks.append(ctx)
-        if threat_ctx:
-            blocks.append(threat_ctx)
-        if acceptance_ctx:
-            blocks.append(acceptance_ctx)
-        blocks.append(diff_ctx)
-        prompt = "\n\n".join(blocks).strip() + "\n"
-        prompt_path = out_dir / f"prompt-{agent}.md"
-        output_path = out_dir / f"review-{agent}.md"
-        trace_path = out_dir / f"trace-{agent}.log"
-        write_text(prompt_path, prompt)
-
-        agent_cap = per_agent_overrides.get(agent, per_agent_timeout_sec)
-        effective_timeout = max(1, min(int(agent_cap), int(remaining)))
-        rc, trace_out, cmd = _run_codex_exec(prompt=prompt, output_last_message=output_path, timeout_sec=effective_timeout)
-        write_text(trace_path, trace_out)
-
-        last_msg = ""
-        if output_path.is_file():
-            last_msg = output_path.read_text(encoding="utf-8", errors="ignore")
-
-        status = "ok" if (rc == 0 and last_msg.strip()) else ("fail" if args.strict else "skipped")
-        if status != "ok":
-            had_warnings = True
-        if status == "fail":
-            hard_fail = True
-        results.append(
-            ReviewResult(
-                agent=agent,
-                status=status,
-                rc=rc,
-                cmd=cmd,
-                prompt_path=str(prompt_path.relative_to(repo_root())).replace("\\", "/"),
-                output_path=str(output_path.relative_to(repo_root())).replace("\\", "/"),
-                details={
-                    "trace": str(trace_path.relative_to(repo_root())).replace("\\", "/"),
-                    "claude_agents_root": str(claude_agents_root),
-                    "agent_prompt_source": prompt_meta.get("agent_prompt_source"),
-                    "total_timeout_sec": total_timeout_sec,
-                    "agent_timeout_sec": effective_timeout,
-                    "note": "This step is best-effort. Use --strict to make it a hard gate.",
-                },
-            )
-        )
+        if sharded:
+            by_agent[agent] = _merge_shard_reviews(agent, rc_ctx, [unit_results[(agent, i)] for i in range(len(diff_shards))])
+        else:
+            by_agent[agent] = unit_results[(agent, None)]
+    results = [by_agent[a] for a in agents]
+    sharded_review = _write_merged_review(rc_ctx, results) if sharded else None
+    hard_fail = any(r.status == "fail" for r in results)
+    had_warnings = any(r.status != "ok" or (r.details or {}).get("verdict") not in {None, "OK"} for r in results)
 
     summary = {
         "cmd": "sc-llm-review",
@@ -537,6 +769,15 @@ def main() -> int:
         "threat_model": threat_model,
         "acceptance_meta": acceptance_meta,
         "template_file": template_file or None,
+        "parallel": parallel,
+        "prompt_pack": {
+            "budget_tokens": pack_report["budget_tokens"],
+            "used_tokens": pack_report["used_tokens"],
+            "dropped": len(pack_report["dropped"]) + len(pack_report["noise"]),
+            "truncated": len(pack_report["truncated"]),
+            "report": str((out_dir / "prompt-pack.json").relative_to(repo_root())).replace("\\", "/"),
+        },
+        "sharded_review": sharded_review,
         "status": "fail" if hard_fail else ("warn" if had_warnings else "ok"),
         "results": [r.__dict__ for r in results],
         "out_dir": str(out_dir),
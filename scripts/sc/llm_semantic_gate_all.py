@@ -14,23 +14,52 @@ Design:
 Output format:
   The LLM is instructed to emit strict TSV lines:
     T<id>\tOK|Needs Fix\t<short reason>
+
+Throughput:
+  - Batches are packed greedily in task order so every prompt stays under
+    --max-prompt-chars (and holds at most --batch-size tasks); a single task
+    whose brief alone exceeds the budget gets a batch of its own.
+  - Batches and consensus runs are dispatched to a pool of --parallel workers.
+  - As soon as all runs of a batch are in, its consensus verdicts are appended
+    to findings.tsv and summary.json is rewritten (complete=false until the end).
+  - Decided verdicts (OK / Needs Fix) are journaled to checkpoint.jsonl per task;
+    --resume skips tasks whose brief is unchanged since the journaled verdict
+    (Unknown verdicts are always re-audited).
+
+Incremental audits:
+  - Every decided verdict is also kept in a persistent verdict store
+    (logs/cache/semantic-gate/verdicts.json) under the task's fingerprint: the
+    hash of its single-task prompt, i.e. the brief (Refs: clauses stripped) plus
+    the audit rules, and of --consensus-runs / --model-reasoning-effort. Changing
+    any of them invalidates the verdict.
+  - Only tasks without a matching verdict younger than --max-verdict-age-days are
+    sent to the LLM; stored verdicts are merged into the report with their age
+    (findings[].source / verdict_age_days). --full re-audits everything.
 """
 
 from __future__ import annotations
 
 import argparse
 import json
+import os
 import re
-import shutil
-import subprocess
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
 
+from _checkpoint import add_resume_args, digest, open_checkpoint
+from _codex_cli import StopWhen, add_stream_args, run_codex_exec
+from _llm_cache import add_cache_args, apply_cache_args
+from _task_index import load_task_index
 from _taskmaster import resolve_triplet
 from _util import ci_dir, repo_root, today_str
 
 
+VERDICT_STORE_VERSION = 1
+
+
 @dataclass(frozen=True)
 class SemanticFinding:
     task_id: int
@@ -56,10 +85,6 @@ def _strip_refs_clause(text: str) -> str:
     return s
 
 
-def _read_json(path: Path) -> Any:
-    return json.loads(path.read_text(encoding="utf-8"))
-
-
 def _truncate(text: str, *, max_chars: int) -> str:
     s = str(text or "")
     if len(s) <= max_chars:
@@ -68,17 +93,7 @@ def _truncate(text: str, *, max_chars: int) -> str:
 
 
 def _load_all_task_ids() -> list[int]:
-    tasks_json = _read_json(repo_root() / ".taskmaster" / "tasks" / "tasks.json")
-    tasks = (tasks_json.get("master") or {}).get("tasks") or []
-    out: list[int] = []
-    for t in tasks:
-        if not isinstance(t, dict):
-            continue
-        try:
-            out.append(int(str(t.get("id") or "").strip()))
-        except ValueError:
-            continue
-    return sorted(set(out))
+    return load_task_index().int_task_ids()
 
 
 def _task_brief(task_id: int, *, max_acceptance_items: int) -> str:
@@ -137,43 +152,7 @@ def _task_brief(task_id: int, *, max_acceptance_items: int) -> str:
     return "\n".join(lines).strip()
 
 
-def _run_codex_exec(*, prompt: str, out_path: Path, timeout_sec: int, model_reasoning_effort: str) -> tuple[int, str]:
-    exe = shutil.which("codex")
-    if not exe:
-        return 127, "codex executable not found in PATH\n"
-    cmd = [
-        exe,
-        "exec",
-        "-c",
-        f'model_reasoning_effort="{model_reasoning_effort}"',
-        "-s",
-        "read-only",
-        "-C",
-        str(repo_root()),
-        "--output-last-message",
-        str(out_path),
-        "-",
-    ]
-    try:
-        proc = subprocess.run(
-            cmd,
-            input=prompt,
-            text=True,
-            encoding="utf-8",
-            errors="ignore",
-            cwd=str(repo_root()),
-            stdout=subprocess.PIPE,
-            stderr=subprocess.STDOUT,
-            timeout=timeout_sec,
-        )
-    except subprocess.TimeoutExpired:
-        return 124, "codex exec timeout\n"
-    except Exception as exc:  # noqa: BLE001
-        return 1, f"codex exec failed: {exc}\n"
-    return proc.returncode or 0, proc.stdout or ""
-
-
-def _build_batch_prompt(*, batch: list[int], max_acceptance_items: int) -> str:
+def _build_batch_prompt(*, briefs: list[str]) -> str:
     blocks: list[str] = []
     blocks.append("Role: semantic-equivalence-auditor (batch)")
     blocks.append("")
@@ -194,12 +173,92 @@ def _build_batch_prompt(*, batch: list[int], max_acceptance_items: int) -> str:
     blocks.append("- If you are unsure whether something is a mismatch, choose OK (do not guess).")
     blocks.append("")
     blocks.append("Tasks:")
-    for tid in batch:
-        blocks.append(_task_brief(tid, max_acceptance_items=max_acceptance_items))
+    for brief in briefs:
+        blocks.append(brief)
         blocks.append("")
     return "\n".join(blocks).strip() + "\n"
 
 
+def _pack_batches(task_ids: list[int], briefs: dict[int, str], *, max_tasks: int, max_chars: int) -> list[list[int]]:
+    """
+    Greedy in-order packing: a batch grows until adding the next brief would exceed max_chars
+    (prompt header included) or max_tasks. max_chars <= 0 means fixed-size batches.
+    """
+    header = len(_build_batch_prompt(briefs=[]))
+    batches: list[list[int]] = []
+    cur: list[int] = []
+    cur_chars = header
+    for tid in task_ids:
+        cost = len(briefs[tid]) + 2  # brief + blank separator line
+        full = len(cur) >= max_tasks or (max_chars > 0 and cur and cur_chars + cost > max_chars)
+        if full:
+            batches.append(cur)
+            cur, cur_chars = [], header
+        cur.append(tid)
+        cur_chars += cost
+    if cur:
+        batches.append(cur)
+    return batches
+
+
+def _brief_fingerprint(brief: str, *, consensus_runs: int, model_reasoning_effort: str) -> str:
+    # The single-task prompt includes the audit rules, so editing them invalidates every stored verdict.
+    # A 1-run / low-effort verdict must not stand in for a 3-run / high-effort audit (and vice versa).
+    params = f"consensus_runs={int(consensus_runs)}\nmodel_reasoning_effort={model_reasoning_effort}\n"
+    return digest(params + _build_batch_prompt(briefs=[brief]))
+
+
+def _default_verdict_store() -> Path:
+    return repo_root() / "logs" / "cache" / "semantic-gate" / "verdicts.json"
+
+
+def _load_verdict_store(path: Path) -> dict[str, dict[str, Any]]:
+    try:
+        obj = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(obj, dict) or obj.get("version") != VERDICT_STORE_VERSION:
+        return {}
+    tasks = obj.get("tasks")
+    return tasks if isinstance(tasks, dict) else {}
+
+
+def _save_verdict_store(path: Path, tasks: dict[str, dict[str, Any]]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    payload = {"version": VERDICT_STORE_VERSION, "tasks": dict(sorted(tasks.items(), key=lambda kv: int(kv[0])))}
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    tmp.write_text(json.dumps(payload, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def _consensus(batch: list[int], per_run: list[dict[int, SemanticFinding]]) -> list[SemanticFinding]:
+    """
+    Majority vote per task (OK vs Needs Fix). Ties -> Unknown.
+    """
+    out: list[SemanticFinding] = []
+    for tid in batch:
+        ok = sum(1 for r in per_run if r[tid].verdict == "OK")
+        nf = sum(1 for r in per_run if r[tid].verdict == "Needs Fix")
+        if ok == nf:
+            verdict = "Unknown"
+        else:
+            verdict = "OK" if ok > nf else "Needs Fix"
+
+        # Pick the first matching reason for the consensus verdict.
+        reason = ""
+        for r in per_run:
+            f = r[tid]
+            if f.verdict == verdict:
+                reason = f.reason
+                break
+        if verdict == "Unknown" and not reason:
+            # Fall back to any reason if available.
+            reason = next((r[tid].reason for r in per_run if r[tid].reason), "no consensus verdict")
+
+        out.append(SemanticFinding(task_id=tid, verdict=verdict, reason=reason))
+    return out
+
+
 def _parse_tsv_output(text: str) -> list[SemanticFinding]:
     out: list[SemanticFinding] = []
     if not text:
@@ -228,6 +287,26 @@ def _parse_tsv_output(text: str) -> list[SemanticFinding]:
     return out
 
 
+def _tsv_stop(batch: list[int]) -> StopWhen:
+    """
+    --early-stop: the batch answer is complete once every task id has an OK / Needs Fix line.
+    """
+    wanted = set(batch)
+    decided: dict[int, SemanticFinding] = {}
+    current = {"message": None}
+
+    def stop(chunk: str, message: int) -> str | None:
+        if message != current["message"]:
+            current["message"] = message
+            decided.clear()
+        decided.update((f.task_id, f) for f in _parse_tsv_output(chunk) if f.task_id in wanted and f.verdict != "Unknown")
+        if set(decided) != wanted:
+            return None
+        return "".join(f"T{tid}\t{decided[tid].verdict}\t{decided[tid].reason}\n" for tid in batch)
+
+    return stop
+
+
 def main() -> int:
     ap = argparse.ArgumentParser(description="sc semantic equivalence gate (batch) for all tasks")
     ap.add_argument(
@@ -235,7 +314,14 @@ def main() -> int:
         default="",
         help="Optional comma-separated task ids to audit (e.g. 1,14,22). When set, only these tasks are included.",
     )
-    ap.add_argument("--batch-size", type=int, default=8, help="Task ids per LLM call (default: 8).")
+    ap.add_argument("--batch-size", type=int, default=8, help="Max task ids per LLM call (default: 8).")
+    ap.add_argument(
+        "--max-prompt-chars",
+        type=int,
+        default=24_000,
+        help="Character budget per batch prompt; batches shrink to fit (default: 24000, 0 = fixed --batch-size batches).",
+    )
+    ap.add_argument("--parallel", type=int, default=1, help="Max concurrent LLM calls across batches and consensus runs (default: 1).")
     ap.add_argument("--timeout-sec", type=int, default=900, help="Per-batch timeout seconds (default: 900).")
     ap.add_argument(
         "--consensus-runs",
@@ -251,7 +337,23 @@ def main() -> int:
     )
     ap.add_argument("--max-acceptance-items", type=int, default=12, help="Max acceptance items per view included in prompt.")
     ap.add_argument("--max-tasks", type=int, default=0, help="Limit total tasks (0=all).")
+    ap.add_argument("--full", action="store_true", help="Re-audit every task, ignoring stored verdicts (the store is still updated).")
+    ap.add_argument(
+        "--max-verdict-age-days",
+        type=float,
+        default=30.0,
+        help="Re-audit tasks whose stored verdict is older than this (default: 30, 0 = never expires).",
+    )
+    ap.add_argument(
+        "--verdict-store",
+        default="",
+        help="Persistent verdict store path (default: logs/cache/semantic-gate/verdicts.json).",
+    )
+    add_cache_args(ap)
+    add_stream_args(ap)
+    add_resume_args(ap)
     args = ap.parse_args()
+    apply_cache_args(args)
 
     batch_size = int(args.batch_size)
     if batch_size <= 0:
@@ -277,85 +379,176 @@ def main() -> int:
     if int(args.max_tasks) > 0:
         all_ids = all_ids[: int(args.max_tasks)]
 
-    batches: list[list[int]] = []
-    for i in range(0, len(all_ids), batch_size):
-        batches.append(all_ids[i : i + batch_size])
+    max_acceptance_items = int(args.max_acceptance_items)
+    briefs = {tid: _task_brief(tid, max_acceptance_items=max_acceptance_items) for tid in all_ids}
+    runs = max(1, int(args.consensus_runs))
+    parallel = max(1, int(args.parallel))
+
+    fingerprints = {
+        tid: _brief_fingerprint(briefs[tid], consensus_runs=runs, model_reasoning_effort=str(args.model_reasoning_effort))
+        for tid in all_ids
+    }
+
+    checkpoint = open_checkpoint(
+        out_dir,
+        resume=bool(args.resume),
+        params={"consensus_runs": runs, "model_reasoning_effort": str(args.model_reasoning_effort)},
+    )
+    store_path = Path(args.verdict_store).resolve() if str(args.verdict_store or "").strip() else _default_verdict_store()
+    try:
+        store_label = store_path.relative_to(repo_root()).as_posix()
+    except ValueError:
+        store_label = str(store_path)
+    store = _load_verdict_store(store_path)
+    max_age_sec = float(args.max_verdict_age_days) * 86400
+    started = time.time()
 
     all_findings: dict[int, SemanticFinding] = {}
-    for idx, batch in enumerate(batches, 1):
-        prompt = _build_batch_prompt(batch=batch, max_acceptance_items=int(args.max_acceptance_items))
-        runs = max(1, int(args.consensus_runs))
-        per_run: list[dict[int, SemanticFinding]] = []
-        for run_idx in range(1, runs + 1):
-            suffix = f"-run-{run_idx:02d}" if runs > 1 else ""
-            out_path = out_dir / f"batch-{idx:02d}{suffix}.tsv"
-            trace_path = out_dir / f"batch-{idx:02d}{suffix}.trace.log"
-
-            rc, trace = _run_codex_exec(
-                prompt=prompt,
-                out_path=out_path,
-                timeout_sec=int(args.timeout_sec),
-                model_reasoning_effort=str(args.model_reasoning_effort),
-            )
-            trace_path.write_text(trace, encoding="utf-8")
-
-            tsv = out_path.read_text(encoding="utf-8", errors="ignore") if out_path.is_file() else ""
-            parsed = _parse_tsv_output(tsv)
-            run_map: dict[int, SemanticFinding] = {p.task_id: p for p in parsed}
-            # Mark missing tasks in this run as unknown for visibility.
-            for tid in batch:
-                if tid not in run_map:
-                    run_map[tid] = SemanticFinding(task_id=tid, verdict="Unknown", reason="no parseable verdict")
-            per_run.append(run_map)
-
-        # Consensus: majority vote per task (OK vs Needs Fix). Ties -> Unknown.
+    sources: dict[int, str] = {}  # audited | cached (verdict store) | resumed (checkpoint)
+    audited_at: dict[int, float] = {}
+    for tid in all_ids:
+        entry = store.get(str(tid))
+        if not args.full and isinstance(entry, dict) and entry.get("fingerprint") == fingerprints[tid]:
+            ts = float(entry.get("audited_at") or 0)
+            if max_age_sec <= 0 or started - ts <= max_age_sec:
+                all_findings[tid] = SemanticFinding(task_id=tid, verdict=str(entry.get("verdict")), reason=str(entry.get("reason") or ""))
+                sources[tid], audited_at[tid] = "cached", ts
+                continue
+        data = checkpoint.lookup(tid, digest=fingerprints[tid])
+        if isinstance(data, dict):
+            all_findings[tid] = SemanticFinding(task_id=tid, verdict=str(data.get("verdict")), reason=str(data.get("reason") or ""))
+            sources[tid], audited_at[tid] = "resumed", float(data.get("audited_at") or started)
+            store[str(tid)] = {"fingerprint": fingerprints[tid], **data}
+    pending = [tid for tid in all_ids if tid not in all_findings]
+
+    batches = _pack_batches(pending, briefs, max_tasks=batch_size, max_chars=int(args.max_prompt_chars))
+    prompts = [_build_batch_prompt(briefs=[briefs[tid] for tid in batch]) for batch in batches]
+
+    def run_batch(idx: int, run_idx: int) -> dict[int, SemanticFinding]:
+        batch = batches[idx - 1]
+        suffix = f"-run-{run_idx:02d}" if runs > 1 else ""
+        out_path = out_dir / f"batch-{idx:02d}{suffix}.tsv"
+        trace_path = out_dir / f"batch-{idx:02d}{suffix}.trace.log"
+
+        _rc, trace, _cmd = run_codex_exec(
+            prompt=prompts[idx - 1],
+            output_last_message=out_path,
+            timeout_sec=int(args.timeout_sec),
+            model_reasoning_effort=str(args.model_reasoning_effort),
+            cache_tag=f"run-{run_idx:02d}" if runs > 1 else "",
+            trace_path=trace_path,
+            stop_when=_tsv_stop(batch) if args.early_stop else None,
+        )
+        trace_path.write_text(trace, encoding="utf-8")
+
+        tsv = out_path.read_text(encoding="utf-8", errors="ignore") if out_path.is_file() else ""
+        run_map: dict[int, SemanticFinding] = {p.task_id: p for p in _parse_tsv_output(tsv)}
+        # Mark missing tasks in this run as unknown for visibility.
         for tid in batch:
-            ok = sum(1 for r in per_run if r[tid].verdict == "OK")
-            nf = sum(1 for r in per_run if r[tid].verdict == "Needs Fix")
-            if ok == nf:
-                verdict = "Unknown"
-            else:
-                verdict = "OK" if ok > nf else "Needs Fix"
-
-            # Pick the first matching reason for the consensus verdict.
-            reason = ""
-            for r in per_run:
-                f = r[tid]
-                if f.verdict == verdict:
-                    reason = f.reason
-                    break
-            if verdict == "Unknown" and not reason:
-                # Fall back to any reason if available.
-                reason = next((r[tid].reason for r in per_run if r[tid].reason), "no consensus verdict")
-
-            all_findings[tid] = SemanticFinding(task_id=tid, verdict=verdict, reason=reason)
-
-        print(f"[sc-semantic-gate-all] batch {idx}/{len(batches)} runs={runs} tasks={len(batch)}")
-
-    needs_fix = sorted([f.task_id for f in all_findings.values() if f.verdict == "Needs Fix"])
-    unknown = sorted([f.task_id for f in all_findings.values() if f.verdict == "Unknown"])
-
-    summary = {
-        "cmd": "sc-semantic-gate-all",
-        "date": today_str(),
-        "batches": len(batches),
-        "batch_size": batch_size,
-        "total_tasks": len(all_ids),
-        "counts": {
-            "ok": sum(1 for f in all_findings.values() if f.verdict == "OK"),
-            "needs_fix": len(needs_fix),
-            "unknown": len(unknown),
-        },
-        "needs_fix": needs_fix,
-        "unknown": unknown,
-        "findings": [
-            {"task_id": tid, "verdict": f.verdict, "reason": f.reason}
-            for tid, f in sorted(all_findings.items(), key=lambda x: x[0])
-        ],
-    }
-    (out_dir / "summary.json").write_text(json.dumps(summary, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+            if tid not in run_map:
+                run_map[tid] = SemanticFinding(task_id=tid, verdict="Unknown", reason="no parseable verdict")
+        return run_map
+
+    findings_tsv = out_dir / "findings.tsv"
+    findings_tsv.write_text(
+        "".join(f"T{tid}\t{f.verdict}\t{f.reason}\n" for tid, f in sorted(all_findings.items())), encoding="utf-8"
+    )
+    batches_done = 0
+
+    def write_summary(*, complete: bool) -> dict[str, Any]:
+        needs_fix = sorted([f.task_id for f in all_findings.values() if f.verdict == "Needs Fix"])
+        unknown = sorted([f.task_id for f in all_findings.values() if f.verdict == "Unknown"])
+        summary = {
+            "cmd": "sc-semantic-gate-all",
+            "date": today_str(),
+            "complete": complete,
+            "batches": len(batches),
+            "batches_done": batches_done,
+            "batch_size": batch_size,
+            "max_prompt_chars": int(args.max_prompt_chars),
+            "parallel": parallel,
+            "total_tasks": len(all_ids),
+            "audited_tasks": sum(1 for v in sources.values() if v == "audited"),
+            "cached_tasks": sum(1 for v in sources.values() if v == "cached"),
+            "resumed_tasks": checkpoint.reused,
+            "checkpoint": checkpoint.report(),
+            "verdict_store": {
+                "path": store_label,
+                "full": bool(args.full),
+                "max_verdict_age_days": float(args.max_verdict_age_days),
+            },
+            "counts": {
+                "ok": sum(1 for f in all_findings.values() if f.verdict == "OK"),
+                "needs_fix": len(needs_fix),
+                "unknown": len(unknown),
+            },
+            "needs_fix": needs_fix,
+            "unknown": unknown,
+            "findings": [
+                {
+                    "task_id": tid,
+                    "verdict": f.verdict,
+                    "reason": f.reason,
+                    "source": sources.get(tid, "audited"),
+                    "verdict_age_days": round(max(0.0, started - audited_at[tid]) / 86400, 2) if tid in audited_at else 0.0,
+                }
+                for tid, f in sorted(all_findings.items(), key=lambda x: x[0])
+            ],
+        }
+        (out_dir / "summary.json").write_text(json.dumps(summary, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+        return summary
+
+    # Results are collected on this thread only: consensus, findings.tsv and summary.json need no locking.
+    per_batch: dict[int, dict[int, dict[int, SemanticFinding]]] = {idx: {} for idx in range(1, len(batches) + 1)}
+    with ThreadPoolExecutor(max_workers=parallel, thread_name_prefix="sc-semantic-gate") as pool:
+        futures = {
+            pool.submit(run_batch, idx, run_idx): (idx, run_idx)
+            for idx in range(1, len(batches) + 1)
+            for run_idx in range(1, runs + 1)
+        }
+        for fut in as_completed(futures):
+            idx, run_idx = futures[fut]
+            per_batch[idx][run_idx] = fut.result()
+            if len(per_batch[idx]) < runs:
+                continue
+            batch = batches[idx - 1]
+            per_run = [per_batch[idx][r] for r in range(1, runs + 1)]
+            decided = _consensus(batch, per_run)
+            for f in decided:
+                all_findings[f.task_id] = f
+                sources[f.task_id] = "audited"
+                if f.verdict == "Unknown":
+                    continue
+                data = {
+                    "verdict": f.verdict,
+                    "reason": f.reason,
+                    "audited_at": time.time(),
+                    "date": today_str(),
+                    "consensus_runs": runs,
+                    "model_reasoning_effort": str(args.model_reasoning_effort),
+                }
+                checkpoint.record(f.task_id, digest=fingerprints[f.task_id], data=data)
+                store[str(f.task_id)] = {"fingerprint": fingerprints[f.task_id], **data}
+            _save_verdict_store(store_path, store)
+            with findings_tsv.open("a", encoding="utf-8") as fh:
+                fh.writelines(f"T{f.task_id}\t{f.verdict}\t{f.reason}\n" for f in decided)
+            batches_done += 1
+            write_summary(complete=False)
+            print(f"[sc-semantic-gate-all] batch {idx}/{len(batches)} runs={runs} tasks={len(batch)} done={batches_done}/{len(batches)}")
+
+    if not batches:
+        _save_verdict_store(store_path, store)
+    summary = write_summary(complete=True)
+    findings_tsv.write_text(
+        "".join(f"T{tid}\t{f.verdict}\t{f.reason}\n" for tid, f in sorted(all_findings.items())), encoding="utf-8"
+    )
+    needs_fix = summary["needs_fix"]
+    unknown = summary["unknown"]
 
-    print(f"SC_SEMANTIC_GATE_ALL needs_fix={len(needs_fix)} unknown={len(unknown)} out={out_dir}")
+    print(
+        f"SC_SEMANTIC_GATE_ALL needs_fix={len(needs_fix)} unknown={len(unknown)} audited={summary['audited_tasks']} "
+        f"cached={summary['cached_tasks']} reused={checkpoint.reused} out={out_dir}"
+    )
     return 0
 
 
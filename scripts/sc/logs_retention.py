@@ -0,0 +1,386 @@
+#!/usr/bin/env python3
+"""
+sc-logs-retention: retention and compaction of the dated logs/ci tree.
+
+Why:
+  Every tool writes logs/ci/<YYYY-MM-DD>/<tool>/ via _util.ci_dir and nothing ever
+  pruned it, so the tree grew without bound on long-lived agents.
+
+Policy (a "run" is one <date>/<tool> directory; tool dirs are counted separately,
+so sc-acceptance-check-task-7 keeps its own history):
+  - runs newer than --keep-days stay as they are;
+  - the newest --keep-runs runs of every tool stay as they are, whatever their age;
+  - failed runs (summary.json status fail/error/needs fix) stay until --keep-failed-days;
+  - everything else is moved into logs/ci/_archive/<date>.zip (one archive per day);
+  - with --delete-after-days N (opt-in, default 0 = keep forever) a day archive is
+    deleted once its newest run was archived N days ago (archived_at, not the run
+    date, so a late-archived old run still gets its full grace period).
+
+Archive index:
+  logs/ci/_archive/index.jsonl holds, per archived run, its summary*.json contents,
+  so `query` answers "which runs of tool X / task Y failed" without unpacking;
+  `query --show` prints the full summaries, `--member` reads a single file straight
+  from the zip. Index entries outlive their zip: deleting an archive only marks its
+  entries with "archive_deleted", so the summaries stay queryable.
+
+Notes:
+  - prune is a dry run unless --apply is given (the plan is printed either way).
+  - After --apply the artifact index (scripts/sc/_artifact_index.py) is rewritten
+    without entries for removed files.
+  - zip (deflate, stdlib) instead of .tar.zst: no extra dependency on CI agents.
+
+Usage (Windows):
+  py -3 scripts/sc/logs_retention.py prune
+  py -3 scripts/sc/logs_retention.py prune --keep-days 7 --keep-runs 3 --apply
+  py -3 scripts/sc/logs_retention.py query --tool sc-acceptance-check-task-7 --status fail --show
+  py -3 scripts/sc/logs_retention.py query --date 2026-09-01 --member 2026-09-01/sc-test/summary.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import datetime as dt
+import json
+import os
+import re
+import shutil
+import zipfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from _artifact_index import ci_root, rewrite_index
+from _util import ci_dir, today_str, write_json
+
+ARCHIVE_DIR = "_archive"
+ARCHIVE_INDEX = "index.jsonl"
+FAILED_STATUSES = {"fail", "failed", "error", "needs fix", "tests_failed", "coverage_failed"}
+MAX_INDEXED_SUMMARY_BYTES = 256 * 1024
+
+_DATE_RE = re.compile(r"^(\d{4})-?(\d{2})-?(\d{2})(?:-\d{6})?$")
+_SUMMARY_RE = re.compile(r"^summary.*\.json$", re.IGNORECASE)
+
+
+@dataclass
+class Run:
+    date_dir: Path
+    day: dt.date
+    tool: str
+    path: Path
+    status: str | None
+    mtime: float
+
+    @property
+    def failed(self) -> bool:
+        return str(self.status or "").strip().lower() in FAILED_STATUSES
+
+
+def _parse_day(name: str) -> dt.date | None:
+    m = _DATE_RE.match(name)
+    if not m:
+        return None
+    try:
+        return dt.date(int(m.group(1)), int(m.group(2)), int(m.group(3)))
+    except ValueError:
+        return None
+
+
+def _read_json(path: Path) -> Any:
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+
+def discover_runs(root: Path) -> list[Run]:
+    runs: list[Run] = []
+    for date_dir in sorted(p for p in root.iterdir() if p.is_dir()):
+        day = _parse_day(date_dir.name)
+        if day is None:
+            continue
+        for tool_dir in sorted(p for p in date_dir.iterdir() if p.is_dir()):
+            summary = _read_json(tool_dir / "summary.json")
+            status = summary.get("status") if isinstance(summary, dict) else None
+            try:
+                mtime = tool_dir.stat().st_mtime
+            except OSError:
+                mtime = 0.0
+            runs.append(Run(date_dir, day, tool_dir.name, tool_dir, str(status) if status is not None else None, mtime))
+    return runs
+
+
+def plan_runs(runs: list[Run], *, today: dt.date, keep_days: int, keep_runs: int, keep_failed_days: int) -> dict[str, list[Run]]:
+    by_tool: dict[str, list[Run]] = {}
+    for r in runs:
+        by_tool.setdefault(r.tool, []).append(r)
+    newest: set[Path] = set()
+    for tool_runs in by_tool.values():
+        tool_runs.sort(key=lambda r: (r.day, r.mtime), reverse=True)
+        newest.update(r.path for r in tool_runs[: max(0, keep_runs)])
+
+    plan: dict[str, list[Run]] = {"keep": [], "archive": []}
+    for r in runs:
+        age = (today - r.day).days
+        if age < keep_days or r.path in newest or (r.failed and age < keep_failed_days):
+            plan["keep"].append(r)
+        else:
+            plan["archive"].append(r)
+    return plan
+
+
+def _archive_root(root: Path) -> Path:
+    return root / ARCHIVE_DIR
+
+
+def _index_entry(run: Run, archive: Path, root: Path) -> dict[str, Any]:
+    summaries: dict[str, Any] = {}
+    for cur, _dirs, names in os.walk(run.path):
+        for name in names:
+            p = Path(cur) / name
+            if not _SUMMARY_RE.match(name):
+                continue
+            try:
+                if p.stat().st_size > MAX_INDEXED_SUMMARY_BYTES:
+                    continue
+            except OSError:
+                continue
+            data = _read_json(p)
+            if data is not None:
+                summaries[p.relative_to(root).as_posix()] = data
+    task_id = None
+    top = summaries.get(f"{run.date_dir.name}/{run.tool}/summary.json")
+    if isinstance(top, dict) and top.get("task_id") not in (None, ""):
+        task_id = str(top.get("task_id"))
+    return {
+        "date": run.date_dir.name,
+        "tool": run.tool,
+        "task_id": task_id,
+        "status": run.status,
+        "archive": archive.name,
+        "archived_at": today_str(),
+        "summaries": summaries,
+    }
+
+
+def archive_run(run: Run, root: Path) -> dict[str, Any]:
+    """
+    Moves one run directory into <archive>/<date>.zip and returns its archive index entry.
+    """
+    archive = _archive_root(root) / f"{run.date_dir.name}.zip"
+    archive.parent.mkdir(parents=True, exist_ok=True)
+    entry = _index_entry(run, archive, root)
+    with zipfile.ZipFile(archive, "a", compression=zipfile.ZIP_DEFLATED) as zf:
+        existing = set(zf.namelist())
+        for cur, _dirs, names in os.walk(run.path):
+            for name in sorted(names):
+                p = Path(cur) / name
+                arcname = p.relative_to(root).as_posix()
+                if arcname not in existing:
+                    zf.write(p, arcname)
+    with (_archive_root(root) / ARCHIVE_INDEX).open("a", encoding="utf-8") as f:
+        f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+    shutil.rmtree(run.path, ignore_errors=True)
+    try:
+        run.date_dir.rmdir()  # only succeeds once the day is empty
+    except OSError:
+        pass
+    return entry
+
+
+def _archived_on(root: Path) -> dict[str, dt.date]:
+    # Per live archive: the day its newest run was archived (runs of one date can be archived on different days).
+    out: dict[str, dt.date] = {}
+    for e in iter_archive_index(root):
+        day = _parse_day(str(e.get("archived_at") or ""))
+        name = str(e.get("archive") or "")
+        if day is not None and name and not e.get("archive_deleted"):
+            out[name] = max(day, out.get(name, day))
+    return out
+
+
+def expire_archives(root: Path, *, today: dt.date, delete_after_days: int, apply: bool) -> list[str]:
+    """
+    Deletes day archives whose newest run was archived at least delete_after_days ago; their index entries are kept.
+    """
+    if delete_after_days <= 0 or not _archive_root(root).is_dir():
+        return []
+    archived_on = _archived_on(root)
+    expired = []
+    for z in sorted(_archive_root(root).glob("*.zip")):
+        day = archived_on.get(z.name)
+        if day is None:  # not in the index: fall back to when the zip was last written
+            day = dt.date.fromtimestamp(z.stat().st_mtime)
+        if (today - day).days >= delete_after_days:
+            expired.append(z.name)
+    if apply and expired:
+        for name in expired:
+            (_archive_root(root) / name).unlink(missing_ok=True)
+        gone = set(expired)
+        entries = iter_archive_index(root)
+        for e in entries:
+            if e.get("archive") in gone and not e.get("archive_deleted"):
+                e["archive_deleted"] = today.isoformat()
+        index = _archive_root(root) / ARCHIVE_INDEX
+        tmp = index.with_name(f"{index.name}.{os.getpid()}.tmp")
+        tmp.write_text("".join(json.dumps(e, ensure_ascii=False) + "\n" for e in entries), encoding="utf-8")
+        os.replace(tmp, index)
+    return expired
+
+
+def iter_archive_index(root: Path) -> list[dict[str, Any]]:
+    index = _archive_root(root) / ARCHIVE_INDEX
+    out: list[dict[str, Any]] = []
+    try:
+        lines = index.read_text(encoding="utf-8").splitlines()
+    except OSError:
+        return out
+    for line in lines:
+        try:
+            obj = json.loads(line)
+        except ValueError:
+            continue
+        if isinstance(obj, dict):
+            out.append(obj)
+    return out
+
+
+def read_archived(root: Path, member: str) -> str | None:
+    """
+    Text of one archived file ("<date>/<tool>/..."), read from its day archive without extracting.
+    """
+    day = member.split("/", 1)[0]
+    archive = _archive_root(root) / f"{day}.zip"
+    try:
+        with zipfile.ZipFile(archive) as zf:
+            return zf.read(member).decode("utf-8", errors="ignore")
+    except (OSError, KeyError, zipfile.BadZipFile):
+        return None
+
+
+def _dir_bytes(path: Path) -> int:
+    total = 0
+    for cur, _dirs, names in os.walk(path):
+        for name in names:
+            try:
+                total += (Path(cur) / name).stat().st_size
+            except OSError:
+                continue
+    return total
+
+
+def cmd_prune(args: argparse.Namespace, root: Path) -> int:
+    today = dt.date.today()
+    runs = discover_runs(root)
+    plan = plan_runs(
+        runs,
+        today=today,
+        keep_days=int(args.keep_days),
+        keep_runs=int(args.keep_runs),
+        keep_failed_days=int(args.keep_failed_days),
+    )
+    to_archive = plan["archive"]
+    archived_bytes = sum(_dir_bytes(r.path) for r in to_archive)
+    for r in to_archive:
+        print(f"[sc-logs-retention] {'archive' if args.apply else 'would archive'} {r.date_dir.name}/{r.tool} status={r.status}")
+        if args.apply:
+            archive_run(r, root)
+    expired = expire_archives(root, today=today, delete_after_days=int(args.delete_after_days), apply=bool(args.apply))
+    for name in expired:
+        print(f"[sc-logs-retention] {'delete' if args.apply else 'would delete'} {ARCHIVE_DIR}/{name}")
+    index_kept = index_dropped = None
+    if args.apply and (to_archive or expired):
+        index_kept, index_dropped = rewrite_index()
+
+    summary = {
+        "cmd": "sc-logs-retention",
+        "action": "prune",
+        "date": today_str(),
+        "applied": bool(args.apply),
+        "status": "ok",
+        "policy": {
+            "keep_days": int(args.keep_days),
+            "keep_runs": int(args.keep_runs),
+            "keep_failed_days": int(args.keep_failed_days),
+            "delete_after_days": int(args.delete_after_days),
+        },
+        "runs_total": len(runs),
+        "runs_kept": len(plan["keep"]),
+        "runs_archived": [f"{r.date_dir.name}/{r.tool}" for r in to_archive],
+        "archived_bytes": archived_bytes,
+        "archives_deleted": expired,
+        "artifact_index": {"kept": index_kept, "dropped": index_dropped},
+    }
+    out_dir = ci_dir("sc-logs-retention")
+    write_json(out_dir / "summary.json", summary)
+    print(
+        f"SC_LOGS_RETENTION applied={summary['applied']} runs={len(runs)} archived={len(to_archive)} "
+        f"bytes={archived_bytes} archives_deleted={len(expired)} out={out_dir}"
+    )
+    return 0
+
+
+def cmd_query(args: argparse.Namespace, root: Path) -> int:
+    if args.member:
+        text = read_archived(root, str(args.member).replace("\\", "/"))
+        if text is None:
+            print(f"[sc-logs-retention] ERROR: not found in archives (deleted archives keep only their summaries): {args.member}")
+            return 1
+        print(text, end="" if text.endswith("\n") else "\n")
+        return 0
+    hits = []
+    for e in iter_archive_index(root):
+        if args.tool and str(e.get("tool") or "") != args.tool:
+            continue
+        if args.task_id and str(e.get("task_id") or "") != str(args.task_id):
+            continue
+        if args.status and str(e.get("status") or "").lower() != str(args.status).lower():
+            continue
+        if args.date and str(e.get("date") or "") != args.date:
+            continue
+        hits.append(e)
+    for e in hits:
+        where = f"deleted {e['archive_deleted']}" if e.get("archive_deleted") else f"{ARCHIVE_DIR}/{e.get('archive')}"
+        print(f"{e.get('date')}/{e.get('tool')} status={e.get('status')} task_id={e.get('task_id')} archive={where}")
+        if args.show:
+            for member, data in (e.get("summaries") or {}).items():
+                print(f"--- {member}")
+                print(json.dumps(data, ensure_ascii=False, indent=2))
+    print(f"SC_LOGS_RETENTION_QUERY hits={len(hits)}")
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    ap = argparse.ArgumentParser(description="sc-logs-retention (prune/compact logs/ci, query archived summaries)")
+    ap.add_argument("action", choices=["prune", "query"])
+    ap.add_argument("--keep-days", type=int, default=14, help="prune: runs younger than this stay untouched (default: 14)")
+    ap.add_argument("--keep-runs", type=int, default=5, help="prune: newest runs per tool kept regardless of age (default: 5)")
+    ap.add_argument("--keep-failed-days", type=int, default=60, help="prune: failed runs kept unarchived this long (default: 60)")
+    ap.add_argument(
+        "--delete-after-days",
+        type=int,
+        default=0,
+        help="prune: delete day archives this many days after their last run was archived; summaries stay in the index (default: 0 = never)",
+    )
+    ap.add_argument("--apply", action="store_true", help="prune: actually archive/delete (default: dry run)")
+    ap.add_argument("--tool", default="", help="query: tool directory name (e.g. sc-test, sc-acceptance-check-task-7)")
+    ap.add_argument("--task-id", default="", help="query: task_id recorded in the run's summary.json")
+    ap.add_argument("--status", default="", help="query: summary status (e.g. ok, fail)")
+    ap.add_argument("--date", default="", help="query: date directory name (e.g. 2026-09-01)")
+    ap.add_argument("--show", action="store_true", help="query: print the archived summaries")
+    ap.add_argument("--member", default="", help="query: print one archived file, e.g. 2026-09-01/sc-test/summary.json")
+    return ap
+
+
+def main() -> int:
+    args = build_parser().parse_args()
+    root = ci_root()
+    if not root.is_dir():
+        print(f"[sc-logs-retention] nothing to do: {root} does not exist")
+        return 0
+    if args.action == "prune":
+        return cmd_prune(args, root)
+    return cmd_query(args, root)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
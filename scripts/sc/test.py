@@ -10,17 +10,36 @@ Usage (Windows):
   py -3 scripts/sc/test.py --type unit
   py -3 scripts/sc/test.py --type e2e --godot-bin \"C:\\Godot\\Godot_v4.5.1-stable_mono_win64_console.exe\"
   py -3 scripts/sc/test.py --type all --godot-bin \"%GODOT_BIN%\"
+  py -3 scripts/sc/test.py --build-impact-map
+  py -3 scripts/sc/test.py --type all --godot-bin \"%GODOT_BIN%\" --changed-since origin/main
+
+Test-impact selection (--changed-since REV, see scripts/sc/_test_impact.py):
+  only the xUnit test classes and GdUnit4 suites affected by the files changed since
+  REV run; anything the selection cannot vouch for falls back to a full run.
 """
 
 from __future__ import annotations
 
 import argparse
 import os
+from contextlib import closing
 import shutil
 import uuid
 from pathlib import Path
 from typing import Any
 
+from _artifact_index import record_artifact
+from _file_discovery import changed_files
+from _test_impact import (
+    GDUNIT_HARD_ROOTS,
+    GODOT_PROJECT,
+    build_impact_map,
+    gdunit_add_paths,
+    record_full_run,
+    select_tests,
+    xunit_filter,
+)
+from _test_timings import ingest_quietly, open_existing, order_suites
 from _util import ci_dir, repo_root, run_cmd, today_str, write_json, write_text
 
 
@@ -33,20 +52,56 @@ def build_parser() -> argparse.ArgumentParser:
     ap.add_argument("--godot-bin", default=None, help="Godot mono console binary (required for e2e/all)")
     ap.add_argument("--smoke-scene", default="res://Game.Godot/Scenes/Main.tscn", help="Main scene for smoke test")
     ap.add_argument("--timeout-sec", type=int, default=600)
+    ap.add_argument(
+        "--gdunit-shards",
+        type=int,
+        default=1,
+        help="Run the GdUnit4 hard suites in N concurrent headless Godot instances (run_gdunit.py --shards). Default: 1.",
+    )
+    ap.add_argument(
+        "--changed-since",
+        default=None,
+        metavar="REV",
+        help="Test-impact selection: run only the tests affected by files changed since REV (full run when unsure).",
+    )
+    ap.add_argument(
+        "--full-run-interval-hours",
+        type=float,
+        default=24.0,
+        help="With --changed-since, force a full run when none succeeded within this many hours (0 disables). Default: 24.",
+    )
+    ap.add_argument(
+        "--build-impact-map",
+        action="store_true",
+        help="Run every xUnit test class alone under coverage, write logs/cache/test-impact/map.json and exit.",
+    )
     ap.add_argument("--skip-smoke", action="store_true")
     ap.add_argument("--no-coverage-gate", action="store_true", help="do not enforce default coverage thresholds")
     ap.add_argument("--no-coverage-report", action="store_true", help="skip HTML coverage report generation")
     return ap
 
 
-def run_unit(out_dir: Path, solution: str, configuration: str, *, run_id: str) -> dict[str, Any]:
+def run_unit(out_dir: Path, solution: str, configuration: str, *, run_id: str, test_filter: str | None = None) -> dict[str, Any]:
     cmd = ["py", "-3", "scripts/python/run_dotnet.py", "--solution", solution, "--configuration", configuration]
+    if test_filter:
+        cmd += ["--filter", test_filter]
     rc, out = run_cmd(cmd, cwd=repo_root(), timeout_sec=1_800)
     log_path = out_dir / "unit.log"
     write_text(log_path, out)
     unit_artifacts_dir = repo_root() / "logs" / "unit" / today_str()
     write_text(unit_artifacts_dir / "run_id.txt", run_id + "\n")
-    return {"name": "unit", "cmd": cmd, "rc": rc, "log": str(log_path), "artifacts_dir": str(unit_artifacts_dir)}
+    trx = unit_artifacts_dir / "tests.trx"
+    if trx.is_file():
+        record_artifact(trx, kind="unit/tests.trx")
+    timings = ingest_quietly([trx], run_id=run_id)
+    return {
+        "name": "unit",
+        "cmd": cmd,
+        "rc": rc,
+        "log": str(log_path),
+        "artifacts_dir": str(unit_artifacts_dir),
+        "timings_ingested": timings,
+    }
 
 
 def run_coverage_report(out_dir: Path, unit_artifacts_dir: Path) -> dict[str, Any]:
@@ -86,14 +141,25 @@ def run_coverage_report(out_dir: Path, unit_artifacts_dir: Path) -> dict[str, An
     }
 
 
-def run_gdunit_hard(out_dir: Path, godot_bin: str, timeout_sec: int, *, run_id: str) -> dict[str, Any]:
+def run_gdunit_hard(
+    out_dir: Path,
+    godot_bin: str,
+    timeout_sec: int,
+    *,
+    run_id: str,
+    shards: int = 1,
+    suites: list[str] | None = None,
+) -> dict[str, Any]:
     date = today_str()
     report_dir = Path("logs") / "e2e" / date / "sc-test" / "gdunit-hard"
 
     add_dirs: list[str] = []
-    for rel in ["tests/Scenes", "tests/Adapters/Config", "tests/Security/Hard"]:
-        if (repo_root() / rel).exists():
-            add_dirs.append(rel)
+    if suites is not None:
+        add_dirs = list(suites)
+    else:
+        for rel in GDUNIT_HARD_ROOTS:
+            if (repo_root() / GODOT_PROJECT / rel).exists():
+                add_dirs.append(rel)
 
     cmd = [
         "py",
@@ -108,11 +174,25 @@ def run_gdunit_hard(out_dir: Path, godot_bin: str, timeout_sec: int, *, run_id:
     for d in add_dirs:
         cmd += ["--add", d]
     cmd += ["--timeout-sec", str(timeout_sec), "--rd", str(report_dir)]
+    if shards > 1:
+        cmd += ["--shards", str(shards)]
     rc, out = run_cmd(cmd, cwd=repo_root(), timeout_sec=timeout_sec + 300)
     log_path = out_dir / "gdunit-hard.log"
     write_text(log_path, out)
     write_text(repo_root() / report_dir / "run_id.txt", run_id + "\n")
-    return {"name": "gdunit-hard", "cmd": cmd, "rc": rc, "log": str(log_path), "report_dir": str(report_dir)}
+    results = sorted((repo_root() / report_dir).rglob("results.xml"), key=lambda p: p.stat().st_mtime)
+    # Sharded runs merge into <report_dir>/results.xml (written last); the shard copies are not ingested twice.
+    for xml in results[-1:]:
+        record_artifact(xml, kind="gdunit/results.xml")
+    timings = ingest_quietly(results[-1:], run_id=run_id)
+    return {
+        "name": "gdunit-hard",
+        "cmd": cmd,
+        "rc": rc,
+        "log": str(log_path),
+        "report_dir": str(report_dir),
+        "timings_ingested": timings,
+    }
 
 
 def run_smoke(out_dir: Path, godot_bin: str, scene: str) -> dict[str, Any]:
@@ -152,6 +232,18 @@ def main() -> int:
 
     godot_bin = args.godot_bin or os.environ.get("GODOT_BIN")
 
+    if args.build_impact_map:
+        try:
+            impact_map = build_impact_map(configuration=args.configuration, log_dir=out_dir)
+        except RuntimeError as e:
+            print(f"[sc-test] ERROR: {e}")
+            return 1
+        print(
+            f"SC_TEST_IMPACT_MAP classes={len(impact_map['tests'])} sources={len(impact_map['sources'])} "
+            f"failed={len(impact_map['failed_classes'])}"
+        )
+        return 0
+
     summary: dict[str, Any] = {
         "cmd": "sc-test",
         "type": args.type,
@@ -164,16 +256,44 @@ def main() -> int:
 
     hard_fail = False
 
+    kinds = []
     if args.type in ("unit", "all"):
-        if not args.no_coverage_gate:
+        kinds.append("xunit")
+    if args.type in ("integration", "e2e", "all"):
+        kinds.append("gdunit")
+    selection = None
+    if args.changed_since:
+        changed = changed_files(repo_root(), args.changed_since)
+        if changed is None:
+            summary["test_impact"] = {"rev": args.changed_since, "mode": "full", "reason": "git diff unavailable"}
+        else:
+            selection = select_tests(changed, kinds=kinds, full_run_interval_hours=float(args.full_run_interval_hours))
+            summary["test_impact"] = {
+                "rev": args.changed_since,
+                "changed_files": len(changed),
+                **{kind: sel.to_dict() for kind, sel in selection.items()},
+            }
+            for kind, sel in selection.items():
+                detail = sel.reason if sel.mode == "full" else f"{len(sel.tests)} selected"
+                print(f"[sc-test] test-impact {kind}: {sel.mode} ({detail})")
+    xunit_sel = selection.get("xunit") if selection else None
+    gdunit_sel = selection.get("gdunit") if selection else None
+
+    if args.type in ("unit", "all") and xunit_sel is not None and xunit_sel.mode == "impacted" and not xunit_sel.tests:
+        summary["steps"].append({"name": "unit", "status": "skipped", "reason": "no impacted xUnit tests"})
+    elif args.type in ("unit", "all"):
+        impacted = xunit_sel is not None and xunit_sel.mode == "impacted"
+        if not args.no_coverage_gate and not impacted:
             os.environ.setdefault("COVERAGE_LINES_MIN", "90")
             os.environ.setdefault("COVERAGE_BRANCHES_MIN", "85")
 
-        step = run_unit(out_dir, args.solution, args.configuration, run_id=run_id)
+        test_filter = xunit_filter(xunit_sel.tests) if impacted else None
+        step = run_unit(out_dir, args.solution, args.configuration, run_id=run_id, test_filter=test_filter)
         summary["steps"].append(step)
         if step["rc"] != 0:
             hard_fail = True
-        else:
+        elif not impacted:
+            record_full_run("xunit")
             if not args.no_coverage_report:
                 cov = run_coverage_report(out_dir, Path(step["artifacts_dir"]))
                 summary["steps"].append(cov)
@@ -185,10 +305,29 @@ def main() -> int:
             print("[sc-test] ERROR: --godot-bin (or env GODOT_BIN) is required for e2e/integration tests.")
             return 2
 
-        step = run_gdunit_hard(out_dir, godot_bin, args.timeout_sec, run_id=run_id)
-        summary["steps"].append(step)
-        if step["rc"] != 0:
-            hard_fail = True
+        if gdunit_sel is not None and gdunit_sel.mode == "impacted" and not gdunit_sel.tests:
+            summary["steps"].append({"name": "gdunit-hard", "status": "skipped", "reason": "no impacted GdUnit4 suites"})
+        else:
+            impacted = gdunit_sel is not None and gdunit_sel.mode == "impacted"
+            suites = gdunit_add_paths(gdunit_sel.tests) if impacted else None
+            timings_db = open_existing() if suites else None
+            if timings_db is not None:
+                # Fail fast: recently failing suites first, then the quickest (timing store keys are res://<dir>/<file>.gd).
+                with closing(timings_db):
+                    suites = [s[len("res://") :] for s in order_suites(timings_db, [f"res://{s}" for s in suites])]
+            step = run_gdunit_hard(
+                out_dir,
+                godot_bin,
+                args.timeout_sec,
+                run_id=run_id,
+                shards=int(args.gdunit_shards),
+                suites=suites,
+            )
+            summary["steps"].append(step)
+            if step["rc"] != 0:
+                hard_fail = True
+            elif not impacted:
+                record_full_run("gdunit")
 
         if not args.skip_smoke:
             sm = run_smoke(out_dir, godot_bin, args.smoke_scene)
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+sc-test-timings: reports over the historical test timing store (scripts/sc/_test_timings.py).
+
+sc-test ingests every tests.trx / GdUnit4 results.xml it produces; `ingest` backfills
+older artifacts from logs/unit and logs/e2e (or explicit paths).
+
+Reports:
+  slowest      slowest tests by median duration over the last --runs runs
+  trend        duration history of tests matching --test ("Suite.Test" substring)
+  regressions  tests whose last --recent runs are significantly slower than the
+               --baseline runs before them (robust z-score, see _test_timings.regressions)
+
+Output:
+  logs/ci/<YYYY-MM-DD>/sc-test-timings/<report>.json
+
+Usage (Windows):
+  py -3 scripts/sc/test_timings.py ingest
+  py -3 scripts/sc/test_timings.py slowest --kind xunit --limit 20
+  py -3 scripts/sc/test_timings.py trend --test SaveGameRepository
+  py -3 scripts/sc/test_timings.py regressions --kind gdunit --recent 3 --baseline 20
+"""
+
+from __future__ import annotations
+
+import argparse
+from contextlib import closing
+from pathlib import Path
+from typing import Any
+
+from _test_timings import KINDS, connect, discover_artifacts, ingest_path, regressions, slowest, trend
+from _util import ci_dir, today_str, write_json
+
+
+def build_parser() -> argparse.ArgumentParser:
+    ap = argparse.ArgumentParser(description="sc-test-timings (historical test durations)")
+    ap.add_argument("report", choices=["ingest", "slowest", "trend", "regressions"])
+    ap.add_argument("paths", nargs="*", help="ingest: .trx / results.xml files (default: everything under logs/unit and logs/e2e)")
+    ap.add_argument("--kind", choices=list(KINDS), default=None, help="xunit or gdunit (default: both)")
+    ap.add_argument("--runs", type=int, default=10, help="slowest/trend: number of most recent runs per kind (default: 10)")
+    ap.add_argument("--limit", type=int, default=20, help="slowest: rows per kind (default: 20)")
+    ap.add_argument("--test", default="", help="trend: substring of \"Suite.Test\" to report")
+    ap.add_argument("--recent", type=int, default=3, help="regressions: runs compared against the baseline (default: 3)")
+    ap.add_argument("--baseline", type=int, default=20, help="regressions: runs before --recent used as baseline (default: 20)")
+    ap.add_argument("--min-z", type=float, default=3.0, help="regressions: robust z-score threshold (default: 3.0)")
+    ap.add_argument("--min-ratio", type=float, default=1.2, help="regressions: recent/baseline median ratio (default: 1.2)")
+    return ap
+
+
+def _print_rows(title: str, rows: list[dict[str, Any]], cols: list[str]) -> None:
+    print(f"== {title} ({len(rows)})")
+    for r in rows:
+        print("  " + "  ".join(f"{c}={r[c]}" for c in cols) + f"  {r['suite']}.{r['test']}")
+
+
+def main() -> int:
+    args = build_parser().parse_args()
+    kinds = [args.kind] if args.kind else list(KINDS)
+    report: dict[str, Any] = {"cmd": "sc-test-timings", "date": today_str(), "report": args.report}
+
+    with closing(connect()) as conn:
+        if args.report == "ingest":
+            paths = [Path(p) for p in args.paths] or discover_artifacts()
+            added = sum(ingest_path(conn, p) for p in paths if p.is_file())
+            report.update({"artifacts": len(paths), "rows_added": added})
+            print(f"[sc-test-timings] ingested artifacts={len(paths)} rows_added={added}")
+        elif args.report == "slowest":
+            for kind in kinds:
+                rows = slowest(conn, kind=kind, runs=int(args.runs), limit=int(args.limit))
+                report[kind] = rows
+                _print_rows(f"slowest {kind}", rows, ["median_ms", "max_ms", "samples"])
+        elif args.report == "trend":
+            if not str(args.test).strip():
+                print("[sc-test-timings] ERROR: trend requires --test")
+                return 2
+            series = trend(conn, pattern=str(args.test).strip(), kind=args.kind, runs=int(args.runs))
+            report["tests"] = series
+            for s in series:
+                print(f"== {s['suite']}.{s['test']}: " + " ".join(str(p["ms"]) for p in s["points"]))
+        else:
+            for kind in kinds:
+                rows = regressions(
+                    conn,
+                    kind=kind,
+                    recent=int(args.recent),
+                    baseline=int(args.baseline),
+                    min_z=float(args.min_z),
+                    min_ratio=float(args.min_ratio),
+                )
+                report[kind] = rows
+                _print_rows(f"regressions {kind}", rows, ["baseline_median_ms", "recent_median_ms", "ratio", "z"])
+
+    out_path = ci_dir("sc-test-timings") / f"{args.report}.json"
+    write_json(out_path, report)
+    print(f"SC_TEST_TIMINGS report={args.report} out={out_path}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())